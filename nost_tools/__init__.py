@@ -1,28 +1,79 @@
 __version__ = "2.4.0"
 
-from .application import Application
-from .application_utils import ConnectionConfig, ModeStatusObserver, TimeStatusPublisher
-from .configuration import ConnectionConfig
+import importlib
+
 from .entity import Entity
-from .logger_application import LoggerApplication
-from .managed_application import ManagedApplication
-from .manager import Manager, TimeScaleUpdate
 from .observer import Observable, Observer
-from .publisher import ScenarioTimeIntervalPublisher, WallclockTimeIntervalPublisher
-from .schemas import (
-    InitCommand,
-    InitTaskingParameters,
-    ModeStatus,
-    ModeStatusProperties,
-    ReadyStatus,
-    ReadyStatusProperties,
-    StartCommand,
-    StartTaskingParameters,
-    StopCommand,
-    StopTaskingParameters,
-    TimeStatus,
-    TimeStatusProperties,
-    UpdateCommand,
-    UpdateTaskingParameters,
+from .publisher import (
+    ScenarioTimeIntervalPublisher,
+    WallclockScheduler,
+    WallclockTimeIntervalPublisher,
 )
 from .simulator import Mode, Simulator
+
+# Objects depending on the messaging, authentication, and validation libraries are
+# imported on first access so that simulation-only use does not load them.
+_LAZY_IMPORTS = {
+    "Application": ".application",
+    "ConnectionConfig": ".configuration",
+    "LatencyHistogram": ".application_utils",
+    "LockstepBarrier": ".application_utils",
+    "MessageInbox": ".application_utils",
+    "MessageTracker": ".application_utils",
+    "ModeStatusObserver": ".application_utils",
+    "OutboundBuffer": ".application_utils",
+    "RateLimit": ".application_utils",
+    "StepStatusObserver": ".application_utils",
+    "TimeStatusPublisher": ".application_utils",
+    "TopologyPlanner": ".application_utils",
+    "ArrowLogSink": ".logger_application",
+    "BufferedLogWriter": ".logger_application",
+    "CsvLogSink": ".logger_application",
+    "LoggerApplication": ".logger_application",
+    "LogRecord": ".log_store",
+    "LogStoreReader": ".log_store",
+    "SegmentedLogSink": ".log_store",
+    "LogReplayer": ".replay",
+    "ManagedApplication": ".managed_application",
+    "FederationMonitor": ".manager",
+    "FederationSummaryPublisher": ".manager",
+    "Manager": ".manager",
+    "TimeScaleController": ".manager",
+    "TimeScaleUpdate": ".manager",
+    "CheckpointCommand": ".schemas",
+    "CheckpointTaskingParameters": ".schemas",
+    "FastForwardCommand": ".schemas",
+    "FastForwardTaskingParameters": ".schemas",
+    "InitCommand": ".schemas",
+    "InitTaskingParameters": ".schemas",
+    "ModeStatus": ".schemas",
+    "ModeStatusProperties": ".schemas",
+    "ReadyStatus": ".schemas",
+    "ReadyStatusProperties": ".schemas",
+    "ResultStatus": ".schemas",
+    "ResultStatusProperties": ".schemas",
+    "StartCommand": ".schemas",
+    "StartTaskingParameters": ".schemas",
+    "StepCommand": ".schemas",
+    "StepStatus": ".schemas",
+    "StepStatusProperties": ".schemas",
+    "StepTaskingParameters": ".schemas",
+    "StopCommand": ".schemas",
+    "StopTaskingParameters": ".schemas",
+    "TimeStatus": ".schemas",
+    "TimeStatusProperties": ".schemas",
+    "UpdateCommand": ".schemas",
+    "UpdateTaskingParameters": ".schemas",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -3,34 +3,41 @@ Provides a base application that publishes messages from a simulator to a broker
 """
 
 import functools
+import hashlib
+import json
 import logging
 import logging.handlers
+import math
 import os
 import signal
 import ssl
+import tempfile
 import threading
 import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Callable
+from typing import TYPE_CHECKING, Callable
 
-import ntplib
 import pika
-import urllib3
-from keycloak.exceptions import KeycloakAuthenticationError
-from keycloak.keycloak_openid import KeycloakOpenID
 
 from .application_utils import (  # ConnectionConfig,
+    MessageTracker,
     ModeStatusObserver,
+    OutboundBuffer,
+    RateLimit,
     ShutDownObserver,
     TimeStatusPublisher,
+    TopologyPlanner,
 )
 from .configuration import ConnectionConfig
-from .schemas import ReadyStatus
+from .schemas import encode_ready_status
 from .simulator import Simulator
 
+if TYPE_CHECKING:
+    from keycloak.keycloak_openid import KeycloakOpenID
+
 logging.captureWarnings(True)
 logger = logging.getLogger(__name__)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 class Application:
@@ -47,8 +54,15 @@ class Application:
         app_description (str): Test run application description (optional)
         time_status_step (:obj:`timedelta`): Scenario duration between time status messages
         time_status_init (:obj:`datetime`): Scenario time of first time status message
+        publisher_id (str): Unique publisher id used in message envelopes
+        message_tracker (:obj:`MessageTracker`): Tracker of received message envelopes
+        topology (:obj:`TopologyPlanner`): Planner of the exchanges, queues and bindings used by the application
+        shutdown_timeout (float): Deadline for shutting down, in seconds, after which the process exits immediately
     """
 
+    #: Number of topology operations per channel before another channel is used in a batch
+    TOPOLOGY_OPERATIONS_PER_CHANNEL = 8
+
     def __init__(
         self,
         app_name: str,
@@ -80,6 +94,14 @@ class Application:
         self._consuming = False
         self._should_stop = threading.Event()
         self._closing = False
+        # Broker flow control
+        self._is_blocked = False
+        self._blocked_since = None
+        self._blocked_count = 0
+        self._blocked_seconds = 0.0
+        self._outbound_buffer = None
+        # Publish rate limits, keyed by <app_name>.<app_topic>
+        self._rate_limits = {}
         # Queues
         self.channel_configs = []
         self.unique_exchanges = {}
@@ -87,14 +109,36 @@ class Application:
         self.declared_exchanges = set()
         self.predefined_exchanges_queues = False
         self._callbacks_per_topic = {}
+        # Topology (exchanges, queues and bindings), applied in batches
+        self.topology = TopologyPlanner()
+        self._topology_lock = threading.Lock()
+        self._topology_flush_scheduled = False
+        self._topology_ready = threading.Event()
+        self._topology_ready.set()
+        self._topology_channels = 4
+        self._persist_topology = False
+        self._consumer_queues = []
+        self._consumed_queues = set()
+        # Message envelopes
+        self.publisher_id = f"{app_name}.{uuid.uuid4().hex[:8]}"
+        self._publish_sequences = {}
+        self.message_tracker = MessageTracker()
         # Token
         self.refresh_token = None
+        self._keycloak_openid = None
         self._token_refresh_thread = None
         self.token_refresh_interval = None
         self._reconnect_delay = None
         # Offset
         self._wallclock_refresh_thread = None
         self.wallclock_offset_refresh_interval = None
+        # Duration of start up phases, in seconds
+        self._startup_timings = {}
+        # Shutdown deadline, registered resources, and duration of shutdown phases
+        self.shutdown_timeout = 15.0
+        self._shutdown_deadline = None
+        self._resources = []
+        self._shutdown_timings = {}
         # Set up signal handlers for graceful shutdown
         if setup_signal_handlers:
             self._setup_signal_handlers()
@@ -115,19 +159,15 @@ class Application:
     def ready(self) -> None:
         """
         Signals the application is ready to initialize scenario execution.
-        Publishes a :obj:`ReadyStatus` message to the topic `prefix.app_name.status.ready`.
+        Publishes a :obj:`ReadyStatus` message to the topic `prefix.app_name.status.ready`
+        once pending queue declarations and bindings are applied.
         """
-        status = ReadyStatus.model_validate(
-            {
-                "name": self.app_name,
-                "description": self.app_description,
-                "properties": {"ready": True},
-            }
-        )
+        if not self.wait_for_topology(timeout=10):
+            logger.warning("Timed out waiting for queue declarations and bindings.")
         self.send_message(
             app_name=self.app_name,
             app_topics="status.ready",
-            payload=status.model_dump_json(by_alias=True, exclude_none=True),
+            payload=encode_ready_status(self.app_name, self.app_description),
         )
 
     def new_access_token(self, refresh_token=None):
@@ -144,13 +184,9 @@ class Application:
             if not refresh_token
             else "Refreshing access token."
         )
-        keycloak_openid = KeycloakOpenID(
-            server_url=f"{'http' if 'localhost' in self.config.rc.server_configuration.servers.keycloak.host or '127.0.0.1' in self.config.rc.server_configuration.servers.keycloak.host else 'https'}://{self.config.rc.server_configuration.servers.keycloak.host}:{self.config.rc.server_configuration.servers.keycloak.port}",
-            client_id=self.config.rc.credentials.client_id,
-            realm_name=self.config.rc.server_configuration.servers.keycloak.realm,
-            client_secret_key=self.config.rc.credentials.client_secret_key,
-            verify=False,
-        )
+        from keycloak.exceptions import KeycloakAuthenticationError
+
+        keycloak_openid = self._get_keycloak_openid()
         try:
             if refresh_token:
                 token = keycloak_openid.refresh_token(refresh_token)
@@ -183,6 +219,29 @@ class Application:
             logger.error(f"An error occurred: {e}")
             raise
 
+    def _get_keycloak_openid(self) -> "KeycloakOpenID":
+        """
+        Gets the Keycloak client, which is created once and reused for token refreshes.
+
+        Returns:
+            :obj:`KeycloakOpenID`: Keycloak client
+        """
+        if self._keycloak_openid is None:
+            import urllib3
+            from keycloak.keycloak_openid import KeycloakOpenID
+
+            # Certificate verification is disabled for the Keycloak client
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+            self._keycloak_openid = KeycloakOpenID(
+                server_url=f"{'http' if 'localhost' in self.config.rc.server_configuration.servers.keycloak.host or '127.0.0.1' in self.config.rc.server_configuration.servers.keycloak.host else 'https'}://{self.config.rc.server_configuration.servers.keycloak.host}:{self.config.rc.server_configuration.servers.keycloak.port}",
+                client_id=self.config.rc.credentials.client_id,
+                realm_name=self.config.rc.server_configuration.servers.keycloak.realm,
+                client_secret_key=self.config.rc.credentials.client_secret_key,
+                verify=False,
+            )
+        return self._keycloak_openid
+
     def start_token_refresh_thread(self):
         """
         Starts a background thread to refresh the access token periodically.
@@ -221,17 +280,7 @@ class Application:
             ):
                 logger.debug("Wallclock refresh thread is running.")
                 try:
-                    logger.info(
-                        f"Contacting {self.config.rc.wallclock_offset_properties.ntp_host} to retrieve wallclock offset."
-                    )
-                    response = ntplib.NTPClient().request(
-                        self.config.rc.wallclock_offset_properties.ntp_host,
-                        version=3,
-                        timeout=2,
-                    )
-                    offset = timedelta(seconds=response.offset)
-                    self.simulator.set_wallclock_offset(offset)
-                    logger.info(f"Wallclock offset updated to {offset}.")
+                    self.update_wallclock_offset()
                 except Exception as e:
                     logger.debug(f"Failed to refresh wallclock offset: {e}")
 
@@ -241,6 +290,61 @@ class Application:
         self._wallclock_refresh_thread.start()
         logger.debug("Starting wallclock offset refresh thread successfully completed.")
 
+    def update_wallclock_offset(self) -> None:
+        """
+        Retrieves the wallclock offset from the configured NTP host and updates the simulator.
+        """
+        import ntplib
+
+        logger.info(
+            f"Contacting {self.config.rc.wallclock_offset_properties.ntp_host} to retrieve wallclock offset."
+        )
+        response = ntplib.NTPClient().request(
+            self.config.rc.wallclock_offset_properties.ntp_host,
+            version=3,
+            timeout=2,
+        )
+        offset = timedelta(seconds=response.offset)
+        self.simulator.set_wallclock_offset(offset)
+        logger.info(f"Wallclock offset updated to {offset}.")
+
+    def _run_startup_phase(self, phase: str, function: Callable, *args):
+        """
+        Runs a start up phase and records its duration.
+
+        Args:
+            phase (str): name of the start up phase
+            function (Callable): function to run
+            *args: arguments passed to the function
+
+        Returns:
+            object: return value of the function
+        """
+        phase_start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self._startup_timings[phase] = time.perf_counter() - phase_start
+
+    def _update_initial_wallclock_offset(self) -> None:
+        """
+        Retrieves the initial wallclock offset during start up, logging any failure.
+        """
+        try:
+            self._run_startup_phase("wallclock_offset", self.update_wallclock_offset)
+        except Exception as e:
+            logger.warning(f"Failed to retrieve initial wallclock offset: {e}")
+
+    def get_startup_timings(self) -> dict:
+        """
+        Gets the duration of the phases of the last start up. Phases that run concurrently
+        (the wallclock offset with authentication and connection) overlap in time.
+
+        Returns:
+            dict: duration (in seconds) per start up phase and in total
+        """
+        return dict(self._startup_timings)
+
     def update_connection_credentials(self, access_token):
         """
         Updates the connection credentials with the new access token.
@@ -292,6 +396,8 @@ class Application:
             shut_down_when_terminated (bool): True, if the application should shut down when the simulation is terminated
         """
         self.config = config
+        startup_start = time.perf_counter()
+        self._startup_timings = {}
 
         if self.config.rc.yaml_file:
             logger.info(
@@ -335,8 +441,14 @@ class Application:
             self.time_status_init = time_status_init
             self.shut_down_when_terminated = shut_down_when_terminated
 
+        offset_thread = None
         if self.set_offset:
-            # Start periodic wallclock offset updates instead of one-time call
+            # Retrieve the initial offset concurrently with authentication and connection
+            offset_thread = threading.Thread(
+                target=self._update_initial_wallclock_offset, daemon=True
+            )
+            offset_thread.start()
+            # Start periodic wallclock offset updates
             logger.info(
                 f"Wallclock offset will be set every {self.config.rc.wallclock_offset_properties.wallclock_offset_refresh_interval} seconds using {self.config.rc.wallclock_offset_properties.ntp_host}."
             )
@@ -355,7 +467,9 @@ class Application:
             logger.info(
                 f"Keycloak authentication is enabled. Access token will be refreshed every {self.token_refresh_interval} seconds"
             )
-            access_token, _ = self.new_access_token()
+            access_token, _ = self._run_startup_phase(
+                "access_token", self.new_access_token
+            )
             self.start_token_refresh_thread()
             credentials = pika.PlainCredentials("", access_token)
         else:
@@ -397,11 +511,34 @@ class Application:
         self._reconnect_delay = (
             self.config.rc.server_configuration.servers.rabbitmq.reconnect_delay
         )
-        self._queue_max_size = (
-            self.config.rc.server_configuration.servers.rabbitmq.queue_max_size
+        self._outbound_buffer = OutboundBuffer(
+            max_size=self.config.rc.server_configuration.servers.rabbitmq.queue_max_size,
+            policy=self.config.rc.server_configuration.servers.rabbitmq.outbound_buffer_policy,
+            timeout=self.config.rc.server_configuration.servers.rabbitmq.outbound_buffer_timeout,
+        )
+        self._topology_channels = (
+            self.config.rc.server_configuration.servers.rabbitmq.topology_channels
         )
+        self._persist_topology = (
+            self.config.rc.server_configuration.servers.rabbitmq.persist_topology
+        )
+        if self._persist_topology:
+            self._load_topology_record()
+
+        # Configure publish rate limits declared in the channel configuration
+        rate_limits = self.config.rc.simulation_configuration.rate_limits
+        for key, rate_limit in rate_limits.items():
+            app_name, app_topic = key.split(".", 1)
+            self.set_rate_limit(
+                app_name,
+                app_topic,
+                rate_limit.rate,
+                rate_limit.burst,
+                rate_limit.policy,
+            )
 
         # Establish non-blocking connection to RabbitMQ
+        connection_start = time.perf_counter()
         self.connection = pika.SelectConnection(
             parameters=parameters,
             on_open_callback=self.on_connection_open,
@@ -413,6 +550,7 @@ class Application:
         self._io_thread = threading.Thread(target=self._start_io_loop)
         self._io_thread.start()
         self._is_connected.wait()
+        self._startup_timings["connection"] = time.perf_counter() - connection_start
 
         if self.config.rc.simulation_configuration.predefined_exchanges_queues:
             # Get the unique exchanges and channel configurations
@@ -424,6 +562,10 @@ class Application:
                 self.config.rc.simulation_configuration.exchanges,
                 self.config.rc.simulation_configuration.queues,
             )
+            self.topology.add_channel_configs(
+                self.channel_configs, self.unique_exchanges, self.app_name
+            )
+            self._schedule_topology_flush()
 
         else:
             logger.debug(
@@ -435,7 +577,20 @@ class Application:
         self._create_mode_status_observer()
         if self.shut_down_when_terminated:
             self._create_shut_down_observer()
-        logger.info(f"Application {self.app_name} successfully started up.")
+
+        # Wait for the initial wallclock offset (bounded by the NTP request timeout)
+        if offset_thread is not None:
+            offset_thread.join(timeout=5)
+        self._startup_timings["total"] = time.perf_counter() - startup_start
+        logger.info(
+            f"Application {self.app_name} successfully started up in {self._startup_timings['total']:.3f} s ("
+            + ", ".join(
+                f"{phase}: {seconds:.3f} s"
+                for phase, seconds in self._startup_timings.items()
+                if phase != "total"
+            )
+            + ")."
+        )
 
     def _start_io_loop(self):
         """
@@ -459,6 +614,8 @@ class Application:
         """
         self.channel = channel
         self.add_on_channel_close_callback()
+        # Consumers do not survive the channel
+        self._consumed_queues.clear()
 
         # Signal that connection is established
         self._is_connected.set()
@@ -471,7 +628,7 @@ class Application:
                 self.add_message_callback(app_name, app_topic, user_callback)
 
         # Process any queued messages now that we're connected
-        if hasattr(self, "_message_queue") and self._message_queue:
+        if self._outbound_buffer is not None and len(self._outbound_buffer):
             # Schedule message processing to happen after all initialization
             self.connection.ioloop.call_later(0.1, self._process_message_queue)
 
@@ -497,6 +654,15 @@ class Application:
 
         logger.debug(f"Channel was closed: {reason} (code: {reply_code})")
 
+        # Fail any topology operations in progress on the channel
+        self.topology.on_channel_closed(channel)
+        if reply_code == 404 and self._persist_topology:
+            logger.warning(
+                "Recorded topology no longer matches the broker; it will be redeclared."
+            )
+            self.topology.reset()
+            self._remove_topology_record()
+
         # Clear channel reference
         self.channel = None
 
@@ -579,9 +745,82 @@ class Application:
             connection (:obj:`pika.connection.Connection`): connection object
         """
         self.connection = connection
+        self.connection.add_on_connection_blocked_callback(self.on_connection_blocked)
+        self.connection.add_on_connection_unblocked_callback(
+            self.on_connection_unblocked
+        )
         self.connection.channel(on_open_callback=self.on_channel_open)
         # logger.info("Connection established successfully.")
 
+    def on_connection_blocked(self, connection, method_frame):
+        """
+        Invoked by pika when RabbitMQ blocks publishing on the connection due to a
+        resource (memory or disk) alarm. Messages are buffered until unblocked.
+
+        Args:
+            connection (:obj:`pika.connection.Connection`): connection object
+            method_frame (:obj:`pika.frame.Method`): Connection.Blocked method frame
+        """
+        if not self._is_blocked:
+            self._is_blocked = True
+            self._blocked_since = time.monotonic()
+            self._blocked_count += 1
+            reason = getattr(method_frame.method, "reason", None)
+            logger.warning(
+                f"Connection blocked by broker ({reason}); buffering outbound messages."
+            )
+
+    def on_connection_unblocked(self, connection, method_frame):
+        """
+        Invoked by pika when RabbitMQ unblocks publishing on the connection.
+        Publishes any buffered messages.
+
+        Args:
+            connection (:obj:`pika.connection.Connection`): connection object
+            method_frame (:obj:`pika.frame.Method`): Connection.Unblocked method frame
+        """
+        if self._is_blocked:
+            blocked_seconds = time.monotonic() - self._blocked_since
+            self._blocked_seconds += blocked_seconds
+            self._is_blocked = False
+            self._blocked_since = None
+            logger.info(
+                f"Connection unblocked by broker after {blocked_seconds:.3f} seconds: {self.get_backpressure_metrics()}"
+            )
+            self._process_message_queue()
+
+    def is_blocked(self) -> bool:
+        """
+        Checks if publishing is blocked by broker flow control.
+
+        Returns:
+            bool: True, if the broker has blocked the connection
+        """
+        return self._is_blocked
+
+    def get_backpressure_metrics(self) -> dict:
+        """
+        Gets publisher backpressure metrics.
+
+        Returns:
+            dict: blocked state, number and total duration (seconds) of broker blocks,
+                and outbound buffer metrics (currently buffered, total buffered, maximum
+                buffered, dropped, blocked calls, blocked seconds, and timeouts)
+        """
+        blocked_seconds = self._blocked_seconds
+        if self._is_blocked:
+            blocked_seconds += time.monotonic() - self._blocked_since
+        metrics = {
+            "blocked": self._is_blocked,
+            "connection_blocked_count": self._blocked_count,
+            "connection_blocked_seconds": blocked_seconds,
+            "queued": 0,
+        }
+        if self._outbound_buffer is not None:
+            metrics["queued"] = len(self._outbound_buffer)
+            metrics.update(self._outbound_buffer.metrics)
+        return metrics
+
     def reconnect(self):
         """
         Reconnect to RabbitMQ by reinitializing the connection with refreshed credentials.
@@ -636,11 +875,105 @@ class Application:
                 logger.error(f"Reconnection attempt failed: {e}")
                 self.connection.ioloop.call_later(self._reconnect_delay, self.reconnect)
 
+    def register_resource(
+        self, resource: object, close: Callable = None, name: str = None
+    ) -> None:
+        """
+        Registers a resource, such as a worker pool, cache, or file, to close when the
+        application shuts down. Resources are closed in reverse order of registration.
+
+        Args:
+            resource (object): resource to close
+            close (Callable): function closing the resource (default: the `close` or
+                `shutdown` method of the resource)
+            name (str): name of the resource in log messages (default: the resource type)
+        """
+        if close is None:
+            close = getattr(resource, "close", None) or getattr(
+                resource, "shutdown", None
+            )
+            if close is None:
+                raise ValueError(
+                    f"Resource {resource!r} has no close or shutdown method."
+                )
+        self._resources.append((resource, name or type(resource).__name__, close))
+
+    def unregister_resource(self, resource: object) -> None:
+        """
+        Unregisters a resource, for example after it was closed by the application.
+
+        Args:
+            resource (object): resource to unregister
+        """
+        self._resources = [
+            entry for entry in self._resources if entry[0] is not resource
+        ]
+
+    def get_shutdown_timings(self) -> dict:
+        """
+        Gets the duration of the phases of the shutdown in progress or completed.
+
+        Returns:
+            dict: duration (in seconds) per shutdown phase and in total
+        """
+        return dict(self._shutdown_timings)
+
+    def _get_shutdown_timeout(self, timeout: float = None) -> float:
+        """
+        Bounds a timeout by the time remaining until the shutdown deadline.
+
+        Args:
+            timeout (float): timeout, in seconds (default: None for no timeout)
+
+        Returns:
+            float: timeout, in seconds, not exceeding the time remaining until the deadline
+        """
+        if self._shutdown_deadline is None:
+            return timeout
+        remaining = max(0.0, self._shutdown_deadline - time.monotonic())
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _run_shutdown_phase(self, phase: str, function: Callable) -> None:
+        """
+        Runs a shutdown phase, records its duration, and logs any error so that the
+        remaining phases still run.
+
+        Args:
+            phase (str): name of the shutdown phase
+            function (Callable): function to run
+        """
+        phase_start = time.perf_counter()
+        try:
+            function()
+        except Exception as e:
+            logger.error(f"Error during shutdown phase {phase}: {e}")
+        finally:
+            self._shutdown_timings[phase] = time.perf_counter() - phase_start
+
+    def _on_shutdown_deadline(self) -> None:
+        """
+        Exits the process when the shutdown deadline passes.
+        """
+        logger.error(
+            f"Shutdown of {self.app_name} exceeded {self.shutdown_timeout} s ({self._shutdown_timings}); exiting."
+        )
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        os._exit(0)
+
     def shut_down(self) -> None:
         """
         Shuts down the application by stopping the background event loop and disconnecting from the broker.
+        Registered resources are closed afterwards. The process exits when done, or when the shutdown
+        deadline (`shutdown_timeout`) passes.
         """
         logger.info(f"Initiating shutdown of {self.app_name}")
+        shutdown_start = time.perf_counter()
+        self._shutdown_timings = {}
+        self._shutdown_deadline = time.monotonic() + self.shutdown_timeout
+        watchdog = threading.Timer(self.shutdown_timeout, self._on_shutdown_deadline)
+        watchdog.daemon = True
+        watchdog.start()
 
         # Clean up simulator-related resources
         if self._time_status_publisher is not None:
@@ -650,7 +983,7 @@ class Application:
         # Clean up connection-related resources
         if self.connection and not self._closing:
             logger.info(f"Shutting down {self.app_name} connection.")
-            self.stop_application()
+            self._run_shutdown_phase("connection", self.stop_application)
             self._consuming = False
 
         # Signal all threads to stop
@@ -659,160 +992,169 @@ class Application:
         if hasattr(self, "_should_stop"):
             self._should_stop.set()
 
-        # Comprehensive resource cleanup
-        self._cleanup_resources()
+        # Close registered resources
+        self._run_shutdown_phase("resources", self._cleanup_resources)
 
-        logger.info(f"Shutdown of {self.app_name} completed successfully.")
+        self._shutdown_timings["total"] = time.perf_counter() - shutdown_start
+        logger.info(
+            f"Shutdown of {self.app_name} completed successfully in {self._shutdown_timings['total']:.3f} s ("
+            + ", ".join(
+                f"{phase}: {seconds:.3f} s"
+                for phase, seconds in self._shutdown_timings.items()
+                if phase != "total"
+            )
+            + ")."
+        )
 
         # Exit the process
+        watchdog.cancel()
         os._exit(0)
 
     def _cleanup_resources(self):
         """
-        Comprehensive cleanup of both multiprocessing resource tracker and joblib resources.
-        Handles cleanup in the correct order to prevent resource leaks and warnings.
+        Closes registered resources in reverse order of registration, then shuts down the
+        joblib worker pool and clears the multiprocessing resource tracker, if they are used.
+        Resources remaining when the shutdown deadline passes are not closed.
         """
-        try:
-            import gc
-            import sys
-            import warnings
-
-            # Suppress resource tracker warnings
-            warnings.filterwarnings("ignore", category=UserWarning, module="joblib")
-            warnings.filterwarnings(
-                "ignore",
-                category=UserWarning,
-                message="resource_tracker: There appear to be.*leaked.*objects",
-            )
-
-            # 1. First cleanup joblib resources (if joblib is used)
-            joblib_used = "joblib" in sys.modules
-            if joblib_used:
-                logger.debug("Cleaning up joblib resources")
-                try:
-                    import joblib
-                    from joblib.externals.loky import process_executor
-
-                    # Force garbage collection to help break reference cycles
-                    gc.collect()
+        import sys
+        import warnings
 
-                    # Clear any joblib Memory caches
-                    memory_locations = []
-                    for obj in gc.get_objects():
-                        if isinstance(obj, joblib.Memory):
-                            memory_locations.append(obj.location)
-                            obj.clear()
-
-                    if memory_locations:
-                        logger.debug(
-                            f"Cleared {len(memory_locations)} joblib memory caches"
-                        )
-
-                    # Find and terminate any active Parallel instances
-                    terminated_count = 0
-                    for obj in gc.get_objects():
-                        try:
-                            if (
-                                hasattr(obj, "_backend")
-                                and hasattr(obj, "n_jobs")
-                                and hasattr(obj, "_terminate")
-                            ):
-                                obj._terminate()
-                                terminated_count += 1
-                        except Exception:
-                            pass
-
-                    if terminated_count:
-                        logger.debug(
-                            f"Terminated {terminated_count} joblib Parallel instances"
-                        )
+        # Suppress resource tracker warnings
+        warnings.filterwarnings("ignore", category=UserWarning, module="joblib")
+        warnings.filterwarnings(
+            "ignore",
+            category=UserWarning,
+            message="resource_tracker: There appear to be.*leaked.*objects",
+        )
 
-                    # Reset the process executor state
-                    process_executor._CURRENT_DEPTH = 0
-                    if hasattr(process_executor, "_INITIALIZER"):
-                        process_executor._INITIALIZER = None
-                    if hasattr(process_executor, "_INITARGS"):
-                        process_executor._INITARGS = ()
+        # 1. Close registered resources
+        while self._resources:
+            if self._get_shutdown_timeout() == 0:
+                logger.warning(
+                    f"Shutdown deadline passed; not closing {[entry[1] for entry in self._resources]}."
+                )
+                self._resources = []
+                break
+            _, name, close = self._resources.pop()
+            close_start = time.perf_counter()
+            try:
+                close()
+                logger.debug(
+                    f"Closed {name} in {time.perf_counter() - close_start:.3f} s."
+                )
+            except Exception as e:
+                logger.warning(f"Error closing {name}: {e}")
 
-                except Exception as e:
-                    logger.debug(f"Error during joblib cleanup: {e}")
+        # 2. Shut down the joblib (loky) worker pool, if joblib is used
+        if "joblib" in sys.modules:
+            try:
+                from joblib.externals.loky import reusable_executor
 
-            # 2. Then clean up multiprocessing resource tracker
+                executor = reusable_executor._executor
+                if executor is not None:
+                    logger.debug("Shutting down joblib worker pool")
+                    executor.shutdown(wait=False, kill_workers=True)
+            except Exception as e:
+                logger.debug(f"Error during joblib cleanup: {e}")
+
+        # 3. Clear the multiprocessing resource tracker, if used
+        resource_tracker = sys.modules.get("multiprocessing.resource_tracker")
+        tracker = getattr(resource_tracker, "_resource_tracker", None)
+        resources = getattr(tracker, "_resources", None)
+        if resources:
+            logger.debug("Cleaning up resource tracker")
             try:
-                import multiprocessing.resource_tracker as resource_tracker
+                resources.clear()
+            except Exception as e:
+                logger.debug(f"Error during resource tracker cleanup: {e}")
 
-                # Force resource tracker to clean up resources
-                if (
-                    hasattr(resource_tracker, "_resource_tracker")
-                    and resource_tracker._resource_tracker is not None
-                ):
+    def set_rate_limit(
+        self,
+        app_name: str,
+        app_topic: str,
+        rate: float,
+        burst: int = 1,
+        policy: str = "drop",
+    ) -> None:
+        """
+        Sets a token bucket rate limit for messages sent to a topic.
 
-                    logger.debug("Cleaning up resource tracker")
-                    tracker = resource_tracker._resource_tracker
-
-                    if hasattr(tracker, "_resources"):
-                        for resource_type in list(tracker._resources.keys()):
-                            resources = tracker._resources.get(resource_type, set())
-                            if resources:
-                                logger.debug(
-                                    f"Cleaning up {len(resources)} {resource_type} resources"
-                                )
-                                resources_copy = resources.copy()
-                                for resource in resources_copy:
-                                    try:
-                                        resources.discard(resource)
-                                    except Exception as e:
-                                        logger.debug(
-                                            f"Error discarding {resource_type} resource: {e}"
-                                        )
-
-                        # Final safety check - clear all remaining resources
-                        tracker._resources.clear()
-
-                # Force garbage collection after cleanup
-                gc.collect()
-
-            except (ImportError, AttributeError, Exception) as e:
-                logger.debug(f"Error during resource tracker cleanup: {e}")
+        Args:
+            app_name (str): application name
+            app_topic (str): topic name
+            rate (float): sustained message rate, in messages per second
+            burst (int): maximum number of messages sent in a burst (default: 1)
+            policy (str): "drop" to discard messages exceeding the rate limit, or "coalesce"
+                to send only the latest message when allowed (default: "drop")
+        """
+        key = f"{app_name}.{app_topic}"
+        if key in self._rate_limits:
+            self._rate_limits[key].cancel()
+        self._rate_limits[key] = RateLimit(
+            rate,
+            burst,
+            policy,
+            send=functools.partial(self._send_message, app_name, [app_topic]),
+        )
+        logger.info(
+            f"Rate limit for topic {key}: {rate} messages/second (burst: {burst}, policy: {policy})."
+        )
 
-        except Exception as e:
-            logger.warning(f"Error during resource cleanup: {e}")
+    def get_rate_limit_metrics(self) -> dict:
+        """
+        Gets the number of sent, dropped, and coalesced messages for each rate-limited topic.
+
+        Returns:
+            dict: rate limit metrics, keyed by <app_name>.<app_topic>
+        """
+        return {key: dict(limit.metrics) for key, limit in self._rate_limits.items()}
 
     def send_message(self, app_name, app_topics, payload: str) -> None:
         """
-        Sends a message to the broker. If the connection is down, the message is queued
-        for later delivery when the connection is restored.
+        Sends a message to the broker, subject to any topic rate limits. If the connection
+        is down or blocked by broker flow control, the message is buffered for later delivery
+        when the connection is restored or unblocked, subject to the outbound buffer policy.
 
         Args:
             app_name (str): application name
             app_topics (str or list): topic name or list of topic names
             payload (str): message payload
         """
-        # Initialize message queue if it doesn't exist
-        if not hasattr(self, "_message_queue"):
-            self._message_queue = []
-            # self._queue_max_size = 1000  # Limit queue size to prevent memory issues
-
         if isinstance(app_topics, str):
             app_topics = [app_topics]
 
+        if self._rate_limits:
+            app_topics = [
+                app_topic
+                for app_topic in app_topics
+                if f"{app_name}.{app_topic}" not in self._rate_limits
+                or self._rate_limits[f"{app_name}.{app_topic}"].submit(payload)
+            ]
+            if not app_topics:
+                return
+
+        self._send_message(app_name, app_topics, payload)
+
+    def _send_message(self, app_name: str, app_topics: list, payload: str) -> None:
+        """
+        Sends a message to the broker without applying rate limits.
+
+        Args:
+            app_name (str): application name
+            app_topics (list): list of topic names
+            payload (str): message payload
+        """
         # Check if channel is available
-        if self.channel is None or not self._is_connected.is_set():
-            logger.warning(f"Connection down, queueing message for later delivery")
-
-            # Queue the message if there's space available
-            if len(self._message_queue) < self._queue_max_size:
-                # Add timestamp to each message for FIFO ordering
-                timestamp = time.time()
-                for app_topic in app_topics:
-                    self._message_queue.append(
-                        (timestamp, app_name, app_topic, payload)
-                    )
-                    logger.info(
-                        f"Queued message for topic {app_topic} (queue size: {len(self._message_queue)})"
-                    )
-            else:
-                logger.error(f"Message queue full, dropping message for {app_topics}")
+        if self.channel is None or not self._is_connected.is_set() or self._is_blocked:
+            logger.debug(
+                "Connection blocked, buffering message for later delivery"
+                if self._is_blocked
+                else "Connection down, buffering message for later delivery"
+            )
+            # Add timestamp to each message for FIFO ordering
+            timestamp = time.time()
+            for app_topic in app_topics:
+                self._buffer_message((timestamp, app_name, app_topic, payload))
             return
 
         # Try to send any queued messages first
@@ -822,98 +1164,142 @@ class Application:
         for app_topic in app_topics:
             routing_key = self.create_routing_key(app_name=app_name, topic=app_topic)
             try:
-                self.channel.basic_publish(
-                    exchange=self.prefix,
-                    routing_key=routing_key,
-                    body=payload,
-                    properties=pika.BasicProperties(
-                        content_type=self.config.rc.server_configuration.servers.rabbitmq.content_type,
-                        content_encoding=self.config.rc.server_configuration.servers.rabbitmq.content_encoding,
-                        headers=self.config.rc.server_configuration.servers.rabbitmq.headers,
-                        delivery_mode=self.config.rc.server_configuration.servers.rabbitmq.delivery_mode,
-                        priority=self.config.rc.server_configuration.servers.rabbitmq.priority,
-                        correlation_id=self.config.rc.server_configuration.servers.rabbitmq.correlation_id,
-                        reply_to=self.config.rc.server_configuration.servers.rabbitmq.reply_to,
-                        expiration=self.config.rc.server_configuration.servers.rabbitmq.message_expiration,
-                        message_id=self.config.rc.server_configuration.servers.rabbitmq.message_id,
-                        timestamp=self.config.rc.server_configuration.servers.rabbitmq.timestamp,
-                        type=self.config.rc.server_configuration.servers.rabbitmq.type,
-                        user_id=self.config.rc.server_configuration.servers.rabbitmq.user_id,
-                        app_id=self.config.rc.server_configuration.servers.rabbitmq.app_id,
-                        cluster_id=self.config.rc.server_configuration.servers.rabbitmq.cluster_id,
-                    ),
-                )
+                self._publish(routing_key, payload)
                 logger.debug(
                     f"Successfully sent message '{payload}' to topic '{routing_key}'."
                 )
             except Exception as e:
                 logger.warning(f"Failed to publish message to {routing_key}: {e}")
-                # Queue the failed message if there's space available
-                if len(self._message_queue) < self._queue_max_size:
-                    timestamp = time.time()
-                    self._message_queue.append(
-                        (timestamp, app_name, app_topic, payload)
-                    )
-                    logger.info(
-                        f"Queued failed message for retry (queue size: {len(self._message_queue)})"
-                    )
+                # Queue the failed message for retry
+                self._buffer_message((time.time(), app_name, app_topic, payload))
+
+    def _buffer_message(self, message: tuple) -> bool:
+        """
+        Adds a message to the outbound buffer. The calling thread may block (subject to
+        the outbound buffer policy) unless it is the I/O thread.
+
+        Args:
+            message (tuple): timestamp, application name, topic, and payload
+
+        Returns:
+            bool: True, if the message was buffered
+        """
+        _, app_name, app_topic, _ = message
+        priorities = (
+            self.config.rc.server_configuration.servers.rabbitmq.topic_priorities or {}
+        )
+        buffered = self._outbound_buffer.put(
+            message,
+            priority=priorities.get(app_topic, 0),
+            block=threading.current_thread() is not self._io_thread,
+        )
+        if buffered:
+            logger.debug(
+                f"Buffered message for topic {app_topic} (buffer size: {len(self._outbound_buffer)})"
+            )
+        else:
+            logger.error(
+                f"Outbound buffer full, dropping message for {app_name}.{app_topic}"
+            )
+        return buffered
+
+    def _publish(self, routing_key: str, payload: str) -> None:
+        """
+        Publishes a message to the broker using the configured message properties.
+        If the message envelope is enabled, adds the publisher id, sequence number
+        (per routing key), and publish wallclock time (ns) to the message headers.
+
+        Args:
+            routing_key (str): routing key
+            payload (str): message payload
+        """
+        rabbitmq = self.config.rc.server_configuration.servers.rabbitmq
+        headers = rabbitmq.headers
+        sequence = None
+        if rabbitmq.message_envelope:
+            sequence = self._publish_sequences.get(routing_key, 0) + 1
+            headers = {
+                **(headers or {}),
+                MessageTracker.HEADER_PUBLISHER_ID: self.publisher_id,
+                MessageTracker.HEADER_SEQUENCE: sequence,
+                MessageTracker.HEADER_PUBLISHED_NS: self._get_wallclock_time_ns(),
+            }
+        self.channel.basic_publish(
+            exchange=self.prefix,
+            routing_key=routing_key,
+            body=payload,
+            properties=pika.BasicProperties(
+                content_type=rabbitmq.content_type,
+                content_encoding=rabbitmq.content_encoding,
+                headers=headers,
+                delivery_mode=rabbitmq.delivery_mode,
+                priority=rabbitmq.priority,
+                correlation_id=rabbitmq.correlation_id,
+                reply_to=rabbitmq.reply_to,
+                expiration=rabbitmq.message_expiration,
+                message_id=rabbitmq.message_id,
+                timestamp=rabbitmq.timestamp,
+                type=rabbitmq.type,
+                user_id=rabbitmq.user_id,
+                app_id=rabbitmq.app_id,
+                cluster_id=rabbitmq.cluster_id,
+            ),
+        )
+        if sequence is not None:
+            self._publish_sequences[routing_key] = sequence
+
+    def _get_wallclock_time_ns(self) -> int:
+        """
+        Gets the current wallclock time (corrected by the wallclock offset) in nanoseconds.
+
+        Returns:
+            int: nanoseconds since the epoch
+        """
+        return (
+            time.time_ns()
+            + self.simulator.get_wallclock_offset() // timedelta(microseconds=1) * 1000
+        )
 
     def _process_message_queue(self):
         """
-        Process queued messages when connection is available.
-        Attempts to send all queued messages in order of oldest first.
+        Process buffered messages when connection is available and not blocked.
+        Attempts to send all buffered messages in order of oldest first.
         """
-        if not hasattr(self, "_message_queue") or not self._message_queue:
+        if self._outbound_buffer is None or not len(self._outbound_buffer):
             return  # No messages to process
 
-        if self.channel is None or not self._is_connected.is_set():
+        if self.channel is None or not self._is_connected.is_set() or self._is_blocked:
             return  # Still no connection
 
-        # Process the queue in timestamp order (oldest first)
-        logger.info(f"Processing message queue ({len(self._message_queue)} messages)")
-
         # Sort messages by timestamp (oldest first)
-        sorted_messages = sorted(self._message_queue, key=lambda x: x[0])
-        self._message_queue.clear()
+        sorted_messages = sorted(self._outbound_buffer.pop_all(), key=lambda x: x[0])
+
+        # Process the queue in timestamp order (oldest first)
+        logger.info(f"Processing message queue ({len(sorted_messages)} messages)")
 
         success_count = 0
-        for timestamp, app_name, app_topic, payload in sorted_messages:
+        for message in sorted_messages:
+            timestamp, app_name, app_topic, payload = message
+            if self._is_blocked:
+                # Blocked again while processing, keep remaining messages buffered
+                self._buffer_message(message)
+                continue
             routing_key = self.create_routing_key(app_name=app_name, topic=app_topic)
             try:
-                self.channel.basic_publish(
-                    exchange=self.prefix,
-                    routing_key=routing_key,
-                    body=payload,
-                    properties=pika.BasicProperties(
-                        content_type=self.config.rc.server_configuration.servers.rabbitmq.content_type,
-                        content_encoding=self.config.rc.server_configuration.servers.rabbitmq.content_encoding,
-                        headers=self.config.rc.server_configuration.servers.rabbitmq.headers,
-                        delivery_mode=self.config.rc.server_configuration.servers.rabbitmq.delivery_mode,
-                        priority=self.config.rc.server_configuration.servers.rabbitmq.priority,
-                        correlation_id=self.config.rc.server_configuration.servers.rabbitmq.correlation_id,
-                        reply_to=self.config.rc.server_configuration.servers.rabbitmq.reply_to,
-                        expiration=self.config.rc.server_configuration.servers.rabbitmq.message_expiration,
-                        message_id=self.config.rc.server_configuration.servers.rabbitmq.message_id,
-                        timestamp=self.config.rc.server_configuration.servers.rabbitmq.timestamp,
-                        type=self.config.rc.server_configuration.servers.rabbitmq.type,
-                        user_id=self.config.rc.server_configuration.servers.rabbitmq.user_id,
-                        app_id=self.config.rc.server_configuration.servers.rabbitmq.app_id,
-                        cluster_id=self.config.rc.server_configuration.servers.rabbitmq.cluster_id,
-                    ),
-                )
+                self._publish(routing_key, payload)
                 success_count += 1
             except Exception as e:
                 # If sending still fails, put it back in the queue with original timestamp
                 # to preserve ordering
                 logger.warning(f"Failed to resend queued message to {routing_key}: {e}")
-                self._message_queue.append((timestamp, app_name, app_topic, payload))
+                self._buffer_message(message)
 
         if success_count > 0:
             logger.info(f"Successfully sent {success_count} queued messages")
 
-        if self._message_queue:
+        if len(self._outbound_buffer):
             logger.info(
-                f"{len(self._message_queue)} messages remain queued for later delivery"
+                f"{len(self._outbound_buffer)} messages remain queued for later delivery"
             )
 
     def routing_key_matches_pattern(self, routing_key, pattern):
@@ -1002,15 +1388,9 @@ class Application:
                     # Create a unique queue name for this wildcard subscription
                     queue_name = f"{routing_key.replace('*', 'star').replace('#', 'hash')}.{queue_suffix}"
 
-                    # Declare a new queue
-                    self.channel.queue_declare(
-                        queue=queue_name, durable=True, auto_delete=False
-                    )
-
-                    # Bind queue to the exchange with the wildcard pattern
-                    self.channel.queue_bind(
-                        exchange=self.prefix, queue=queue_name, routing_key=routing_key
-                    )
+                    # Plan a new queue bound to the exchange with the wildcard pattern
+                    self.topology.add_queue(queue_name, durable=True, auto_delete=False)
+                    self.topology.add_binding(queue_name, self.prefix, routing_key)
 
                     # Track the declared queue and exchange
                     self.declared_queues.add(queue_name)
@@ -1025,13 +1405,11 @@ class Application:
                         routing_key=routing_key, app_specific_extender=queue_suffix
                     )
 
+                # Consume from the queue once declared and bound
                 if queue_name:
-                    self.channel.basic_qos(prefetch_count=1)
-                    self._consumer_tag = self.channel.basic_consume(
-                        queue=queue_name,
-                        on_message_callback=self._handle_message,
-                        auto_ack=False,
-                    )
+                    if queue_name not in self._consumer_queues:
+                        self._consumer_queues.append(queue_name)
+                    self._schedule_topology_flush()
 
         # Add the callback to the list for this routing key
         self._callbacks_per_topic[routing_key].append(user_callback)
@@ -1050,22 +1428,17 @@ class Application:
         routing_key = method.routing_key
         logger.debug(f"Received message with routing key: {routing_key}")
 
-        # First check for exact routing key match
-        direct_callbacks = self._callbacks_per_topic.get(routing_key, [])
-
-        # Then find any wildcard patterns that match this routing key
-        wildcard_callbacks = []
-        for pattern, callbacks in self._callbacks_per_topic.items():
-            # Skip exact matches (already handled) and patterns that don't match
-            if pattern == routing_key:
-                continue
-
-            if "*" in pattern or "#" in pattern:
-                if self.routing_key_matches_pattern(routing_key, pattern):
-                    wildcard_callbacks.extend(callbacks)
+        envelope = MessageTracker.read_envelope(properties.headers)
+        if envelope is not None and self.message_tracker.is_duplicate(
+            envelope[0], routing_key, envelope[1]
+        ):
+            logger.debug(
+                f"Dropping duplicate message {envelope[1]} from {envelope[0]} ({routing_key})."
+            )
+            self.acknowledge_message(method.delivery_tag)
+            return
 
-        # Combine all matching callbacks
-        all_callbacks = direct_callbacks + wildcard_callbacks
+        all_callbacks = self._get_matching_callbacks(routing_key)
 
         if all_callbacks:
             logger.debug(
@@ -1084,6 +1457,7 @@ class Application:
 
             # Only acknowledge after all callbacks complete successfully
             self.acknowledge_message(method.delivery_tag)
+            self._track_message(envelope, routing_key)
         except Exception as e:
             logger.error(f"Error processing message: {e}")
             # Reject the message if any callback fails
@@ -1092,6 +1466,52 @@ class Application:
                     delivery_tag=method.delivery_tag, requeue=True
                 )
 
+    def _track_message(self, envelope: tuple, routing_key: str) -> None:
+        """
+        Records a received message envelope with the message tracker.
+
+        Args:
+            envelope (tuple): publisher id, sequence number, and publish time (ns), or None
+            routing_key (str): routing key of the received message
+        """
+        if envelope is not None:
+            publisher_id, sequence, published_ns = envelope
+            self.message_tracker.record(
+                publisher_id,
+                routing_key,
+                sequence,
+                published_ns,
+                self._get_wallclock_time_ns(),
+            )
+
+    def _get_matching_callbacks(self, routing_key: str) -> list:
+        """
+        Collects the callbacks registered for a routing key, including callbacks
+        registered with wildcard patterns (* and #) that match the routing key.
+
+        Args:
+            routing_key (str): routing key of the received message
+
+        Returns:
+            list: callbacks to be called for the routing key
+        """
+        # First check for exact routing key match
+        direct_callbacks = self._callbacks_per_topic.get(routing_key, [])
+
+        # Then find any wildcard patterns that match this routing key
+        wildcard_callbacks = []
+        for pattern, callbacks in self._callbacks_per_topic.items():
+            # Skip exact matches (already handled) and patterns that don't match
+            if pattern == routing_key:
+                continue
+
+            if "*" in pattern or "#" in pattern:
+                if self.routing_key_matches_pattern(routing_key, pattern):
+                    wildcard_callbacks.extend(callbacks)
+
+        # Combine all matching callbacks
+        return direct_callbacks + wildcard_callbacks
+
     def acknowledge_message(self, delivery_tag):
         """Acknowledge the message delivery from RabbitMQ by sending a
         Basic.Ack RPC method for the delivery tag.
@@ -1101,10 +1521,39 @@ class Application:
         """
         try:
             logger.debug(f"Acknowledging message {delivery_tag}")
-            self.channel.basic_ack(delivery_tag, True)
+            self.channel.basic_ack(delivery_tag, False)
         except:
             pass
 
+    def settle_message(self, method, properties, success: bool) -> None:
+        """
+        Acknowledges a message whose callbacks completed successfully, or rejects it for
+        redelivery otherwise. Safe to call from any thread, as the acknowledgement is
+        issued from the I/O loop thread.
+
+        Args:
+            method (:obj:`pika.spec.Basic.Deliver`): method frame
+            properties (:obj:`pika.spec.BasicProperties`): properties frame
+            success (bool): True, if all callbacks completed successfully
+        """
+
+        def settle():
+            if success:
+                self.acknowledge_message(method.delivery_tag)
+                self._track_message(
+                    MessageTracker.read_envelope(properties.headers),
+                    method.routing_key,
+                )
+            elif self.channel:
+                self.channel.basic_reject(
+                    delivery_tag=method.delivery_tag, requeue=True
+                )
+
+        if self.connection is None:
+            settle()
+        else:
+            self.connection.ioloop.add_callback_threadsafe(settle)
+
     def create_routing_key(self, app_name: str, topic: str):
         """
         Creates a routing key for the application. The routing key is used to bind the queue to the exchange.
@@ -1120,7 +1569,8 @@ class Application:
         self, routing_key: str = None, app_specific_extender: str = None
     ) -> None:
         """
-        Declares and binds a queue to the exchange. The queue is bound to the exchange using the routing key. The routing key is created using the application name and topic.
+        Plans the declaration of a queue bound to the exchange. The queue is bound to the exchange using the routing key. The routing key is created using the application name and topic.
+        Planned declarations are applied in a batch by the I/O loop (see :obj:`TopologyPlanner`).
 
         Args:
             routing_key (str): routing key
@@ -1131,18 +1581,17 @@ class Application:
                 queue_name = ".".join([routing_key, app_specific_extender])
             else:
                 queue_name = routing_key
-            self.channel.queue_declare(
-                queue=queue_name, durable=True, auto_delete=False
-            )
-            self.channel.queue_bind(
-                exchange=self.prefix, queue=queue_name, routing_key=routing_key
-            )
+            self.topology.add_queue(queue_name, durable=True, auto_delete=False)
+            self.topology.add_binding(queue_name, self.prefix, routing_key)
+            self._schedule_topology_flush()
             # Create list of declared queues and exchanges
             self.declared_queues.add(queue_name.strip())
             # self.declared_queues.add(routing_key.strip())
             self.declared_exchanges.add(self.prefix.strip())
 
-            logger.debug(f"Bound queue '{queue_name}' to topic '{routing_key}'.")
+            logger.debug(
+                f"Planned queue '{queue_name}' bound to topic '{routing_key}'."
+            )
 
         except:
             routing_key = None
@@ -1178,8 +1627,9 @@ class Application:
 
     def _delete_queues_with_callback(self, completion_event):
         """
-        Deletes all declared queues from RabbitMQ with proper callbacks,
-        and signals the completion_event when done.
+        Deletes all declared queues from RabbitMQ in a batch (see :obj:`TopologyPlanner`),
+        and signals the completion_event when done. Deleting a queue also removes its
+        bindings and discards its messages.
         Does NOT delete exchanges - those are managed exclusively by the Manager class.
 
         Args:
@@ -1190,8 +1640,7 @@ class Application:
             completion_event.set()  # Signal completion since we can't proceed
             return
 
-        # Create copies to avoid modification during iteration
-        queues_to_delete = list(self.declared_queues)
+        queues_to_delete = self.topology.get_queues()
 
         # If nothing to delete, signal completion immediately
         if not queues_to_delete:
@@ -1199,139 +1648,232 @@ class Application:
             completion_event.set()
             return
 
-        # Track how many queues are still pending deletion
-        pending_deletions = len(queues_to_delete)
+        def on_complete(failed, channels):
+            self._close_topology_channels(channels)
+            failed_queues = {key[1] for key in failed}
+            for queue_name in queues_to_delete:
+                if queue_name not in failed_queues:
+                    logger.debug(f"Successfully deleted queue: {queue_name}")
+                # Remove from tracking even if deletion fails
+                self.declared_queues.discard(queue_name)
+            if failed_queues:
+                logger.error(f"Failed to delete queues: {sorted(failed_queues)}")
+            else:
+                logger.debug("All queues have been deleted.")
+            completion_event.set()
+
+        def delete_queues():
+            if not self.channel or not self.channel.is_open:
+                completion_event.set()
+                return
+            self._open_topology_channels(
+                len(queues_to_delete),
+                lambda channels: self.topology.delete_queues(
+                    [self.channel] + channels,
+                    functools.partial(on_complete, channels=channels),
+                ),
+            )
 
-        # Callback functions
-        def on_queue_purged(method_frame, queue_name):
-            """Callback for queue purge"""
-            logger.debug(f"Successfully purged queue: {queue_name}")
-            # After purging, unbind the queue
-            unbind_queue_from_exchanges(queue_name)
+        # Issue operations from the I/O loop thread
+        self.connection.ioloop.add_callback_threadsafe(delete_queues)
 
-        def on_queue_unbind_ok(
-            method_frame, queue_name, current_exchange, remaining_exchanges
-        ):
-            """Callback for queue unbind"""
-            logger.debug(
-                f"Successfully unbound queue {queue_name} from exchange {current_exchange}"
+    def wait_for_topology(self, timeout: float = None) -> bool:
+        """
+        Waits until all planned queue declarations and bindings are applied and consumers
+        are started.
+
+        Args:
+            timeout (float): maximum number of seconds to wait (default: None waits indefinitely)
+
+        Returns:
+            bool: True, if the planned topology is applied
+        """
+        return self._topology_ready.wait(timeout)
+
+    def _schedule_topology_flush(self) -> None:
+        """
+        Schedules a batch of the pending topology declarations on the I/O loop. Declarations
+        planned before the batch runs are coalesced into the same batch.
+        """
+        with self._topology_lock:
+            self._topology_ready.clear()
+            schedule = (
+                not self._topology_flush_scheduled and self.connection is not None
             )
-            if remaining_exchanges:
-                # Continue unbinding from next exchange
-                next_exchange = remaining_exchanges[0]
-                try:
-                    self.channel.queue_unbind(
-                        queue=queue_name,
-                        exchange=next_exchange,
-                        routing_key=queue_name,
-                        callback=lambda method_frame: on_queue_unbind_ok(
-                            method_frame,
-                            queue_name,
-                            next_exchange,
-                            remaining_exchanges[1:],
-                        ),
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to unbind queue {queue_name} from exchange {next_exchange}: {e}"
-                    )
-                    # Continue with queue deletion even if unbinding fails
-                    delete_queue(queue_name)
-            else:
-                # All unbinds complete, delete queue
-                delete_queue(queue_name)
+            if schedule:
+                self._topology_flush_scheduled = True
+        if schedule:
+            self.connection.ioloop.add_callback_threadsafe(self._flush_topology)
+
+    def _flush_topology(self) -> None:
+        """
+        Applies the pending topology declarations in a batch and starts consumers for the
+        declared queues. Runs on the I/O loop thread.
+        """
+        with self._topology_lock:
+            if self.topology.is_busy():
+                # Flushed again when the batch in progress completes
+                return
+            self._topology_flush_scheduled = False
+        if not self.channel or not self.channel.is_open:
+            # Flushed again when callbacks are restored on the new channel
+            return
+        pending = self.topology.count_pending()
+        if not pending:
+            self._on_topology_applied([])
+            return
+        logger.debug(f"Applying {pending} topology declarations.")
+        self._open_topology_channels(
+            pending,
+            lambda channels: self.topology.declare(
+                [self.channel] + channels,
+                functools.partial(self._on_topology_applied, channels=channels),
+            ),
+        )
 
-        def on_queue_deleted(method_frame, queue_name):
-            """Callback for queue delete"""
-            nonlocal pending_deletions
-            logger.debug(f"Successfully deleted queue: {queue_name}")
-            self.declared_queues.discard(queue_name)
+    def _open_topology_channels(self, operations: int, on_open: Callable) -> None:
+        """
+        Opens additional channels to spread a topology batch over, up to the configured
+        maximum, and calls on_open with the list of opened channels. Small batches only use
+        the application channel.
 
-            # Decrement pending deletions counter
-            pending_deletions -= 1
+        Args:
+            operations (int): number of operations in the batch
+            on_open (Callable): called with the list of additional channels once opened
+        """
+        count = (
+            min(
+                self._topology_channels,
+                math.ceil(operations / self.TOPOLOGY_OPERATIONS_PER_CHANNEL),
+            )
+            - 1
+        )
+        channels = []
+        if count <= 0:
+            on_open(channels)
+            return
 
-            # When all queues are deleted, signal completion
-            if pending_deletions == 0:
-                logger.debug("All queues have been deleted.")
-                completion_event.set()
+        def on_channel_open(channel):
+            channel.add_on_close_callback(self._on_topology_channel_closed)
+            channels.append(channel)
+            if len(channels) == count:
+                on_open(channels)
 
-        def unbind_queue_from_exchanges(queue_name):
-            """Unbind queue from each exchange"""
-            exchanges_to_unbind_from = list(self.declared_exchanges)
-            if exchanges_to_unbind_from:
-                first_exchange = exchanges_to_unbind_from[0]
-                try:
-                    if first_exchange and first_exchange != "":
-                        logger.debug(
-                            f"Unbinding queue {queue_name} from exchange {first_exchange}"
-                        )
-                        self.channel.queue_unbind(
-                            queue=queue_name,
-                            exchange=first_exchange,
-                            routing_key=queue_name,
-                            callback=lambda method_frame: on_queue_unbind_ok(
-                                method_frame,
-                                queue_name,
-                                first_exchange,
-                                exchanges_to_unbind_from[1:],
-                            ),
-                        )
-                    else:
-                        # Skip empty exchange, move to next
-                        on_queue_unbind_ok(
-                            None,
-                            queue_name,
-                            first_exchange,
-                            exchanges_to_unbind_from[1:],
-                        )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to unbind queue {queue_name} from exchange {first_exchange}: {e}"
-                    )
-                    # Continue with queue deletion even if unbinding fails
-                    delete_queue(queue_name)
-            else:
-                # No exchanges to unbind from, proceed with delete
-                delete_queue(queue_name)
+        for _ in range(count):
+            self.connection.channel(on_open_callback=on_channel_open)
 
-        def delete_queue(queue_name):
-            """Delete a queue with callback"""
-            try:
-                logger.debug(f"Deleting queue: {queue_name}")
-                self.channel.queue_delete(
-                    queue=queue_name,
-                    if_unused=False,
-                    if_empty=False,
-                    callback=lambda method_frame: on_queue_deleted(
-                        method_frame, queue_name
-                    ),
-                )
-            except Exception as e:
-                logger.error(f"Failed to delete queue {queue_name}: {e}")
-                # Remove from tracking even if deletion fails and update counter
-                self.declared_queues.discard(queue_name)
-                nonlocal pending_deletions
-                pending_deletions -= 1
+    def _on_topology_channel_closed(self, channel, reason) -> None:
+        """
+        Invoked by pika when an additional topology channel is closed.
+
+        Args:
+            channel (:obj:`pika.channel.Channel`): channel object
+            reason (Exception): exception representing reason for channel closure
+        """
+        logger.debug(f"Topology channel was closed: {reason}")
+        self.topology.on_channel_closed(channel)
 
-                # Check if this was the last queue
-                if pending_deletions == 0:
-                    # All queues processed (or failed), signal completion
-                    completion_event.set()
+    def _close_topology_channels(self, channels: list) -> None:
+        """
+        Closes additional topology channels.
 
-        # Start the deletion process for each queue
-        for queue_name in queues_to_delete:
-            try:
-                logger.debug(f"Attempting to purge queue: {queue_name}")
-                self.channel.queue_purge(
+        Args:
+            channels (list(:obj:`pika.channel.Channel`)): channels to close
+        """
+        for channel in channels:
+            if channel.is_open:
+                channel.close()
+
+    def _on_topology_applied(self, failed: list, channels: list = ()) -> None:
+        """
+        Invoked when a topology batch completes. Starts consumers for the declared queues,
+        records the applied topology if persisted, and signals that the topology is ready.
+
+        Args:
+            failed (list(tuple)): keys of the failed declarations
+            channels (list(:obj:`pika.channel.Channel`)): additional channels used by the batch
+        """
+        self._close_topology_channels(channels)
+        if failed:
+            logger.warning(f"Failed to apply topology declarations: {failed}")
+        if self.channel and self.channel.is_open:
+            for queue_name in self._consumer_queues:
+                if queue_name in self._consumed_queues or not self.topology.is_applied(
+                    queue_name
+                ):
+                    continue
+                if not self._consumed_queues:
+                    self.channel.basic_qos(prefetch_count=1)
+                self._consumer_tag = self.channel.basic_consume(
                     queue=queue_name,
-                    callback=lambda method_frame, q=queue_name: on_queue_purged(
-                        method_frame, q
-                    ),
+                    on_message_callback=self._handle_message,
+                    auto_ack=False,
                 )
-            except Exception as e:
-                logger.debug(f"Failed to purge queue {queue_name}: {e}")
-                # Continue with unbinding even if purge fails
-                unbind_queue_from_exchanges(queue_name)
+                self._consumed_queues.add(queue_name)
+        if self._persist_topology and not failed:
+            self._save_topology_record()
+        with self._topology_lock:
+            flush = self._topology_flush_scheduled
+            if not flush:
+                self._topology_ready.set()
+        if flush:
+            self._flush_topology()
+
+    def _get_topology_record_path(self) -> str:
+        """
+        Gets the path of the record of the applied topology, which is kept between runs if
+        the topology is persisted.
+
+        Returns:
+            str: path of the topology record
+        """
+        rabbitmq = self.config.rc.server_configuration.servers.rabbitmq
+        key = hashlib.sha256(
+            f"{rabbitmq.host}|{rabbitmq.port}|{rabbitmq.virtual_host}|{self.prefix}|{self.app_name}".encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        return os.path.join(self.config.config_cache_dir, f"topology-{key}.json")
+
+    def _load_topology_record(self) -> None:
+        """
+        Marks the declarations recorded by a previous run as applied, so they are not
+        redeclared.
+        """
+        try:
+            with open(self._get_topology_record_path(), "r", encoding="utf-8") as f:
+                keys = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring invalid topology record: {e}")
+            return
+        self.topology.mark_applied(keys)
+        logger.debug(f"Loaded {len(keys)} recorded topology declarations.")
+
+    def _save_topology_record(self) -> None:
+        """
+        Records the applied topology. The record is written to a temporary file and
+        atomically renamed.
+        """
+        try:
+            path = self._get_topology_record_path()
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.topology.get_applied(), f)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.debug(f"Could not record topology: {e}")
+
+    def _remove_topology_record(self) -> None:
+        """
+        Removes the record of the applied topology.
+        """
+        try:
+            os.remove(self._get_topology_record_path())
+        except OSError:
+            pass
 
     def stop_consuming(self):
         """Tell RabbitMQ that you would like to stop consuming by sending the
@@ -1394,6 +1936,10 @@ class Application:
                         self.delete_exchange(self.unique_exchanges)
                         # Signal completion immediately for simple delete operations
                         cleanup_complete_event.set()
+                    elif self._persist_topology:
+                        # Keep queues and bindings in place for the next run
+                        logger.info("Keeping queues and bindings for the next run.")
+                        cleanup_complete_event.set()
                     else:
                         # Delete all queues and exchanges with a callback for completion
                         self._delete_queues_with_callback(cleanup_complete_event)
@@ -1405,13 +1951,17 @@ class Application:
                 # No channel available, so cleanup is "complete"
                 cleanup_complete_event.set()
 
-            # Wait for cleanup to complete with a reasonable timeout (10 seconds)
+            # Wait for cleanup to complete with a reasonable timeout (10 seconds),
+            # bounded by the shutdown deadline
             logger.info("Cleaning up queues.")
-            cleanup_result = cleanup_complete_event.wait(timeout=10)
+            cleanup_timeout = self._get_shutdown_timeout(10)
+            cleanup_result = cleanup_complete_event.wait(timeout=cleanup_timeout)
             if cleanup_result:
                 logger.info("Cleaning up queues completed successfully.")
             else:
-                logger.warning("Cleaning up queues timed out after 10 seconds.")
+                logger.warning(
+                    f"Cleaning up queues timed out after {cleanup_timeout:.1f} seconds."
+                )
 
             # Stop consuming messages if we were consuming
             if self._consuming:
@@ -1430,11 +1980,12 @@ class Application:
             ):
                 logger.info("Closing token refresh thread.")
                 # Set a timeout to avoid hanging indefinitely
-                self._token_refresh_thread.join(timeout=60.0)
+                join_timeout = self._get_shutdown_timeout(60.0)
+                self._token_refresh_thread.join(timeout=join_timeout)
                 # Check if it's still alive after timeout
                 if self._token_refresh_thread.is_alive():
                     logger.warning(
-                        "Closing token refresh thread timed out after 60 seconds. "
+                        f"Closing token refresh thread timed out after {join_timeout:.1f} seconds. "
                     )
                 else:
                     logger.info("Closing token refresh thread completed successfully")
@@ -1446,11 +1997,12 @@ class Application:
             ):
                 logger.info("Closing wallclock refresh thread.")
                 # Set a timeout to avoid hanging indefinitely
-                self._wallclock_refresh_thread.join(timeout=60.0)
+                join_timeout = self._get_shutdown_timeout(60.0)
+                self._wallclock_refresh_thread.join(timeout=join_timeout)
                 # Check if it's still alive after timeout
                 if self._wallclock_refresh_thread.is_alive():
                     logger.warning(
-                        "Closing wallclock refresh thread timed out after 60 seconds. "
+                        f"Closing wallclock refresh thread timed out after {join_timeout:.1f} seconds. "
                     )
                 else:
                     logger.info(
@@ -1471,8 +2023,9 @@ class Application:
         if time_status_step is not None:
             if self._time_status_publisher is not None:
                 self.simulator.remove_observer(self._time_status_publisher)
+            # time status messages report the current time, so passed intervals coalesce
             self._time_status_publisher = TimeStatusPublisher(
-                self, time_status_step, time_status_init
+                self, time_status_step, time_status_init, missed_policy="coalesce"
             )
             self.simulator.add_observer(self._time_status_publisher)
 
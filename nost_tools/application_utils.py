@@ -2,16 +2,29 @@
 Provides utility classes to help applications interact with the broker.
 """
 
+import bisect
+import functools
+import heapq
+import itertools
+import json
 import logging
-from typing import TYPE_CHECKING
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
 
 import yaml
 from dotenv import dotenv_values
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from .observer import Observer
 from .publisher import ScenarioTimeIntervalPublisher
-from .schemas import Config, ModeStatus, TimeStatus
+from .schemas import (
+    Config,
+    encode_mode_status,
+    encode_step_status,
+    encode_time_status,
+)
 from .simulator import Mode, Simulator
 
 if TYPE_CHECKING:
@@ -176,24 +189,18 @@ class TimeStatusPublisher(ScenarioTimeIntervalPublisher):
         """
         Publishes a time status message.
         """
-        status = TimeStatus.model_validate(
-            {
-                "name": self.app.app_name,
-                "description": self.app.app_description,
-                "properties": {
-                    "simTime": self.app.simulator.get_time(),
-                    "time": self.app.simulator.get_wallclock_time(),
-                },
-            }
-        )
-        logger.info(
-            f"Sending time status {status.model_dump_json(by_alias=True,exclude_none=True)}."
+        payload = encode_time_status(
+            self.app.app_name,
+            self.app.app_description,
+            self.app.simulator.get_time(),
+            self.app.simulator.get_wallclock_time(),
         )
+        logger.info("Sending time status %s.", payload)
 
         self.app.send_message(
             app_name=self.app.app_name,
             app_topics="status.time",
-            payload=status.model_dump_json(by_alias=True, exclude_none=True),
+            payload=payload,
         )
 
 
@@ -238,16 +245,12 @@ class ModeStatusObserver(Observer):
             new_value (obj): new value of the named property
         """
         if property_name == Simulator.PROPERTY_MODE:
-            status = ModeStatus.model_validate(
-                {
-                    "name": self.app.app_name,
-                    "description": self.app.app_description,
-                    "properties": {"mode": self.app.simulator.get_mode()},
-                }
-            )
-            logger.info(
-                f"Sending mode status {status.model_dump_json(by_alias=True, exclude_none=True)}."
+            payload = encode_mode_status(
+                self.app.app_name,
+                self.app.app_description,
+                self.app.simulator.get_mode(),
             )
+            logger.info("Sending mode status %s.", payload)
 
             # Ensure self.prefix is a string
             if not isinstance(self.app.prefix, str):
@@ -257,5 +260,1136 @@ class ModeStatusObserver(Observer):
             self.app.send_message(
                 app_name=self.app.app_name,
                 app_topics="status.mode",
-                payload=status.model_dump_json(by_alias=True, exclude_none=True),
+                payload=payload,
+            )
+
+
+class StepStatusObserver(Observer):
+    """
+    Observer that publishes step status messages acknowledging each completed time step
+    (and the initial scenario time) in a lockstep execution.
+
+    Attributes:
+        app (:obj:`Application`): application to publish step status messages
+    """
+
+    def __init__(self, app: "Application"):
+        """
+        Initializes a new step status observer.
+        """
+        self.app = app
+
+    def on_change(
+        self, source: object, property_name: str, old_value: object, new_value: object
+    ) -> None:
+        """
+        Publishes a step status message after a time step or on transition to the EXECUTING mode.
+
+        Args:
+            source (object): observable that triggered the change
+            property_name (str): name of the changed property
+            old_value (obj): old value of the named property
+            new_value (obj): new value of the named property
+        """
+        if property_name == Simulator.PROPERTY_TIME or (
+            property_name == Simulator.PROPERTY_MODE and new_value == Mode.EXECUTING
+        ):
+            self.publish_step_status()
+
+    def publish_step_status(self) -> None:
+        """
+        Publishes a step status message acknowledging the current scenario time.
+        """
+        payload = encode_step_status(
+            self.app.app_name,
+            self.app.app_description,
+            self.app.simulator.get_time(),
+        )
+        logger.debug("Sending step status %s.", payload)
+        self.app.send_message(
+            app_name=self.app.app_name,
+            app_topics="status.step",
+            payload=payload,
+        )
+
+
+class LockstepBarrier(object):
+    """
+    Tracks the scenario times reported by a set of participants and blocks until all
+    participants have reached a target scenario time.
+
+    Attributes:
+        participants (list(str)): names of the participating applications
+    """
+
+    def __init__(self, participants: List[str]):
+        """
+        Initializes a new lockstep barrier.
+
+        Args:
+            participants (list(str)): names of the participating applications
+        """
+        self.participants = list(participants)
+        self._times = dict.fromkeys(self.participants)
+        self._condition = threading.Condition()
+
+    def update(self, name: str, sim_time: datetime) -> None:
+        """
+        Records the scenario time reached by a participant. Times of unknown participants
+        and times earlier than the last reported time are ignored.
+
+        Args:
+            name (str): name of the participating application
+            sim_time (:obj:`datetime`): scenario time reached by the participant
+        """
+        with self._condition:
+            if name in self._times and (
+                self._times[name] is None or sim_time > self._times[name]
+            ):
+                self._times[name] = sim_time
+                self._condition.notify_all()
+
+    def _reached(self, sim_time: datetime) -> bool:
+        return all(t is not None and t >= sim_time for t in self._times.values())
+
+    def wait(self, sim_time: datetime, timeout: float = None) -> bool:
+        """
+        Waits until all participants have reached a scenario time.
+
+        Args:
+            sim_time (:obj:`datetime`): target scenario time
+            timeout (float): maximum number of seconds to wait (default: None waits indefinitely)
+
+        Returns:
+            bool: True, if all participants reached the scenario time
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._reached(sim_time), timeout)
+
+    def get_lagging(self, sim_time: datetime) -> List[str]:
+        """
+        Gets the participants that have not yet reached a scenario time.
+
+        Args:
+            sim_time (:obj:`datetime`): target scenario time
+
+        Returns:
+            list(str): names of the lagging participants
+        """
+        with self._condition:
+            return [
+                name for name, t in self._times.items() if t is None or t < sim_time
+            ]
+
+
+class MessageInbox(Observer):
+    """
+    Observer that defers message callbacks to the simulator thread.
+
+    Received messages are queued (optionally ordered by a scenario timestamp field in the
+    JSON payload) and delivered after each time step (following `tock`) and at each mode
+    transition, so that callbacks never run concurrently with `tick`. While the simulator
+    is not executing, messages are delivered immediately. Each message is acknowledged
+    after delivery, or rejected for redelivery if a callback fails.
+
+    Attributes:
+        app (:obj:`Application`): application receiving the messages
+        order_field (str): dot-separated path of a timestamp field in the JSON payload
+            used to order queued messages, None preserves arrival order
+    """
+
+    _datetime_adapter = TypeAdapter(datetime)
+
+    def __init__(self, app: "Application", order_field: str = None):
+        """
+        Initializes a new message inbox.
+
+        Args:
+            app (:obj:`Application`): application receiving the messages
+            order_field (str): dot-separated path of a timestamp field in the JSON payload
+                used to order queued messages, None preserves arrival order (default: None)
+        """
+        self.app = app
+        self.order_field = order_field
+        self._queue = []
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def _get_order_key(self, body: bytes) -> float:
+        """
+        Extracts the ordering key (POSIX timestamp) from a message payload.
+
+        Args:
+            body (bytes): message body
+
+        Returns:
+            float: ordering key, or negative infinity if the field is not available
+        """
+        if self.order_field is None:
+            return 0.0
+        try:
+            value = json.loads(body)
+            for key in self.order_field.split("."):
+                value = value[key]
+            return self._datetime_adapter.validate_python(value).timestamp()
+        except (ValueError, KeyError, TypeError, ValidationError):
+            return float("-inf")
+
+    def put(self, callbacks: List[Callable], ch, method, properties, body) -> None:
+        """
+        Adds a received message to the inbox, or delivers it immediately if the simulator
+        is not executing.
+
+        Args:
+            callbacks (list(Callable)): callbacks to be called for the message
+            ch (:obj:`pika.channel.Channel`): channel object
+            method (:obj:`pika.spec.Basic.Deliver`): method frame
+            properties (:obj:`pika.spec.BasicProperties`): properties frame
+            body (bytes): message body
+        """
+        with self._lock:
+            heapq.heappush(
+                self._queue,
+                (
+                    self._get_order_key(body),
+                    next(self._counter),
+                    (callbacks, ch, method, properties, body),
+                ),
             )
+            if self.app.simulator.get_mode() != Mode.EXECUTING:
+                self.drain()
+
+    def drain(self) -> int:
+        """
+        Delivers all queued messages to their callbacks and settles (acknowledges or
+        rejects) each message with the application.
+
+        Returns:
+            int: number of delivered messages
+        """
+        count = 0
+        with self._lock:
+            while self._queue:
+                _, _, message = heapq.heappop(self._queue)
+                callbacks, ch, method, properties, body = message
+                success = True
+                for callback in callbacks:
+                    try:
+                        callback(ch, method, properties, body)
+                    except Exception as e:
+                        success = False
+                        logger.error(
+                            f"Error processing message (topic: {method.routing_key}): {e}"
+                        )
+                self.app.settle_message(method, properties, success)
+                count += 1
+        if count:
+            logger.debug(f"Delivered {count} messages from inbox.")
+        return count
+
+    def on_change(
+        self, source: object, property_name: str, old_value: object, new_value: object
+    ) -> None:
+        """
+        Delivers queued messages after each time step and mode transition.
+
+        Args:
+            source (object): observable that triggered the change
+            property_name (str): name of the changed property
+            old_value (obj): old value of the named property
+            new_value (obj): new value of the named property
+        """
+        if property_name in (Simulator.PROPERTY_TIME, Simulator.PROPERTY_MODE):
+            self.drain()
+
+
+class LatencyHistogram(object):
+    """
+    Histogram of latency samples (in seconds) with logarithmic (1-2-5) buckets
+    from 1 microsecond to 1000 seconds.
+
+    Attributes:
+        count (int): number of recorded samples
+        total (float): sum of recorded samples, in seconds
+        min (float): smallest recorded sample, in seconds
+        max (float): largest recorded sample, in seconds
+    """
+
+    BUCKET_BOUNDS = [m * 10.0**e for e in range(-6, 3) for m in (1, 2, 5)] + [1e3]
+
+    def __init__(self):
+        """
+        Initializes a new latency histogram.
+        """
+        self.counts = [0] * (len(self.BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value: float) -> None:
+        """
+        Records a latency sample.
+
+        Args:
+            value (float): latency, in seconds
+        """
+        self.counts[bisect.bisect_left(self.BUCKET_BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile as the upper bound of the bucket containing it
+        (limited to the largest recorded sample).
+
+        Args:
+            q (float): quantile between 0 and 1
+
+        Returns:
+            float: estimated quantile, in seconds, or None if no samples were recorded
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            cumulative += count
+            if count and cumulative >= rank:
+                if i < len(self.BUCKET_BOUNDS):
+                    return min(self.BUCKET_BOUNDS[i], self.max)
+                return self.max
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Summarizes the recorded samples.
+
+        Returns:
+            dict: count, mean, min, p50, p95, p99, and max latency (in seconds)
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class MessageTracker(object):
+    """
+    Tracks message envelopes (publisher id, sequence number, and publish time) per publisher
+    and routing key to detect duplicate, missing, and reordered messages and to record
+    one-way latency.
+
+    Sequence numbers at or below the highest received sequence number minus the window size
+    cannot be verified and are treated as duplicates.
+
+    Attributes:
+        window_size (int): number of recent sequence numbers remembered per publisher and routing key
+    """
+
+    HEADER_PUBLISHER_ID = "x-nost-publisher-id"
+    HEADER_SEQUENCE = "x-nost-sequence"
+    HEADER_PUBLISHED_NS = "x-nost-published-ns"
+
+    def __init__(self, window_size: int = 1024):
+        """
+        Initializes a new message tracker.
+
+        Args:
+            window_size (int): number of recent sequence numbers remembered per publisher
+                and routing key (default: 1024)
+        """
+        self.window_size = window_size
+        self._streams = {}
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def read_envelope(cls, headers: dict) -> Tuple[str, int, int]:
+        """
+        Reads a message envelope from message headers.
+
+        Args:
+            headers (dict): message headers
+
+        Returns:
+            tuple: publisher id, sequence number, and publish time (ns), or None if not available
+        """
+        if not headers or cls.HEADER_SEQUENCE not in headers:
+            return None
+        publisher_id = headers.get(cls.HEADER_PUBLISHER_ID)
+        if isinstance(publisher_id, bytes):
+            publisher_id = publisher_id.decode("utf-8")
+        return (
+            publisher_id,
+            int(headers[cls.HEADER_SEQUENCE]),
+            int(headers.get(cls.HEADER_PUBLISHED_NS, 0)),
+        )
+
+    def is_duplicate(self, publisher_id: str, routing_key: str, sequence: int) -> bool:
+        """
+        Checks if a message was already received.
+
+        Args:
+            publisher_id (str): publisher id
+            routing_key (str): routing key
+            sequence (int): sequence number
+
+        Returns:
+            bool: True, if the message is a duplicate
+        """
+        with self._lock:
+            stream = self._streams.get((publisher_id, routing_key))
+            if stream is None or sequence > stream["highest"]:
+                return False
+            if sequence <= stream["highest"] - self.window_size or (
+                sequence in stream["seen"]
+            ):
+                stream["duplicates"] += 1
+                return True
+            return False
+
+    def record(
+        self,
+        publisher_id: str,
+        routing_key: str,
+        sequence: int,
+        published_ns: int,
+        received_ns: int,
+    ) -> None:
+        """
+        Records a received (non-duplicate) message.
+
+        Args:
+            publisher_id (str): publisher id
+            routing_key (str): routing key
+            sequence (int): sequence number
+            published_ns (int): publish wallclock time, in nanoseconds since the epoch
+            received_ns (int): receive wallclock time, in nanoseconds since the epoch
+        """
+        with self._lock:
+            stream = self._streams.get((publisher_id, routing_key))
+            if stream is None:
+                stream = self._streams[(publisher_id, routing_key)] = {
+                    "first": sequence,
+                    "highest": sequence,
+                    "seen": set(),
+                    "received": 0,
+                    "duplicates": 0,
+                    "gaps": 0,
+                    "reordered": 0,
+                }
+            elif sequence > stream["highest"]:
+                stream["gaps"] += sequence - stream["highest"] - 1
+                stream["highest"] = sequence
+            else:
+                if sequence > stream["first"]:
+                    # late arrival fills a previously counted gap
+                    stream["gaps"] -= 1
+                stream["reordered"] += 1
+            stream["seen"].add(sequence)
+            stream["received"] += 1
+            if len(stream["seen"]) > 2 * self.window_size:
+                floor = stream["highest"] - self.window_size
+                stream["seen"] = {s for s in stream["seen"] if s > floor}
+            if published_ns:
+                if publisher_id not in self._latency:
+                    self._latency[publisher_id] = LatencyHistogram()
+                self._latency[publisher_id].record((received_ns - published_ns) / 1e9)
+
+    def get_statistics(self) -> Dict[str, dict]:
+        """
+        Gets message statistics per publisher.
+
+        Returns:
+            dict: received, duplicate, missing (gaps), and reordered message counts
+                and latency summary, keyed by publisher id
+        """
+        statistics = {}
+        with self._lock:
+            for (publisher_id, _), stream in self._streams.items():
+                stats = statistics.setdefault(
+                    publisher_id,
+                    {"received": 0, "duplicates": 0, "gaps": 0, "reordered": 0},
+                )
+                for key in ("received", "duplicates", "gaps", "reordered"):
+                    stats[key] += stream[key]
+            for publisher_id, histogram in self._latency.items():
+                statistics[publisher_id]["latency"] = histogram.summary()
+        return statistics
+
+
+class OutboundBuffer(object):
+    """
+    Bounded buffer of outbound messages held while the broker connection is down or blocked
+    by broker flow control (memory or disk alarms).
+
+    When the buffer is full, the overflow policy determines which message is discarded:
+     * `drop_newest`: discards the new message
+     * `drop_oldest`: discards the oldest buffered message
+     * `drop_priority`: discards the oldest message with the lowest topic priority
+       (the new message, if its priority is lower than all buffered messages)
+     * `block`: blocks the calling thread until space is available or the timeout elapses,
+       then discards the new message
+
+    Attributes:
+        max_size (int): maximum number of buffered messages
+        policy (str): overflow policy
+        timeout (float): maximum time (seconds) to block the caller under the `block` policy
+    """
+
+    POLICIES = ("drop_newest", "drop_oldest", "drop_priority", "block")
+
+    def __init__(
+        self, max_size: int = 5000, policy: str = "drop_newest", timeout: float = 10
+    ):
+        """
+        Initializes a new outbound buffer.
+
+        Args:
+            max_size (int): maximum number of buffered messages (default: 5000)
+            policy (str): overflow policy (default: "drop_newest")
+            timeout (float): maximum time (seconds) to block the caller under the
+                `block` policy (default: 10)
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(
+                f"Unknown outbound buffer policy '{policy}' (expected one of {', '.join(self.POLICIES)})."
+            )
+        self.max_size = max_size
+        self.policy = policy
+        self.timeout = timeout
+        self._items = []
+        self._not_full = threading.Condition()
+        self.metrics = {
+            "buffered": 0,
+            "max_buffered": 0,
+            "dropped": 0,
+            "blocked_calls": 0,
+            "blocked_seconds": 0.0,
+            "timeouts": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: tuple, priority: int = 0, block: bool = True) -> bool:
+        """
+        Adds a message to the buffer, applying the overflow policy if the buffer is full.
+
+        Args:
+            item (tuple): buffered message
+            priority (int): topic priority of the message (higher is more important, default: 0)
+            block (bool): False, if the caller must not block (e.g., the I/O thread), in which
+                case the `block` policy falls back to `drop_newest` (default: True)
+
+        Returns:
+            bool: True, if the message was buffered
+        """
+        with self._not_full:
+            if len(self._items) >= self.max_size:
+                if self.policy == "block" and block:
+                    self.metrics["blocked_calls"] += 1
+                    start = time.monotonic()
+                    has_space = self._not_full.wait_for(
+                        lambda: len(self._items) < self.max_size, self.timeout
+                    )
+                    self.metrics["blocked_seconds"] += time.monotonic() - start
+                    if not has_space:
+                        self.metrics["timeouts"] += 1
+                        self.metrics["dropped"] += 1
+                        return False
+                elif self.policy == "drop_oldest":
+                    self._items.pop(0)
+                    self.metrics["dropped"] += 1
+                elif self.policy == "drop_priority":
+                    index = min(
+                        range(len(self._items)), key=lambda i: self._items[i][0]
+                    )
+                    if self._items[index][0] > priority:
+                        self.metrics["dropped"] += 1
+                        return False
+                    self._items.pop(index)
+                    self.metrics["dropped"] += 1
+                else:
+                    self.metrics["dropped"] += 1
+                    return False
+            self._items.append((priority, item))
+            self.metrics["buffered"] += 1
+            self.metrics["max_buffered"] = max(
+                self.metrics["max_buffered"], len(self._items)
+            )
+            return True
+
+    def pop_all(self) -> List[tuple]:
+        """
+        Removes and returns all buffered messages in the order they were added.
+
+        Returns:
+            list: buffered messages
+        """
+        with self._not_full:
+            items = [item for _, item in self._items]
+            self._items.clear()
+            self._not_full.notify_all()
+        return items
+
+
+class RateLimit(object):
+    """
+    Token bucket rate limit for messages published to a topic.
+
+    Tokens are replenished at a constant rate up to the burst size and each published
+    message consumes one token. When no token is available, the policy determines the
+    outcome of a message:
+     * `drop`: the message is discarded
+     * `coalesce`: the message replaces any previously pending message and is published
+       as soon as a token becomes available
+
+    Attributes:
+        rate (float): sustained message rate, in messages per second
+        burst (int): maximum number of messages published in a burst
+        policy (str): policy for messages exceeding the rate limit
+        send (Callable[[str], None]): function to publish a pending (coalesced) payload
+        metrics (dict): number of sent, dropped, and coalesced (replaced) messages
+    """
+
+    POLICIES = ("drop", "coalesce")
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        policy: str = "drop",
+        send: Callable[[str], None] = None,
+    ):
+        """
+        Initializes a new rate limit.
+
+        Args:
+            rate (float): sustained message rate, in messages per second
+            burst (int): maximum number of messages published in a burst (default: 1)
+            policy (str): policy for messages exceeding the rate limit (default: "drop")
+            send (Callable[[str], None]): function to publish a pending (coalesced) payload,
+                required by the `coalesce` policy (default: None)
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(
+                f"Unknown rate limit policy '{policy}' (expected one of {', '.join(self.POLICIES)})."
+            )
+        self.rate = rate
+        self.burst = burst
+        self.policy = policy
+        self.send = send
+        self.metrics = {"sent": 0, "dropped": 0, "coalesced": 0}
+        self._tokens = float(burst)
+        self._last_time = time.monotonic()
+        self._pending = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """
+        Replenishes tokens for the elapsed time.
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last_time) * self.rate
+        )
+        self._last_time = now
+
+    def _get_delay(self) -> float:
+        """
+        Gets the time until the next token is available.
+
+        Returns:
+            float: delay, in seconds
+        """
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    def submit(self, payload: str) -> bool:
+        """
+        Submits a message for publication.
+
+        Args:
+            payload (str): message payload
+
+        Returns:
+            bool: True, if the message may be published immediately
+        """
+        with self._lock:
+            self._refill()
+            # pending messages take precedence to preserve ordering
+            if self._pending is None and self._tokens >= 1:
+                self._tokens -= 1
+                self.metrics["sent"] += 1
+                return True
+            if self.policy == "drop":
+                self.metrics["dropped"] += 1
+                return False
+            if self._pending is not None:
+                self.metrics["coalesced"] += 1
+            self._pending = payload
+            if self._timer is None:
+                self._schedule()
+            return False
+
+    def _schedule(self) -> None:
+        """
+        Schedules publication of the pending message when the next token is available.
+        """
+        self._timer = threading.Timer(self._get_delay(), self._flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush(self) -> None:
+        """
+        Publishes the pending message if a token is available or reschedules otherwise.
+        """
+        with self._lock:
+            self._timer = None
+            if self._pending is None:
+                return
+            self._refill()
+            if self._tokens < 1:
+                self._schedule()
+                return
+            self._tokens -= 1
+            payload, self._pending = self._pending, None
+            self.metrics["sent"] += 1
+        try:
+            self.send(payload)
+        except Exception as e:
+            logger.error(f"Error publishing coalesced message: {e}")
+
+    def cancel(self) -> None:
+        """
+        Cancels publication of any pending message.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending is not None:
+                self._pending = None
+                self.metrics["dropped"] += 1
+
+
+class TopologyPlanner(object):
+    """
+    Plans the exchanges, queues and bindings used by an application and applies them to the
+    broker in pipelined batches. A batch runs in stages (exchanges, queues, then bindings) and
+    spreads the operations of each stage over one or more channels, so that broker round trips
+    overlap instead of being issued one after another. Applied declarations are remembered and
+    skipped by later batches.
+
+    Operations are issued from the connection I/O loop thread. Declarations may be planned from
+    any thread.
+
+    Attributes:
+        metrics (dict): number of batches, applied operations, and failed operations
+    """
+
+    def __init__(self):
+        """
+        Initializes a new topology planner.
+        """
+        self._lock = threading.Lock()
+        self._exchanges = {}
+        self._queues = {}
+        self._bindings = []
+        self._applied = set()
+        self._batch = None
+        self.metrics = {"batches": 0, "applied": 0, "failed": 0}
+
+    def add_exchange(
+        self,
+        name: str,
+        exchange_type: str = "topic",
+        durable: bool = True,
+        auto_delete: bool = False,
+    ) -> None:
+        """
+        Plans the declaration of an exchange.
+
+        Args:
+            name (str): exchange name
+            exchange_type (str): exchange type (default: topic)
+            durable (bool): True, if the exchange survives broker restarts
+            auto_delete (bool): True, if the exchange is deleted when no longer used
+        """
+        with self._lock:
+            self._exchanges.setdefault(name, (exchange_type, durable, auto_delete))
+
+    def add_queue(
+        self, name: str, durable: bool = True, auto_delete: bool = False
+    ) -> None:
+        """
+        Plans the declaration of a queue.
+
+        Args:
+            name (str): queue name
+            durable (bool): True, if the queue survives broker restarts
+            auto_delete (bool): True, if the queue is deleted when no longer consumed
+        """
+        with self._lock:
+            self._queues.setdefault(name, (durable, auto_delete))
+
+    def add_binding(self, queue: str, exchange: str, routing_key: str) -> None:
+        """
+        Plans the binding of a queue to an exchange.
+
+        Args:
+            queue (str): queue name
+            exchange (str): exchange name
+            routing_key (str): routing key (or pattern) of the binding
+        """
+        with self._lock:
+            if (queue, exchange, routing_key) not in self._bindings:
+                self._bindings.append((queue, exchange, routing_key))
+
+    def add_channel_configs(
+        self, channel_configs: List[dict], exchanges: Dict[str, dict], app_name: str
+    ) -> None:
+        """
+        Plans the exchanges, queues and bindings of an application defined by the channels
+        of the YAML configuration file. Channels bound to an exchange that is not configured
+        are skipped, since binding to an undeclared exchange closes the channel.
+
+        Args:
+            channel_configs (list(dict)): channel configurations
+            exchanges (dict): exchange configurations, keyed by exchange name
+            app_name (str): application name
+        """
+        for config in channel_configs:
+            if config["app"] != app_name:
+                continue
+            exchange = exchanges.get(config["exchange"])
+            if exchange is None:
+                logger.warning(
+                    f"Skipping queue {config['address']}: exchange {config['exchange']} is not configured."
+                )
+                continue
+            self.add_exchange(
+                exchange["name"],
+                exchange["type"],
+                exchange["durable"],
+                exchange["auto_delete"],
+            )
+            self.add_queue(config["address"], config["durable"], config["auto_delete"])
+            self.add_binding(config["address"], config["exchange"], config["address"])
+
+    def get_queues(self) -> List[str]:
+        """
+        Gets the names of all planned queues.
+
+        Returns:
+            list(str): queue names
+        """
+        with self._lock:
+            return list(self._queues)
+
+    def is_applied(self, queue: str) -> bool:
+        """
+        Checks if a queue and all its bindings have been applied to the broker.
+
+        Args:
+            queue (str): queue name
+
+        Returns:
+            bool: True, if the queue and its bindings are declared
+        """
+        with self._lock:
+            return ("queue", queue) in self._applied and all(
+                ("binding",) + binding in self._applied
+                for binding in self._bindings
+                if binding[0] == queue
+            )
+
+    def get_applied(self) -> List[tuple]:
+        """
+        Gets the keys of all applied declarations, for example to record them between runs.
+
+        Returns:
+            list(tuple): applied declaration keys
+        """
+        with self._lock:
+            return sorted(self._applied)
+
+    def mark_applied(self, keys: List[tuple]) -> None:
+        """
+        Marks declarations as applied, so they are skipped by later batches.
+
+        Args:
+            keys (list(tuple)): declaration keys, as returned by :obj:`get_applied`
+        """
+        with self._lock:
+            self._applied.update(tuple(key) for key in keys)
+
+    def reset(self) -> None:
+        """
+        Forgets all applied declarations, so the full topology is declared by the next batch.
+        """
+        with self._lock:
+            self._applied.clear()
+
+    def _get_declarations(self) -> List[list]:
+        """
+        Gets the pending declarations, grouped in dependency order.
+
+        Returns:
+            list(list): stages of (key, operation) tuples
+        """
+        with self._lock:
+            exchanges = [
+                (
+                    ("exchange", name),
+                    functools.partial(
+                        _declare_exchange, name, exchange_type, durable, auto_delete
+                    ),
+                )
+                for name, (
+                    exchange_type,
+                    durable,
+                    auto_delete,
+                ) in self._exchanges.items()
+                if ("exchange", name) not in self._applied
+            ]
+            queues = [
+                (
+                    ("queue", name),
+                    functools.partial(_declare_queue, name, durable, auto_delete),
+                )
+                for name, (durable, auto_delete) in self._queues.items()
+                if ("queue", name) not in self._applied
+            ]
+            bindings = [
+                (("binding",) + binding, functools.partial(_bind_queue, *binding))
+                for binding in self._bindings
+                if ("binding",) + binding not in self._applied
+            ]
+        return [exchanges, queues, bindings]
+
+    def count_pending(self) -> int:
+        """
+        Counts the pending declarations.
+
+        Returns:
+            int: number of declarations not yet applied
+        """
+        return sum(len(stage) for stage in self._get_declarations())
+
+    def is_busy(self) -> bool:
+        """
+        Checks if a batch is in progress.
+
+        Returns:
+            bool: True, if a batch is in progress
+        """
+        return self._batch is not None
+
+    def declare(self, channels: list, on_complete: Callable[[list], None]) -> int:
+        """
+        Applies all pending declarations in a batch.
+
+        Args:
+            channels (list(:obj:`pika.channel.Channel`)): open channels used to issue operations
+            on_complete (Callable): called with the list of failed declaration keys when done
+
+        Returns:
+            int: number of issued operations
+        """
+        return self._run(self._get_declarations(), channels, on_complete, True)
+
+    def delete_queues(self, channels: list, on_complete: Callable[[list], None]) -> int:
+        """
+        Deletes all planned queues in a batch. Deleting a queue also removes its bindings and
+        discards its messages, so no separate unbind or purge operations are needed.
+
+        Args:
+            channels (list(:obj:`pika.channel.Channel`)): open channels used to issue operations
+            on_complete (Callable): called with the list of failed queue keys when done
+
+        Returns:
+            int: number of issued operations
+        """
+        with self._lock:
+            stage = [
+                (("queue", name), functools.partial(_delete_queue, name))
+                for name in self._queues
+            ]
+        return self._run([stage], channels, on_complete, False)
+
+    def _run(
+        self,
+        stages: List[list],
+        channels: list,
+        on_complete: Callable[[list], None],
+        declare: bool,
+    ) -> int:
+        count = sum(len(stage) for stage in stages)
+        self._batch = _TopologyBatch(
+            self, [stage for stage in stages if stage], channels, on_complete, declare
+        )
+        self.metrics["batches"] += 1
+        self._batch.next_stage()
+        return count
+
+    def _on_operation(self, key: tuple, success: bool, declare: bool) -> None:
+        with self._lock:
+            if success:
+                self.metrics["applied"] += 1
+                if declare:
+                    self._applied.add(key)
+                else:
+                    self._discard(key)
+            else:
+                self.metrics["failed"] += 1
+
+    def _discard(self, key: tuple) -> None:
+        self._applied.discard(key)
+        if key[0] == "queue":
+            self._applied.difference_update(
+                ("binding",) + binding
+                for binding in self._bindings
+                if binding[0] == key[1]
+            )
+
+    def _on_batch_complete(self, batch: "_TopologyBatch") -> None:
+        if self._batch is batch:
+            self._batch = None
+
+    def on_channel_closed(self, channel) -> None:
+        """
+        Fails the outstanding operations of a channel closed during a batch and excludes the
+        channel from the remaining stages.
+
+        Args:
+            channel (:obj:`pika.channel.Channel`): closed channel
+        """
+        if self._batch is not None:
+            self._batch.on_channel_closed(channel)
+
+
+class _TopologyBatch(object):
+    """
+    Issues the stages of a topology batch, round-robin over a set of channels.
+    """
+
+    def __init__(self, planner, stages, channels, on_complete, declare):
+        self.planner = planner
+        self.stages = stages
+        self.channels = list(channels)
+        self.on_complete = on_complete
+        self.declare = declare
+        self.outstanding = {}
+        self.failed = []
+
+    def next_stage(self) -> None:
+        if not self.stages or not self.channels:
+            for stage in self.stages:
+                for key, _ in stage:
+                    self._fail(key)
+            self.stages = []
+            self.planner._on_batch_complete(self)
+            self.on_complete(self.failed)
+            return
+        stage = self.stages.pop(0)
+        # bindings of queues that failed to declare are not issued
+        failed_queues = {key[1] for key in self.failed if key[0] == "queue"}
+        for key, _ in stage:
+            if key[0] == "binding" and key[1] in failed_queues:
+                self._fail(key)
+        stage = [
+            (key, operation)
+            for key, operation in stage
+            if not (key[0] == "binding" and key[1] in failed_queues)
+        ]
+        if not stage:
+            self.next_stage()
+            return
+        assignments = [
+            (self.channels[i % len(self.channels)], key, operation)
+            for i, (key, operation) in enumerate(stage)
+        ]
+        self.outstanding = {}
+        for channel, key, _ in assignments:
+            self.outstanding.setdefault(id(channel), set()).add(key)
+        for channel, key, operation in assignments:
+            try:
+                operation(
+                    channel,
+                    functools.partial(self._on_done, channel, key),
+                )
+            except Exception as e:
+                logger.error(f"Topology operation {key} failed: {e}")
+                self._on_done(channel, key, None, False)
+
+    def _fail(self, key: tuple) -> None:
+        self.failed.append(key)
+        self.planner._on_operation(key, False, self.declare)
+
+    def _on_done(self, channel, key: tuple, method_frame, success: bool = True) -> None:
+        keys = self.outstanding.get(id(channel))
+        if keys is None or key not in keys:
+            return
+        keys.discard(key)
+        if success:
+            self.planner._on_operation(key, True, self.declare)
+        else:
+            self._fail(key)
+        self._check_stage()
+
+    def _check_stage(self) -> None:
+        if not any(self.outstanding.values()):
+            self.outstanding = {}
+            self.next_stage()
+
+    def on_channel_closed(self, channel) -> None:
+        if channel in self.channels:
+            self.channels.remove(channel)
+        keys = self.outstanding.pop(id(channel), None)
+        if keys is None:
+            return
+        for key in sorted(keys):
+            logger.warning(f"Topology operation {key} failed: channel closed.")
+            self._fail(key)
+        self._check_stage()
+
+
+def _declare_exchange(name, exchange_type, durable, auto_delete, channel, callback):
+    channel.exchange_declare(
+        exchange=name,
+        exchange_type=exchange_type,
+        durable=durable,
+        auto_delete=auto_delete,
+        callback=callback,
+    )
+
+
+def _declare_queue(name, durable, auto_delete, channel, callback):
+    channel.queue_declare(
+        queue=name, durable=durable, auto_delete=auto_delete, callback=callback
+    )
+
+
+def _bind_queue(queue, exchange, routing_key, channel, callback):
+    channel.queue_bind(
+        queue=queue, exchange=exchange, routing_key=routing_key, callback=callback
+    )
+
+
+def _delete_queue(name, channel, callback):
+    channel.queue_delete(queue=name, callback=callback)
@@ -0,0 +1,71 @@
+"""
+Provides a binary file format for checkpoints of simulator and entity state.
+"""
+
+import os
+import pickle
+import struct
+import tempfile
+
+# File header: magic number, length of the pickled state, number of raw buffers
+_MAGIC = b"NOSTCKPT"
+_HEADER = struct.Struct("<8sQI")
+_LENGTH = struct.Struct("<Q")
+
+
+def save_checkpoint(path: str, state: object) -> None:
+    """
+    Saves a checkpoint state to file. The state is pickled (protocol 5), except for the
+    data of objects supporting out-of-band buffers (e.g., NumPy arrays), which is written
+    raw after the pickled state. The file is written to a temporary file and atomically
+    renamed, so an interrupted save never leaves a partial checkpoint.
+
+    Args:
+        path (str): path of the checkpoint file
+        state (object): checkpoint state
+    """
+    buffers = []
+    data = pickle.dumps(state, protocol=5, buffer_callback=buffers.append)
+    raw = [buffer.raw() for buffer in buffers]
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(data), len(raw)))
+            for buffer in raw:
+                f.write(_LENGTH.pack(buffer.nbytes))
+            f.write(data)
+            for buffer in raw:
+                f.write(buffer)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> object:
+    """
+    Loads a checkpoint state from file. Raw buffers are read into writable memory, so
+    arrays are restored without copying element by element. Only load trusted checkpoints,
+    as the state is unpickled.
+
+    Args:
+        path (str): path of the checkpoint file
+
+    Returns:
+        object: checkpoint state
+    """
+    with open(path, "rb") as f:
+        magic, length, count = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"Not a checkpoint file: {path}")
+        sizes = [_LENGTH.unpack(f.read(_LENGTH.size))[0] for _ in range(count)]
+        data = f.read(length)
+        buffers = []
+        for size in sizes:
+            buffer = bytearray(size)
+            if f.readinto(buffer) != size:
+                raise ValueError(f"Truncated checkpoint file: {path}")
+            buffers.append(buffer)
+    return pickle.loads(data, buffers=buffers)
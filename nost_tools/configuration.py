@@ -2,13 +2,19 @@
 Configuration Settings.
 """
 
+import functools
+import glob
+import hashlib
 import logging
 import os
+import pickle
+import tempfile
 
 import yaml
 from dotenv import find_dotenv, load_dotenv
 from pydantic import ValidationError
 
+from . import schemas
 from .errors import ConfigAssertionError, ConfigurationError, EnvironmentVariableError
 from .schemas import (
     ChannelConfig,
@@ -18,6 +24,7 @@ from .schemas import (
     ExecConfig,
     KeycloakConfig,
     RabbitMQConfig,
+    RateLimitConfig,
     RuntimeConfig,
     ServersConfig,
     SimulationConfig,
@@ -26,6 +33,45 @@ from .schemas import (
 
 logger = logging.getLogger(__name__)
 
+# YAML loader using the LibYAML bindings, if available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# maximum number of compiled configurations kept in the cache
+_CONFIG_CACHE_MAX_ENTRIES = 16
+
+
+@functools.lru_cache(maxsize=None)
+def _get_schema_fingerprint() -> str:
+    """
+    Gets a fingerprint of the configuration schemas and compilation code, so that cached
+    configurations compiled by a different tree are not reused.
+
+    Returns:
+        str: hash of the source files of the schemas and configuration modules
+    """
+    digest = hashlib.sha256()
+    for path in (schemas.__file__, __file__):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _is_private_path(path: str) -> bool:
+    """
+    Checks if a path is owned by the current user and not writable by other users, so
+    that cached entries loaded from it could not have been written by someone else.
+
+    Args:
+        path (str): path of a file or directory
+
+    Returns:
+        bool: True, if the path is private (always True where ownership is not available)
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    stat = os.stat(path)
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
 
 class ConnectionConfig:
     """Connection configuration.
@@ -45,6 +91,8 @@ class ConnectionConfig:
         virtual_host (str): RabbitMQ virtual host
         is_tls (bool): True, if the connection uses Transport Layer Security (TLS)
         yaml_file (str): Path to the YAML configuration file
+        use_config_cache (bool): True, if the compiled YAML configuration is cached
+        config_cache_dir (str): Directory of the compiled configuration cache
     """
 
     def __init__(
@@ -63,6 +111,8 @@ class ConnectionConfig:
         is_tls: bool = True,
         yaml_file: str = None,
         app_name: str = None,
+        use_config_cache: bool = False,
+        config_cache_dir: str = None,
     ):
         """
         Initializes a new connection configuration.
@@ -81,6 +131,10 @@ class ConnectionConfig:
             is_tls (bool): True, if the connection uses TLS
             yaml_file (str): Path to the YAML configuration file
             app_name (str): Name of the application to get specific configuration for
+            use_config_cache (bool): True, if the compiled YAML configuration shall be cached and
+                shared with other processes of the same user on the same host (default: False)
+            config_cache_dir (str): Directory of the compiled configuration cache (default: the
+                NOST_CONFIG_CACHE_DIR environment variable or ~/.cache/nost_tools)
         """
         self.username = username
         self.password = password
@@ -100,8 +154,16 @@ class ConnectionConfig:
         self.yaml_file = yaml_file
         self.unique_exchanges = {}
         self.channel_configs = []
+        self.rate_limits = {}
         self.app_name = app_name
         self.app_specific = None
+        self._yaml_data = None
+        self.use_config_cache = use_config_cache
+        self.config_cache_dir = (
+            config_cache_dir
+            or os.getenv("NOST_CONFIG_CACHE_DIR")
+            or os.path.join(os.path.expanduser("~"), ".cache", "nost_tools")
+        )
 
         self.create_connection_config()
 
@@ -156,12 +218,37 @@ class ConnectionConfig:
                     )
                     self.channel_configs.append(channel_config.model_dump())
 
+    def get_rate_limits(self):
+        """
+        Get channel publish rate limits from the YAML configuration file. Rate limits are
+        keyed by the channel address without the prefix (i.e., the application name and
+        topic used to publish), which need not match the channel keys.
+        """
+        for app, app_channels in self.yaml_config.channels.items():
+            for channel, details in app_channels.items():
+                rate_limit = details.get("rate_limit")
+                if not rate_limit:
+                    continue
+                try:
+                    rate_limit = RateLimitConfig(**rate_limit)
+                except ValidationError as err:
+                    raise ConfigurationError(
+                        f"Invalid rate limit for channel '{app}.{channel}': {err}"
+                    )
+                address = details.get("address")
+                if not address or "." not in address:
+                    logger.warning(
+                        f"Ignoring rate limit for channel '{app}.{channel}': no address of the form <prefix>.<application>.<topic>."
+                    )
+                    continue
+                self.rate_limits[address.split(".", 1)[1]] = rate_limit
+
     def get_exchanges_channels(self):
         """
         Get exchanges and channels from the YAML configuration file.
         """
 
-        self.get_exchanges(), self.get_channels()
+        self.get_exchanges(), self.get_channels(), self.get_rate_limits()
         if self.unique_exchanges and self.channel_configs:
             self.predefined_exchanges_queues = True
         self.simulation_config = SimulationConfig(
@@ -169,6 +256,7 @@ class ConnectionConfig:
             queues=self.channel_configs,
             execution_parameters=self.yaml_config.execution,
             predefined_exchanges_queues=self.predefined_exchanges_queues,
+            rate_limits=self.rate_limits,
         )
 
     def load_environment_variables(self):
@@ -227,18 +315,18 @@ class ConnectionConfig:
         Returns:
             dict: Application-specific configuration parameters if available, otherwise None.
         """
-        if not os.path.exists(self.yaml_file):
-            raise ConfigurationError("Couldn't load config file (not found)")
-
-        with open(self.yaml_file, "r", encoding="utf-8") as f:
-            yaml_data = yaml.safe_load(f)
+        if self._yaml_data is None:
+            if not os.path.exists(self.yaml_file):
+                raise ConfigurationError("Couldn't load config file (not found)")
+            with open(self.yaml_file, "r", encoding="utf-8") as f:
+                self._yaml_data = yaml.load(f, Loader=_YAML_LOADER)
 
-            try:
-                return yaml_data["execution"]["managed_applications"][app_name][
-                    "configuration_parameters"
-                ]
-            except:
-                return None
+        try:
+            return self._yaml_data["execution"]["managed_applications"][app_name][
+                "configuration_parameters"
+            ]
+        except:
+            return None
 
     def load_yaml_config_file(self):
         """
@@ -249,32 +337,141 @@ class ConnectionConfig:
 
         with open(self.yaml_file, "r", encoding="utf-8") as f:
             try:
-                yaml_data = yaml.safe_load(f)  # Store the parsed YAML data
+                yaml_data = yaml.load(f, Loader=_YAML_LOADER)
             except yaml.YAMLError as err:
                 raise ConfigurationError(f"Invalid YAML configuration: {err}")
+        self._yaml_data = yaml_data
 
         try:
             self.yaml_config = Config(**yaml_data)
         except ValidationError as err:
             raise ConfigurationError(f"Invalid configuration: {err}")
 
+    def _get_config_cache_path(self) -> str:
+        """
+        Gets the path of the compiled configuration cache entry for the YAML configuration file,
+        keyed by the package version, schema fingerprint, file path, modification time, and
+        content hash.
+
+        Returns:
+            str: path of the cache entry
+        """
+        from . import __version__
+
+        with open(self.yaml_file, "rb") as f:
+            content = f.read()
+        key = hashlib.sha256(
+            f"{__version__}|{_get_schema_fingerprint()}|{os.path.abspath(self.yaml_file)}|{os.stat(self.yaml_file).st_mtime_ns}|".encode(
+                "utf-8"
+            )
+            + content
+        ).hexdigest()
+        return os.path.join(self.config_cache_dir, f"{key}.pickle")
+
+    def _load_cached_config(self) -> bool:
+        """
+        Loads the compiled configuration from the cache, if available. Entries are only
+        loaded from a cache directory private to the current user.
+
+        Returns:
+            bool: True, if the compiled configuration was loaded from the cache
+        """
+        path = self._get_config_cache_path()
+        try:
+            if not (_is_private_path(self.config_cache_dir) and _is_private_path(path)):
+                logger.warning(
+                    f"Ignoring configuration cache entry {path}: not private to the current user."
+                )
+                return False
+            with open(path, "rb") as f:
+                cached = pickle.load(f)
+            # mark the entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.debug(f"Ignoring invalid configuration cache entry: {e}")
+            return False
+        self.yaml_config = cached["yaml_config"]
+        self._yaml_data = cached["yaml_data"]
+        self.unique_exchanges = cached["unique_exchanges"]
+        self.channel_configs = cached["channel_configs"]
+        self.rate_limits = cached["rate_limits"]
+        self.predefined_exchanges_queues = cached["predefined_exchanges_queues"]
+        self.simulation_config = cached["simulation_config"]
+        logger.debug(f"Loaded compiled configuration for {self.yaml_file} from cache.")
+        return True
+
+    def _save_cached_config(self) -> None:
+        """
+        Saves the compiled configuration to the cache. The entry is written to a temporary
+        file and atomically renamed, so concurrent processes never read partial entries.
+        """
+        try:
+            os.makedirs(self.config_cache_dir, mode=0o700, exist_ok=True)
+            path = self._get_config_cache_path()
+            fd, temp_path = tempfile.mkstemp(dir=self.config_cache_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(
+                        {
+                            "yaml_config": self.yaml_config,
+                            "yaml_data": self._yaml_data,
+                            "unique_exchanges": self.unique_exchanges,
+                            "channel_configs": self.channel_configs,
+                            "rate_limits": self.rate_limits,
+                            "predefined_exchanges_queues": self.predefined_exchanges_queues,
+                            "simulation_config": self.simulation_config,
+                        },
+                        f,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(temp_path, path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+            self._prune_cached_configs()
+        except Exception as e:
+            logger.debug(f"Could not cache compiled configuration: {e}")
+
+    def _prune_cached_configs(self) -> None:
+        """
+        Removes the least recently used compiled configurations beyond the maximum number of
+        cache entries.
+        """
+        paths = sorted(
+            glob.glob(os.path.join(self.config_cache_dir, "*.pickle")),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+        for path in paths[_CONFIG_CACHE_MAX_ENTRIES:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
     def create_connection_config(self):
         """
         Creates a connection configuration.
         """
         if self.yaml_file:
-            try:
-                self.load_yaml_config_file()
-            except ConfigurationError as e:
-                raise ValueError(f"Configuration error: {e}")
-
-            try:
-                assert all(
-                    item in self.yaml_config.execution.required_apps
-                    for item in self.yaml_config.channels.keys()
-                ), "Application names do not match the channels defined in the configuration file."
-            except ConfigAssertionError as e:
-                raise ValueError(f"Assertion error: {e}")
+            if not (self.use_config_cache and self._load_cached_config()):
+                try:
+                    self.load_yaml_config_file()
+                except ConfigurationError as e:
+                    raise ValueError(f"Configuration error: {e}")
+
+                try:
+                    assert all(
+                        item in self.yaml_config.execution.required_apps
+                        for item in self.yaml_config.channels.keys()
+                    ), "Application names do not match the channels defined in the configuration file."
+                except ConfigAssertionError as e:
+                    raise ValueError(f"Assertion error: {e}")
+
+                self.get_exchanges_channels()
+                if self.use_config_cache:
+                    self._save_cached_config()
             # Load app-specific configuration if app_name is provided
             if self.app_name:
                 self.app_specific = self.get_app_specific_config(self.app_name)
@@ -307,8 +504,7 @@ class ConnectionConfig:
                     channels={},
                     execution=ExecConfig(),
                 )
-
-        self.get_exchanges_channels()
+            self.get_exchanges_channels()
 
         server_config = self.yaml_config.copy()
         if hasattr(server_config, "channels"):
@@ -88,3 +88,26 @@ class Entity(Observable):
             :obj:`datetime`: current scenario time
         """
         return self._time
+
+    def get_state(self) -> dict:
+        """
+        Gets the state of the entity to save in a checkpoint (see :obj:`Simulator.checkpoint`).
+        Entities with additional state variables override this method to add them to the
+        state of the super class. Array-valued state (e.g., NumPy arrays) is saved raw.
+
+        Returns:
+            dict: state variables, keyed by name
+        """
+        return {"init_time": self._init_time, "time": self._time}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Sets the state of the entity from a checkpoint (see :obj:`Simulator.restore`).
+        Entities overriding :obj:`get_state` override this method to restore their
+        additional state variables.
+
+        Args:
+            state (dict): state variables, keyed by name
+        """
+        self._init_time = state["init_time"]
+        self._time = self._next_time = state["time"]
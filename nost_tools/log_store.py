@@ -0,0 +1,480 @@
+"""
+Provides a segmented, time-indexed store of logged messages with range and topic queries.
+"""
+
+import bisect
+import glob
+import heapq
+import json
+import logging
+import os
+import struct
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Record header: wallclock time (us), scenario time (us), topic length, payload length
+_HEADER = struct.Struct("<qqHI")
+# Scenario time of records received before any scenario time is known
+_NO_TIME = -(2**63)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+def _to_us(value: datetime) -> int:
+    """
+    Converts a datetime to microseconds since the epoch (naive datetimes are UTC).
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _US
+
+
+def _get_scenario_us(body: bytes, scenario_us: int) -> int:
+    """
+    Gets the scenario time of a message, carrying forward the current scenario time unless
+    the message has a `properties.simTime` property.
+
+    Args:
+        body (bytes): message body
+        scenario_us (int): current scenario time, in microseconds since the epoch
+
+    Returns:
+        int: scenario time of the message, in microseconds since the epoch
+    """
+    if b'"simTime"' in body:
+        try:
+            return _to_us(
+                datetime.fromisoformat(json.loads(body)["properties"]["simTime"])
+            )
+        except (KeyError, TypeError, ValueError):
+            pass
+    return scenario_us
+
+
+def _from_us(value: int) -> Optional[datetime]:
+    """
+    Converts microseconds since the epoch to a datetime.
+    """
+    if value == _NO_TIME:
+        return None
+    return _EPOCH + value * _US
+
+
+class LogRecord(NamedTuple):
+    """
+    Message recorded in a log store.
+
+    Attributes:
+        wallclock_time (:obj:`datetime`): wallclock time at which the message was received
+        scenario_time (:obj:`datetime`): scenario time at which the message was received,
+            or None if not yet known
+        topic (str): routing key of the message
+        payload (bytes): message body
+    """
+
+    wallclock_time: datetime
+    scenario_time: Optional[datetime]
+    topic: str
+    payload: bytes
+
+
+class SegmentedLogSink(object):
+    """
+    Writes log records to a directory of rotating segment files, each with a sparse index.
+
+    Segments are rolled when they reach `segment_size` bytes or are open for
+    `segment_interval` seconds. When a segment is closed, its index is written next to it.
+    The index stores, for every block of `index_interval` records, the offset and the
+    wallclock and scenario time ranges of the block, and, per topic, the offsets of all of
+    its records.
+
+    The scenario time of a record is the `properties.simTime` of the most recently logged
+    status message (or of the record itself), so it is accurate to the time status step.
+
+    Attributes:
+        name (str): path of the log store directory
+        file (:obj:`File`): current segment file
+    """
+
+    def __init__(
+        self,
+        name: str,
+        segment_size: int = 64 * 1024 * 1024,
+        segment_interval: float = None,
+        index_interval: int = 1000,
+    ):
+        """
+        Initializes a new segmented log sink.
+
+        Args:
+            name (str): path of the log store directory
+            segment_size (int): size, in bytes, after which a segment is rolled (default: 64 MiB)
+            segment_interval (float): time, in seconds, after which a segment is rolled
+                (default: None, for no time-based rolling)
+            index_interval (int): number of records per block of the sparse index (default: 1000)
+        """
+        self.name = name
+        self.segment_size = segment_size
+        self.segment_interval = segment_interval
+        self.index_interval = index_interval
+        self.file = None
+        self._segment = -1
+        self._scenario_us = _NO_TIME
+        os.makedirs(name, exist_ok=True)
+        self._open_segment()
+
+    def _open_segment(self) -> None:
+        """
+        Opens the next segment file and resets its index.
+        """
+        self._segment += 1
+        self.file = open(
+            os.path.join(self.name, f"{self._segment:06d}.seg"), "wb", buffering=65536
+        )
+        self._opened = time.monotonic()
+        self._offset = 0
+        self._count = 0
+        self._blocks = []
+        self._topics = {}
+
+    def _close_segment(self) -> None:
+        """
+        Closes the current segment file and writes its index.
+        """
+        self.file.close()
+        index = {
+            "count": self._count,
+            "size": self._offset,
+            "blocks": self._blocks,
+            "topics": self._topics,
+        }
+        path = os.path.join(self.name, f"{self._segment:06d}.idx")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(path + ".tmp", path)
+
+    def write(self, records: list) -> int:
+        """
+        Writes a batch of log records, rolling segments as needed.
+
+        Args:
+            records (list(tuple)): records of (wallclock timestamp, routing key, message body)
+
+        Returns:
+            int: number of bytes written
+        """
+        size = 0
+        for timestamp, routing_key, body in records:
+            if not isinstance(body, bytes):
+                body = str(body).encode("utf-8")
+            topic = routing_key.encode("utf-8")
+            wallclock_us = _to_us(timestamp)
+            scenario_us = self._scenario_us = _get_scenario_us(body, self._scenario_us)
+            if self._count % self.index_interval == 0:
+                # block: offset, wallclock range, scenario range
+                self._blocks.append(
+                    [self._offset, wallclock_us, wallclock_us, scenario_us, scenario_us]
+                )
+            block = self._blocks[-1]
+            block[1] = min(block[1], wallclock_us)
+            block[2] = max(block[2], wallclock_us)
+            if scenario_us != _NO_TIME:
+                # records logged before the first scenario time do not bound the block
+                block[3] = (
+                    scenario_us if block[3] == _NO_TIME else min(block[3], scenario_us)
+                )
+            block[4] = max(block[4], scenario_us)
+            self._topics.setdefault(routing_key, []).append(self._offset)
+            data = _HEADER.pack(wallclock_us, scenario_us, len(topic), len(body))
+            self.file.write(data)
+            self.file.write(topic)
+            self.file.write(body)
+            length = len(data) + len(topic) + len(body)
+            self._offset += length
+            self._count += 1
+            size += length
+            if self._offset >= self.segment_size or (
+                self.segment_interval is not None
+                and time.monotonic() - self._opened >= self.segment_interval
+            ):
+                self._close_segment()
+                self._open_segment()
+        return size
+
+    def flush(self) -> None:
+        """
+        Flushes written data to the operating system, rolling the segment if it is open for
+        longer than the segment interval.
+        """
+        if (
+            self.segment_interval is not None
+            and self._count
+            and time.monotonic() - self._opened >= self.segment_interval
+        ):
+            self._close_segment()
+            self._open_segment()
+        self.file.flush()
+
+    def fsync(self) -> None:
+        """
+        Synchronizes written data to disk.
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        """
+        Closes the current segment and writes its index.
+        """
+        self._close_segment()
+
+
+class LogStoreReader(object):
+    """
+    Reads a log store written by :obj:`SegmentedLogSink`, with queries by time range and
+    topic. Only the segments, index blocks, or (for topic queries) records matching a query
+    are read. Indexes missing because the writer did not close a segment are rebuilt by
+    scanning the segment.
+
+    Attributes:
+        name (str): path of the log store directory
+    """
+
+    def __init__(self, name: str, index_interval: int = 1000):
+        """
+        Initializes a new log store reader and loads the segment indexes.
+
+        Args:
+            name (str): path of the log store directory
+            index_interval (int): number of records per block of rebuilt indexes (default: 1000)
+        """
+        self.name = name
+        self.index_interval = index_interval
+        self._segments = []
+        for path in sorted(glob.glob(os.path.join(name, "*.seg"))):
+            self._segments.append((path, self._load_index(path)))
+
+    def _load_index(self, path: str) -> dict:
+        """
+        Loads the index of a segment, or rebuilds it if missing or out of date.
+
+        Args:
+            path (str): path of the segment file
+
+        Returns:
+            dict: segment index
+        """
+        try:
+            with open(path[: -len(".seg")] + ".idx", "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index["size"] == os.path.getsize(path):
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        logger.debug(f"Rebuilding index of segment {path}.")
+        index = {"count": 0, "size": 0, "blocks": [], "topics": {}}
+        with open(path, "rb") as f:
+            for offset, wallclock_us, scenario_us, topic, _ in self._scan(f, 0, None):
+                if index["count"] % self.index_interval == 0:
+                    index["blocks"].append(
+                        [offset, wallclock_us, wallclock_us, scenario_us, scenario_us]
+                    )
+                block = index["blocks"][-1]
+                block[1] = min(block[1], wallclock_us)
+                block[2] = max(block[2], wallclock_us)
+                if scenario_us != _NO_TIME:
+                    block[3] = (
+                        scenario_us
+                        if block[3] == _NO_TIME
+                        else min(block[3], scenario_us)
+                    )
+                block[4] = max(block[4], scenario_us)
+                index["topics"].setdefault(topic, []).append(offset)
+                index["count"] += 1
+            index["size"] = f.tell()
+        return index
+
+    @staticmethod
+    def _read_record(f) -> Optional[tuple]:
+        """
+        Reads the record at the current position of a segment file.
+
+        Returns:
+            tuple: wallclock time (us), scenario time (us), topic, and payload, or None at
+                the end of the segment (or of its complete records)
+        """
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        wallclock_us, scenario_us, topic_length, payload_length = _HEADER.unpack(header)
+        data = f.read(topic_length + payload_length)
+        if len(data) < topic_length + payload_length:
+            return None
+        return (
+            wallclock_us,
+            scenario_us,
+            data[:topic_length].decode("utf-8"),
+            data[topic_length:],
+        )
+
+    def _scan(self, f, start: int, end: Optional[int]) -> Iterator[tuple]:
+        """
+        Scans the records of a segment file between two offsets.
+
+        Args:
+            f (:obj:`File`): segment file
+            start (int): offset of the first record
+            end (int): offset after the last record (None for the end of the segment)
+
+        Returns:
+            Iterator: tuples of offset, wallclock time (us), scenario time (us), topic, and payload
+        """
+        f.seek(start)
+        offset = start
+        while end is None or offset < end:
+            record = self._read_record(f)
+            if record is None:
+                return
+            yield (offset,) + record
+            offset = f.tell()
+
+    def get_topics(self) -> List[str]:
+        """
+        Gets the topics (routing keys) of all records.
+
+        Returns:
+            list(str): sorted topics
+        """
+        return sorted(
+            set(topic for _, index in self._segments for topic in index["topics"])
+        )
+
+    def count(self) -> int:
+        """
+        Counts the records in the log store.
+
+        Returns:
+            int: number of records
+        """
+        return sum(index["count"] for _, index in self._segments)
+
+    def get_time_range(self, scenario: bool = False) -> tuple:
+        """
+        Gets the range of wallclock or scenario times of the records.
+
+        Args:
+            scenario (bool): True, for scenario times (default: False, for wallclock times)
+
+        Returns:
+            tuple(:obj:`datetime`): earliest and latest times, or None if there are no records
+                (or, for scenario times, no indexed scenario time bounds the range)
+        """
+        lower, upper = (3, 4) if scenario else (1, 2)
+        blocks = [block for _, index in self._segments for block in index["blocks"]]
+        lowers = [block[lower] for block in blocks if block[lower] != _NO_TIME]
+        uppers = [block[upper] for block in blocks if block[upper] != _NO_TIME]
+        return (
+            _from_us(min(lowers)) if lowers else None,
+            _from_us(max(uppers)) if uppers else None,
+        )
+
+    def query(
+        self,
+        start: datetime = None,
+        end: datetime = None,
+        topics: List[str] = None,
+        scenario: bool = False,
+    ) -> Iterator[LogRecord]:
+        """
+        Queries records by time range and topic. Records are returned in the order they
+        were logged.
+
+        Args:
+            start (:obj:`datetime`): earliest time, inclusive (default: None, for no limit)
+            end (:obj:`datetime`): latest time, exclusive (default: None, for no limit)
+            topics (list(str)): topics (routing keys) to return (default: None, for all topics)
+            scenario (bool): True, if start and end are scenario times (default: False, for
+                wallclock times)
+
+        Returns:
+            Iterator(:obj:`LogRecord`): matching records
+        """
+        topics = None if topics is None else set(topics)
+        start_us = None if start is None else _to_us(start)
+        end_us = None if end is None else _to_us(end)
+        lower, upper = (3, 4) if scenario else (1, 2)
+
+        def overlaps(block):
+            if scenario and (start_us is not None or end_us is not None):
+                if block[upper] == _NO_TIME:
+                    return False
+            return (start_us is None or block[upper] >= start_us) and (
+                end_us is None or block[lower] < end_us
+            )
+
+        def matches(wallclock_us, scenario_us):
+            value = scenario_us if scenario else wallclock_us
+            if scenario and value == _NO_TIME:
+                return start_us is None and end_us is None
+            return (start_us is None or value >= start_us) and (
+                end_us is None or value < end_us
+            )
+
+        for path, index in self._segments:
+            blocks = index["blocks"]
+            ranges = [
+                (block[0], blocks[i + 1][0] if i + 1 < len(blocks) else None)
+                for i, block in enumerate(blocks)
+                if overlaps(block)
+            ]
+            if not ranges:
+                continue
+            with open(path, "rb") as f:
+                if topics is None:
+                    records = (
+                        record
+                        for block_start, block_end in ranges
+                        for record in self._scan(f, block_start, block_end)
+                    )
+                else:
+                    records = self._read_offsets(
+                        f, self._get_topic_offsets(index, topics, ranges)
+                    )
+                for _, wallclock_us, scenario_us, topic, payload in records:
+                    if (topics is None or topic in topics) and matches(
+                        wallclock_us, scenario_us
+                    ):
+                        yield LogRecord(
+                            _from_us(wallclock_us),
+                            _from_us(scenario_us),
+                            topic,
+                            payload,
+                        )
+
+    @staticmethod
+    def _get_topic_offsets(index: dict, topics: List[str], ranges: list) -> List[int]:
+        """
+        Gets the sorted offsets of the records of topics within block ranges.
+        """
+        starts = [block_start for block_start, _ in ranges]
+        offsets = []
+        for offset in heapq.merge(
+            *(index["topics"].get(topic, []) for topic in topics)
+        ):
+            i = bisect.bisect_right(starts, offset) - 1
+            if i >= 0 and (ranges[i][1] is None or offset < ranges[i][1]):
+                offsets.append(offset)
+        return offsets
+
+    def _read_offsets(self, f, offsets: List[int]) -> Iterator[tuple]:
+        """
+        Reads the records at a list of offsets of a segment file.
+        """
+        for offset in offsets:
+            f.seek(offset)
+            record = self._read_record(f)
+            if record is not None:
+                yield (offset,) + record
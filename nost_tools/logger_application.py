@@ -2,15 +2,499 @@
 Provides a base logger application that subscribes and writes all messages to file.
 """
 
+import json
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict
 
 from .application import Application
 from .configuration import ConnectionConfig
+from .log_store import SegmentedLogSink
+from .schemas import LoggerApplicationConfig
+
+if TYPE_CHECKING:
+    import pyarrow
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of the records handed to a writer
+_CLOSE = object()
+
+
+class CsvLogSink(object):
+    """
+    Writes log records to a text file as `Timestamp,Topic,Payload` lines.
+
+    Attributes:
+        name (str): path of the log file
+        file (:obj:`File`): log file
+    """
+
+    def __init__(self, name: str, buffer_size: int = 65536):
+        """
+        Initializes a new CSV log sink and writes the header line.
+
+        Args:
+            name (str): path of the log file
+            buffer_size (int): size of the file buffer, in bytes (default: 65536)
+        """
+        self.name = name
+        self.file = open(name, "a", buffering=buffer_size)
+        self.file.write("Timestamp,Topic,Payload\n")
+
+    def write(self, records: list) -> int:
+        """
+        Writes a batch of log records.
+
+        Args:
+            records (list(tuple)): records of (wallclock timestamp, routing key, message body)
+
+        Returns:
+            int: number of characters written
+        """
+        return self.file.write(
+            "".join(
+                f"{timestamp},{routing_key},{body.decode('utf-8') if isinstance(body, bytes) else body}\n"
+                for timestamp, routing_key, body in records
+            )
+        )
+
+    def flush(self) -> None:
+        """
+        Flushes written data to the operating system.
+        """
+        self.file.flush()
+
+    def fsync(self) -> None:
+        """
+        Synchronizes written data to disk.
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        """
+        Closes the log file.
+        """
+        self.file.close()
+
+
+class ArrowLogSink(object):
+    """
+    Writes log records to a columnar file, either Parquet or an Arrow IPC stream. Requires
+    the `pyarrow` package.
+
+    Records are buffered and written as row groups (record batches) every `row_group_size`
+    records or, when flushed, every `row_group_interval` seconds. Columns are the wallclock
+    `timestamp`, the dictionary-encoded `topic` (routing key), and the raw `payload`. Fields
+    of JSON payloads can be flattened into additional typed columns, named by the field path
+    with dots replaced by underscores (e.g. `properties_simTime`). Missing or invalid values
+    are null.
+
+    Attributes:
+        name (str): path of the log file
+        log_format (str): "parquet" or "arrow" (IPC stream)
+        flatten_fields (dict): types of flattened fields, keyed by dotted field path
+    """
+
+    #: Typed fields of NOS-T status messages
+    STATUS_FIELDS = {
+        "properties.name": "string",
+        "properties.simTime": "timestamp",
+        "properties.time": "timestamp",
+        "properties.mode": "string",
+    }
+
+    def __init__(
+        self,
+        name: str,
+        log_format: str = "parquet",
+        row_group_size: int = 10000,
+        row_group_interval: float = 60.0,
+        flatten_fields: Dict[str, str] = None,
+    ):
+        """
+        Initializes a new columnar log sink.
+
+        Args:
+            name (str): path of the log file
+            log_format (str): "parquet" or "arrow" (IPC stream) (default: "parquet")
+            row_group_size (int): maximum number of records per row group (default: 10000)
+            row_group_interval (float): time, in seconds, after which buffered records are
+                written as a row group when flushed (default: 60.0)
+            flatten_fields (dict): types ("string", "int", "float", "bool", or "timestamp") of
+                payload fields flattened into columns, keyed by dotted field path (default: None)
+        """
+        import pyarrow as pa
+
+        if log_format not in ("parquet", "arrow"):
+            raise ValueError(f"Invalid columnar log format: {log_format}")
+        types = {
+            "string": pa.string(),
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "bool": pa.bool_(),
+            "timestamp": pa.timestamp("us", tz="UTC"),
+        }
+        self.name = name
+        self.log_format = log_format
+        self.row_group_size = row_group_size
+        self.row_group_interval = row_group_interval
+        self.flatten_fields = dict(flatten_fields or {})
+        for path, field_type in self.flatten_fields.items():
+            if field_type not in types:
+                raise ValueError(f"Invalid type {field_type} of field {path}")
+        self.schema = pa.schema(
+            [
+                ("timestamp", pa.timestamp("us", tz="UTC")),
+                ("topic", pa.dictionary(pa.int32(), pa.string())),
+                ("payload", pa.string()),
+            ]
+            + [
+                (path.replace(".", "_"), types[field_type])
+                for path, field_type in self.flatten_fields.items()
+            ]
+        )
+        self.file = open(name, "wb")
+        if log_format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(self.file, self.schema)
+        else:
+            self._writer = pa.ipc.new_stream(self.file, self.schema)
+        self._rows = []
+        self._last_row_group = time.monotonic()
+
+    def write(self, records: list) -> int:
+        """
+        Buffers a batch of log records, writing row groups when full.
+
+        Args:
+            records (list(tuple)): records of (wallclock timestamp, routing key, message body)
+
+        Returns:
+            int: number of payload characters written
+        """
+        size = 0
+        for timestamp, routing_key, body in records:
+            payload = body.decode("utf-8") if isinstance(body, bytes) else str(body)
+            size += len(payload)
+            self._rows.append((timestamp, routing_key, payload))
+            if len(self._rows) >= self.row_group_size:
+                self._write_row_group()
+        return size
+
+    def _get_field(self, payload: str, path: str, field_type: str, cache: dict):
+        """
+        Gets the value of a payload field, converted to its column type.
+
+        Args:
+            payload (str): JSON message payload
+            path (str): dotted field path
+            field_type (str): column type
+            cache (dict): parsed payloads of the row group, keyed by payload
+
+        Returns:
+            object: field value, or None if missing or invalid
+        """
+        if payload not in cache:
+            try:
+                cache[payload] = json.loads(payload)
+            except ValueError:
+                cache[payload] = None
+        value = cache[payload]
+        for key in path.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        if value is None:
+            return None
+        try:
+            if field_type == "timestamp":
+                return datetime.fromisoformat(value)
+            if field_type == "int":
+                return int(value)
+            if field_type == "float":
+                return float(value)
+            if field_type == "bool":
+                return bool(value)
+            return str(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _write_row_group(self) -> None:
+        """
+        Writes the buffered records as a row group.
+        """
+        import pyarrow as pa
+
+        self._last_row_group = time.monotonic()
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        timestamps, topics, payloads = zip(*rows)
+        columns = [
+            pa.array(timestamps, type=self.schema.field("timestamp").type),
+            pa.array(topics, type=pa.string()).dictionary_encode(),
+            pa.array(payloads, type=pa.string()),
+        ]
+        cache = {}
+        for path, field_type in self.flatten_fields.items():
+            columns.append(
+                pa.array(
+                    [
+                        self._get_field(payload, path, field_type, cache)
+                        for payload in payloads
+                    ],
+                    type=self.schema.field(path.replace(".", "_")).type,
+                )
+            )
+        self._writer.write_batch(
+            pa.RecordBatch.from_arrays(columns, schema=self.schema)
+        )
+
+    def flush(self) -> None:
+        """
+        Writes buffered records as a row group if the row group interval has elapsed, and
+        flushes written data to the operating system.
+        """
+        if time.monotonic() - self._last_row_group >= self.row_group_interval:
+            self._write_row_group()
+        self.file.flush()
+
+    def fsync(self) -> None:
+        """
+        Synchronizes written data to disk.
+        """
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self) -> None:
+        """
+        Writes buffered records and closes the log file.
+        """
+        self._write_row_group()
+        self._writer.close()
+        self.file.close()
+
+    @staticmethod
+    def read(name: str) -> "pyarrow.Table":
+        """
+        Reads a columnar log file.
+
+        Args:
+            name (str): path of the log file (Parquet or Arrow IPC stream)
+
+        Returns:
+            :obj:`pyarrow.Table`: logged records
+        """
+        import pyarrow as pa
+
+        if name.endswith(".parquet"):
+            import pyarrow.parquet as pq
+
+            return pq.read_table(name)
+        with pa.OSFile(name, "rb") as f:
+            return pa.ipc.open_stream(f).read_all()
+
+
+class BufferedLogWriter(object):
+    """
+    Writes log records to a sink from a dedicated thread, so that slow disk writes do not
+    block message consumption. Records are handed over through a bounded queue and written
+    in batches. The sink is flushed when the written data reaches a size threshold or a time
+    interval elapses, and synchronized to disk according to a policy.
+
+    A sink provides `write(records)` (returning the size of the written data), `flush()`,
+    `fsync()`, and `close()` methods, like :obj:`CsvLogSink`.
+
+    Attributes:
+        sink (object): sink receiving batches of records
+        metrics (dict): number of written, dropped, and failed records, batches, flushes,
+            disk synchronizations, and maximum number of queued records
+    """
+
+    def __init__(
+        self,
+        sink: object,
+        max_queue_size: int = 10000,
+        overflow_policy: str = "block",
+        flush_size: int = 65536,
+        flush_interval: float = 1.0,
+        fsync_policy: str = "close",
+        fsync_interval: float = 10.0,
+        block_timeout: float = 1.0,
+    ):
+        """
+        Initializes a new buffered log writer and starts its writer thread.
+
+        Args:
+            sink (object): sink receiving batches of records
+            max_queue_size (int): maximum number of records waiting to be written (default: 10000)
+            overflow_policy (str): policy when the queue is full: "block" the caller for up to
+                block_timeout seconds before dropping the record, or "drop" it (default: "block")
+            flush_size (int): size of written data after which the sink is flushed (default: 65536)
+            flush_interval (float): maximum time, in seconds, that written data stays unflushed (default: 1.0)
+            fsync_policy (str): when flushed data is synchronized to disk: "never", on every "flush",
+                at most every fsync_interval seconds ("interval"), or on "close" (default: "close")
+            fsync_interval (float): interval, in seconds, between disk synchronizations with the
+                "interval" policy (default: 10.0)
+            block_timeout (float): maximum time, in seconds, the caller is blocked when the queue
+                is full with the "block" policy (default: 1.0)
+        """
+        if overflow_policy not in ("block", "drop"):
+            raise ValueError(f"Invalid overflow policy: {overflow_policy}")
+        if fsync_policy not in ("never", "flush", "interval", "close"):
+            raise ValueError(f"Invalid fsync policy: {fsync_policy}")
+        self.sink = sink
+        self.overflow_policy = overflow_policy
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.block_timeout = block_timeout
+        self.metrics = {
+            "written": 0,
+            "dropped": 0,
+            "failed": 0,
+            "batches": 0,
+            "flushes": 0,
+            "fsyncs": 0,
+            "max_queued": 0,
+        }
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._max_batch_size = max_queue_size
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def put(self, record: tuple) -> bool:
+        """
+        Hands a record to the writer thread.
+
+        Args:
+            record (tuple): record to write
+
+        Returns:
+            bool: True, if the record was queued, False if it was dropped
+        """
+        if not self._closed:
+            try:
+                if self.overflow_policy == "block":
+                    self._queue.put(record, timeout=self.block_timeout)
+                else:
+                    self._queue.put_nowait(record)
+                queued = self._queue.qsize()
+                if queued > self.metrics["max_queued"]:
+                    self.metrics["max_queued"] = queued
+                return True
+            except queue.Full:
+                pass
+        self.metrics["dropped"] += 1
+        if self.metrics["dropped"] == 1:
+            logger.warning("Log writer queue is full or closed; dropping records.")
+        return False
+
+    def _write(self, records: list) -> int:
+        """
+        Writes a batch of records to the sink.
+
+        Args:
+            records (list): records to write
+
+        Returns:
+            int: size of the written data
+        """
+        try:
+            size = self.sink.write(records)
+            self.metrics["written"] += len(records)
+            self.metrics["batches"] += 1
+            return size
+        except Exception as e:
+            self.metrics["failed"] += len(records)
+            logger.error(f"Error writing {len(records)} log records: {e}")
+            return 0
+
+    def _run(self) -> None:
+        """
+        Writes queued records in batches until the writer is closed.
+        """
+        unflushed = 0
+        last_flush = last_fsync = time.monotonic()
+        closing = False
+        while not closing:
+            # wait for records, or until unflushed data is due for flushing
+            timeout = None
+            if unflushed:
+                timeout = max(0.0, last_flush + self.flush_interval - time.monotonic())
+            try:
+                records = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                records = []
+            while records and len(records) < self._max_batch_size:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _CLOSE in records:
+                closing = True
+                records = [record for record in records if record is not _CLOSE]
+            if records:
+                unflushed += self._write(records)
+            now = time.monotonic()
+            if unflushed and (
+                closing
+                or unflushed >= self.flush_size
+                or now - last_flush >= self.flush_interval
+            ):
+                try:
+                    self.sink.flush()
+                    self.metrics["flushes"] += 1
+                    if self.fsync_policy == "flush" or (
+                        self.fsync_policy == "interval"
+                        and now - last_fsync >= self.fsync_interval
+                    ):
+                        self.sink.fsync()
+                        self.metrics["fsyncs"] += 1
+                        last_fsync = now
+                except Exception as e:
+                    logger.error(f"Error flushing log records: {e}")
+                unflushed = 0
+                last_flush = now
+        try:
+            if self.fsync_policy != "never":
+                self.sink.fsync()
+                self.metrics["fsyncs"] += 1
+            self.sink.close()
+        except Exception as e:
+            logger.error(f"Error closing log: {e}")
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Writes all queued records, closes the sink, and stops the writer thread.
+
+        Args:
+            timeout (float): maximum number of seconds to wait (default: None waits indefinitely)
+
+        Returns:
+            bool: True, if the writer finished within the timeout
+        """
+        if not self._closed:
+            self._closed = True
+            try:
+                self._queue.put(_CLOSE, timeout=timeout)
+            except queue.Full:
+                pass
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Timed out closing log writer.")
+            return False
+        return True
+
 
 class LoggerApplication(Application):
     """
@@ -28,6 +512,7 @@ class LoggerApplication(Application):
         log_topic (str): Topic to be logged (default: "#")
         log_dir (str): Directory to write log files (default: ".")
         log_file (:obj:`File`): Current log file
+        write_options (:obj:`LoggerApplicationConfig`): Options of the buffered log writer
     """
 
     def __init__(self, app_name: str = "logger", app_description: str = None):
@@ -43,6 +528,9 @@ class LoggerApplication(Application):
         self.log_app = None
         self.log_dir = None
         self.log_file = None
+        self.write_options = LoggerApplicationConfig()
+        self._writer = None
+        self._log_name = None
 
     def start_up(
         self,
@@ -57,6 +545,8 @@ class LoggerApplication(Application):
         log_app: str = "+",
         log_topic: str = "#",
         log_dir: str = ".",
+        fsync_policy: str = None,
+        log_format: str = None,
     ) -> None:
         """
         Starts up the logger application by connecting to message broker,
@@ -75,6 +565,10 @@ class LoggerApplication(Application):
             log_app (str): Application name to be logged (default: "+")
             log_topic (str): Topic to be logged (default: "#")
             log_dir (str): Directory to write log files (default: ".")
+            fsync_policy (str): When written messages are synchronized to disk: "never", "flush",
+                "interval", or "close" (default: from the YAML configuration, or "close")
+            log_format (str): Log file format: "csv", "parquet", "arrow" (Arrow IPC stream), or
+                "segmented" (see :obj:`SegmentedLogSink`) (default: from the YAML configuration, or "csv")
         """
         if (
             set_offset is not None
@@ -101,6 +595,17 @@ class LoggerApplication(Application):
             self.time_status_step = parameters.time_status_step
             self.time_status_init = parameters.time_status_init
             self.shut_down_when_terminated = parameters.shut_down_when_terminated
+            self.write_options = parameters
+        self.write_options = self.write_options.model_copy(
+            update={
+                key: value
+                for key, value in (
+                    ("fsync_policy", fsync_policy),
+                    ("log_format", log_format),
+                )
+                if value is not None
+            }
+        )
 
         self.log_app = log_app
         self.log_topic = log_topic
@@ -130,41 +635,92 @@ class LoggerApplication(Application):
     def shut_down(self) -> None:
         """
         Shuts down the application by stopping the background event loop
-        and disconnecting from the message broker.
+        and disconnecting from the message broker. The log file is closed
+        once the connection is stopped and all received messages are written.
         """
-        # Close the log file if it's open
-        self._close_log_file()
-
         # Shut down base application
         super().shut_down()
 
+    def get_log_metrics(self) -> dict:
+        """
+        Gets metrics of the buffered writer of the current log file.
+
+        Returns:
+            dict: number of written, dropped, and failed messages, batches, flushes,
+                disk synchronizations, and maximum number of queued messages
+        """
+        if self._writer is None:
+            return {}
+        return dict(self._writer.metrics)
+
     def _open_log_file(self) -> None:
         """
         Opens a new log file for writing messages.
         """
-        if self.log_file is not None:
+        if self._writer is not None:
             self._close_log_file()
 
         ts = (
             str(self.simulator.get_wallclock_time()).replace(" ", "T").replace(":", "-")
         )
-        log_filename = os.path.join(self.log_dir, f"{ts}.log")
-        self.log_file = open(log_filename, "a")
-        self.log_file.write(f"Timestamp,Topic,Payload\n")
-        logger.info(f"Logger {self.app_name} opened file {self.log_file.name}.")
+        options = self.write_options
+        if options.log_format == "csv":
+            sink = CsvLogSink(
+                os.path.join(self.log_dir, f"{ts}.log"), buffer_size=options.flush_size
+            )
+        elif options.log_format == "segmented":
+            sink = SegmentedLogSink(
+                os.path.join(self.log_dir, ts),
+                segment_size=options.segment_size,
+                segment_interval=options.segment_interval,
+                index_interval=options.index_interval,
+            )
+        else:
+            flatten_fields = dict(options.flatten_fields or {})
+            if options.flatten_status_fields:
+                flatten_fields = {**ArrowLogSink.STATUS_FIELDS, **flatten_fields}
+            sink = ArrowLogSink(
+                os.path.join(
+                    self.log_dir,
+                    f"{ts}.{'parquet' if options.log_format == 'parquet' else 'arrows'}",
+                ),
+                log_format=options.log_format,
+                row_group_size=options.row_group_size,
+                row_group_interval=options.row_group_interval,
+                flatten_fields=flatten_fields,
+            )
+        self.log_file = sink.file
+        self._log_name = sink.name
+        self._writer = BufferedLogWriter(
+            sink,
+            max_queue_size=options.write_queue_size,
+            overflow_policy=options.overflow_policy,
+            flush_size=options.flush_size,
+            flush_interval=options.flush_interval,
+            fsync_policy=options.fsync_policy,
+            fsync_interval=options.fsync_interval,
+        )
+        # Closed at shut down, after the connection is stopped
+        self.register_resource(self._writer, self._close_log_file, "log file")
+        logger.info(f"Logger {self.app_name} opened file {self._log_name}.")
 
     def _close_log_file(self) -> None:
         """
         Closes the current log file if it's open.
         """
-        if self.log_file is not None:
-            self.log_file.close()
-            logger.info(f"Logger {self.app_name} closed file {self.log_file.name}.")
+        if self._writer is not None:
+            self.unregister_resource(self._writer)
+            self._writer.close(timeout=self._get_shutdown_timeout())
+            logger.info(
+                f"Logger {self.app_name} closed file {self._log_name} ({self._writer.metrics})."
+            )
+            self._writer = None
             self.log_file = None
 
     def on_log_message(self, ch, method, properties, body):
         """
         Callback function to log a message received by the logger application.
+        The message is handed to the buffered writer with its wallclock receipt time.
 
         Args:
             ch: The channel object
@@ -172,16 +728,11 @@ class LoggerApplication(Application):
             properties: The message properties
             body: The message body
         """
-        if self.log_file is not None:
+        if self._writer is not None:
             try:
-                routing_key = method.routing_key
-                payload = body.decode("utf-8") if isinstance(body, bytes) else str(body)
-
-                logger.debug(f"Logger {self.app_name} logging message: {payload}")
-
-                timestamp = self.simulator.get_wallclock_time()
-                self.log_file.write(f"{timestamp},{routing_key},{payload}\n")
-                self.log_file.flush()  # Ensure data is written immediately
+                self._writer.put(
+                    (self.simulator.get_wallclock_time(), method.routing_key, body)
+                )
             except Exception as e:
                 logger.error(f"Error logging message: {e}")
         else:
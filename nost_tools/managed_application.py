@@ -8,8 +8,24 @@ import traceback
 from datetime import datetime, timedelta
 
 from .application import Application
-from .application_utils import ConnectionConfig
-from .schemas import InitCommand, StartCommand, StopCommand, UpdateCommand
+from .application_utils import (
+    ConnectionConfig,
+    LockstepBarrier,
+    MessageInbox,
+    MessageTracker,
+    StepStatusObserver,
+)
+from .schemas import (
+    CheckpointCommand,
+    FastForwardCommand,
+    InitCommand,
+    ResultStatus,
+    StartCommand,
+    StepCommand,
+    StopCommand,
+    UpdateCommand,
+)
+from .simulator import Mode
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +46,7 @@ class ManagedApplication(Application):
         time_status_step (:obj:`timedelta`): scenario duration between time status messages
         time_status_init (:obj:`datetime`): scenario time of first time status message
         time_step (:obj:`timedelta`): scenario time step used in execution
+        inbox (:obj:`MessageInbox`): inbox deferring message callbacks to the simulator thread (optional)
     """
 
     def __init__(
@@ -52,6 +69,9 @@ class ManagedApplication(Application):
         self.time_step = None
         self._sim_start_time = None
         self._sim_stop_time = None
+        self.inbox = None
+        self._lockstep_barrier = None
+        self._step_status_observer = None
 
     def _get_parameters_from_config(self):
         """
@@ -85,6 +105,8 @@ class ManagedApplication(Application):
         shut_down_when_terminated: bool = False,
         time_step: timedelta = None,
         manager_app_name: str = None,
+        inbox: bool = False,
+        inbox_order_field: str = None,
     ) -> None:
         """
         Starts up the application by connecting to message broker, starting a background event loop,
@@ -99,6 +121,10 @@ class ManagedApplication(Application):
             shut_down_when_terminated (bool): True, if the application should shut down when the simulation is terminated
             time_step (:obj:`timedelta`): scenario time step used in execution (Default: 1 second)
             manager_app_name (str): manager application name (Default: manager)
+            inbox (bool): True, if message callbacks shall be deferred to the simulator thread
+                and delivered between time steps (Default: False)
+            inbox_order_field (str): dot-separated path of a scenario timestamp field in the JSON
+                payload used to order deferred messages, e.g. "properties.simTime" (Default: None)
         """
         self.config = config
 
@@ -118,6 +144,8 @@ class ManagedApplication(Application):
             if parameters:
                 self.time_step = parameters.time_step
                 self.manager_app_name = parameters.manager_app_name
+                inbox = parameters.inbox
+                inbox_order_field = parameters.inbox_order_field
         else:
             self.time_step = time_step
             self.manager_app_name = manager_app_name
@@ -143,6 +171,60 @@ class ManagedApplication(Application):
             app_topic="update",
             user_callback=self.on_manager_update,
         )
+        self.add_message_callback(
+            app_name=self.manager_app_name,
+            app_topic="step",
+            user_callback=self.on_manager_step,
+        )
+        self.add_message_callback(
+            app_name=self.manager_app_name,
+            app_topic="checkpoint",
+            user_callback=self.on_manager_checkpoint,
+        )
+        self.add_message_callback(
+            app_name=self.manager_app_name,
+            app_topic="fast_forward",
+            user_callback=self.on_manager_fast_forward,
+        )
+
+        # Defer other message callbacks to the simulator thread, if requested
+        if inbox:
+            if self.inbox is not None:
+                self.simulator.remove_observer(self.inbox)
+            self.inbox = MessageInbox(self, inbox_order_field)
+            self.simulator.add_observer(self.inbox)
+            logger.info(
+                f"Message inbox enabled for {self.app_name}; callbacks are delivered between time steps."
+            )
+
+    def _handle_message(self, ch, method, properties, body):
+        """
+        Callback for handling messages received from RabbitMQ. If the inbox is enabled,
+        messages not sent by the manager are queued for delivery on the simulator thread
+        and acknowledged once delivered.
+
+        Args:
+            ch (:obj:`pika.channel.Channel`): channel object
+            method (:obj:`pika.spec.Basic.Deliver`): method frame
+            properties (:obj:`pika.spec.BasicProperties`): properties frame
+            body (str): message body
+        """
+        if self.inbox is None or method.routing_key.startswith(
+            self.create_routing_key(self.manager_app_name, "")
+        ):
+            super()._handle_message(ch, method, properties, body)
+            return
+        envelope = MessageTracker.read_envelope(properties.headers)
+        if envelope is None or not self.message_tracker.is_duplicate(
+            envelope[0], method.routing_key, envelope[1]
+        ):
+            callbacks = self._get_matching_callbacks(method.routing_key)
+            if callbacks:
+                # Acknowledged (or rejected) by the inbox after delivery
+                self.inbox.put(callbacks, ch, method, properties, body)
+                return
+            self._track_message(envelope, method.routing_key)
+        self.acknowledge_message(method.delivery_tag)
 
     def shut_down(self) -> None:
         """
@@ -205,8 +287,10 @@ class ManagedApplication(Application):
                 self._sim_stop_time = params.sim_stop_time
                 logger.info(f"Sim stop time: {params.sim_stop_time}")
 
+            self._configure_lockstep(params.lockstep)
+
             self._simulation_thread = threading.Thread(
-                target=self.simulator.execute,
+                target=self._execute_simulation,
                 kwargs={
                     "init_time": self._sim_start_time,
                     "duration": self._sim_stop_time - self._sim_start_time,
@@ -223,6 +307,78 @@ class ManagedApplication(Application):
             )
             print(traceback.format_exc())
 
+    def _execute_simulation(self, **kwargs) -> None:
+        """
+        Executes the simulator and publishes a result status message after the execution completes,
+        so that the manager can collect the results of each test plan.
+
+        Args:
+            **kwargs: keyword arguments passed to :meth:`Simulator.execute`
+        """
+        start_time = (
+            kwargs.get("wallclock_epoch") or self.simulator.get_wallclock_time()
+        )
+        self.simulator.execute(**kwargs)
+        try:
+            status = ResultStatus.model_validate(
+                {
+                    "name": self.app_name,
+                    "description": self.app_description,
+                    "properties": {
+                        "startTime": start_time,
+                        "stopTime": self.simulator.get_wallclock_time(),
+                        "simStartTime": self.simulator.get_init_time(),
+                        "simStopTime": self.simulator.get_time(),
+                        "results": self.get_run_results(),
+                        "fastForwardOverrun": self.simulator.get_fast_forward_overrun(),
+                    },
+                }
+            )
+            payload = status.model_dump_json(by_alias=True, exclude_none=True)
+            logger.info("Sending result status %s.", payload)
+            self.send_message(
+                app_name=self.app_name,
+                app_topics="status.result",
+                payload=payload,
+            )
+        except Exception as e:
+            logger.error(f"Could not send result status: {e}")
+            print(traceback.format_exc())
+
+    def get_run_results(self) -> dict:
+        """
+        Gets application-specific results of the completed execution, which are reported to the
+        manager in a result status message. Override to report results, e.g. for parameter sweeps.
+
+        Returns:
+            dict: JSON-serializable results (default: empty)
+        """
+        return {}
+
+    def _configure_lockstep(self, lockstep: bool) -> None:
+        """
+        Configures the simulator to advance in lockstep with manager step commands, acknowledging
+        each completed time step with a step status message, or to follow the wallclock.
+
+        Args:
+            lockstep (bool): True, if the execution advances in lockstep
+        """
+        if lockstep:
+            self._lockstep_barrier = LockstepBarrier([self.manager_app_name])
+            self.simulator.set_step_barrier(
+                lambda next_time: self._lockstep_barrier.wait(next_time, timeout=1)
+            )
+            if self._step_status_observer is None:
+                # added after other observers so callbacks complete before acknowledging
+                self._step_status_observer = StepStatusObserver(self)
+                self.simulator.add_observer(self._step_status_observer)
+            logger.info(f"Lockstep execution enabled for {self.app_name}.")
+        else:
+            self.simulator.set_step_barrier(None)
+            if self._step_status_observer is not None:
+                self.simulator.remove_observer(self._step_status_observer)
+                self._step_status_observer = None
+
     def on_manager_stop(self, ch, method, properties, body) -> None:
         """
         Callback function for the managed application ('self') to respond to a stop command sent from the manager.
@@ -247,6 +403,86 @@ class ManagedApplication(Application):
             )
             print(traceback.format_exc())
 
+    def on_manager_step(self, ch, method, properties, body) -> None:
+        """
+        Callback function for the managed application ('self') to respond to a step command sent from the manager.
+        Parses the scenario time and allows the simulator to advance up to it in a lockstep execution.
+        A repeated step command to a scenario time already reached is acknowledged again with a step status.
+
+        Args:
+            ch (:obj:`pika.channel.Channel`): The channel object used to communicate with the RabbitMQ server.
+            method (:obj:`pika.spec.Basic.Deliver`): Delivery-related information such as delivery tag, exchange, and routing key.
+            properties (:obj:`pika.BasicProperties`): Message properties including content type, headers, and more.
+            body (bytes): The actual message body sent, containing the message payload.
+        """
+        try:
+            # Parse message payload
+            message = body.decode("utf-8")
+            params = StepCommand.model_validate_json(message).tasking_parameters
+            if self._lockstep_barrier is not None:
+                self._lockstep_barrier.update(self.manager_app_name, params.sim_time)
+            if (
+                self._step_status_observer is not None
+                and self.simulator.get_mode() == Mode.EXECUTING
+                and params.sim_time <= self.simulator.get_time()
+            ):
+                self._step_status_observer.publish_step_status()
+        except Exception as e:
+            logger.error(
+                f"Exception (topic: {method.routing_key}, payload: {message}): {e}"
+            )
+            print(traceback.format_exc())
+
+    def on_manager_checkpoint(self, ch, method, properties, body) -> None:
+        """
+        Callback function for the managed application ('self') to respond to a checkpoint command sent from the manager.
+        Parses the checkpoint path and requests the simulator to save a checkpoint at the next time step boundary.
+
+        Args:
+            ch (:obj:`pika.channel.Channel`): The channel object used to communicate with the RabbitMQ server.
+            method (:obj:`pika.spec.Basic.Deliver`): Delivery-related information such as delivery tag, exchange, and routing key.
+            properties (:obj:`pika.BasicProperties`): Message properties including content type, headers, and more.
+            body (bytes): The actual message body sent, containing the message payload.
+        """
+        try:
+            # Parse message payload
+            message = body.decode("utf-8")
+            params = CheckpointCommand.model_validate_json(message).tasking_parameters
+            logger.info(f"Received checkpoint command {message}")
+            self.simulator.request_checkpoint(
+                params.path.format(app_name=self.app_name)
+            )
+        except Exception as e:
+            logger.error(
+                f"Exception (topic: {method.routing_key}, payload: {message}): {e}"
+            )
+            print(traceback.format_exc())
+
+    def on_manager_fast_forward(self, ch, method, properties, body) -> None:
+        """
+        Callback function for the managed application ('self') to respond to a fast-forward command sent from the manager.
+        Parses the fast-forward scenario time and resume wallclock time and fast-forwards the simulator.
+
+        Args:
+            ch (:obj:`pika.channel.Channel`): The channel object used to communicate with the RabbitMQ server.
+            method (:obj:`pika.spec.Basic.Deliver`): Delivery-related information such as delivery tag, exchange, and routing key.
+            properties (:obj:`pika.BasicProperties`): Message properties including content type, headers, and more.
+            body (bytes): The actual message body sent, containing the message payload.
+        """
+        try:
+            # Parse message payload
+            message = body.decode("utf-8")
+            params = FastForwardCommand.model_validate_json(message).tasking_parameters
+            logger.info(f"Received fast-forward command {message}")
+            self.simulator.set_fast_forward(
+                params.sim_fast_forward_time, params.resume_time
+            )
+        except Exception as e:
+            logger.error(
+                f"Exception (topic: {method.routing_key}, payload: {message}): {e}"
+            )
+            print(traceback.format_exc())
+
     def on_manager_update(self, ch, method, properties, body) -> None:
         """
         Callback function for the managed application ('self') to respond to an update command sent from the manager.
@@ -5,19 +5,28 @@ Provides a base manager that coordinates a distributed scenario execution.
 import json
 import logging
 import threading
-import time
 import traceback
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic import ValidationError
 
 from .application import Application
-from .application_utils import ConnectionConfig
+from .application_utils import ConnectionConfig, LatencyHistogram, LockstepBarrier
+from .observer import Observer
+from .publisher import WallclockTimeIntervalPublisher
 from .schemas import (
+    AdaptiveTimeScaleConfig,
+    CheckpointCommand,
+    FastForwardCommand,
     InitCommand,
+    ModeStatus,
     ReadyStatus,
+    ResultStatus,
     StartCommand,
+    StepCommand,
+    StepStatus,
     StopCommand,
     TimeStatus,
     UpdateCommand,
@@ -49,6 +58,323 @@ class TimeScaleUpdate(object):
         self.sim_update_time = sim_update_time
 
 
+class TimeScaleController(object):
+    """
+    Closed-loop controller that adapts the simulation time scale factor to the lag of applications
+    behind the wallclock schedule. The time scale factor is decreased as soon as any application
+    lags by more than `lag_high` and increased only after all applications lag by less than
+    `lag_low` for `settle_time`. No update is proposed within `settle_time` of a previous update.
+
+    Attributes:
+        min_time_scale_factor (float): minimum time scale factor
+        max_time_scale_factor (float): maximum time scale factor
+        lag_high (:obj:`timedelta`): lag above which the time scale factor is decreased
+        lag_low (:obj:`timedelta`): lag below which the time scale factor may be increased
+        decrease_factor (float): multiplier applied to decrease the time scale factor
+        increase_factor (float): multiplier applied to increase the time scale factor
+        settle_time (:obj:`timedelta`): hysteresis duration between updates
+    """
+
+    def __init__(
+        self,
+        min_time_scale_factor: float,
+        max_time_scale_factor: float,
+        lag_high: timedelta = timedelta(seconds=1),
+        lag_low: timedelta = timedelta(milliseconds=100),
+        decrease_factor: float = 0.5,
+        increase_factor: float = 1.25,
+        settle_time: timedelta = timedelta(seconds=10),
+    ):
+        """
+        Initializes a new time scale controller.
+
+        Args:
+            min_time_scale_factor (float): minimum time scale factor
+            max_time_scale_factor (float): maximum time scale factor
+            lag_high (:obj:`timedelta`): lag above which the time scale factor is decreased (default: 1 second)
+            lag_low (:obj:`timedelta`): lag below which the time scale factor may be increased (default: 100 milliseconds)
+            decrease_factor (float): multiplier applied to decrease the time scale factor (default: 0.5)
+            increase_factor (float): multiplier applied to increase the time scale factor (default: 1.25)
+            settle_time (:obj:`timedelta`): hysteresis duration between updates (default: 10 seconds)
+        """
+        self.min_time_scale_factor = min_time_scale_factor
+        self.max_time_scale_factor = max_time_scale_factor
+        self.lag_high = lag_high
+        self.lag_low = lag_low
+        self.decrease_factor = decrease_factor
+        self.increase_factor = increase_factor
+        self.settle_time = settle_time
+        self._lags = {}
+        self._hold_until = None
+        self._low_since = None
+
+    @classmethod
+    def from_config(cls, config: AdaptiveTimeScaleConfig) -> "TimeScaleController":
+        """
+        Creates a time scale controller from a configuration.
+
+        Args:
+            config (:obj:`AdaptiveTimeScaleConfig`): adaptive time scale configuration
+
+        Returns:
+            :obj:`TimeScaleController`: time scale controller
+        """
+        return cls(**config.model_dump())
+
+    def record_lag(self, app_name: str, lag: timedelta) -> None:
+        """
+        Records the latest lag of an application behind the wallclock schedule.
+
+        Args:
+            app_name (str): application name
+            lag (:obj:`timedelta`): wallclock lag (negative if ahead of schedule)
+        """
+        self._lags[app_name] = lag
+
+    def get_lags(self) -> Dict[str, timedelta]:
+        """
+        Gets the latest lag of each application since the last update.
+
+        Returns:
+            dict: lag per application name
+        """
+        return dict(self._lags)
+
+    def evaluate(
+        self, time_scale_factor: float, wallclock_time: datetime
+    ) -> Optional[float]:
+        """
+        Evaluates the recorded lags and proposes a new time scale factor, if needed.
+
+        Args:
+            time_scale_factor (float): current time scale factor
+            wallclock_time (:obj:`datetime`): current wallclock time
+
+        Returns:
+            float: new time scale factor, or None if no update is needed
+        """
+        if not self._lags or (
+            self._hold_until is not None and wallclock_time < self._hold_until
+        ):
+            return None
+        max_lag = max(self._lags.values())
+        new_factor = None
+        if max_lag > self.lag_high:
+            self._low_since = None
+            new_factor = time_scale_factor * self.decrease_factor
+        elif max_lag < self.lag_low:
+            if self._low_since is None:
+                self._low_since = wallclock_time
+            if wallclock_time - self._low_since >= self.settle_time:
+                new_factor = time_scale_factor * self.increase_factor
+        else:
+            self._low_since = None
+        if new_factor is None and not (
+            self.min_time_scale_factor
+            <= time_scale_factor
+            <= self.max_time_scale_factor
+        ):
+            new_factor = time_scale_factor
+        if new_factor is None:
+            return None
+        new_factor = min(
+            self.max_time_scale_factor, max(self.min_time_scale_factor, new_factor)
+        )
+        if new_factor == time_scale_factor:
+            return None
+        # lags measured at the previous time scale factor are no longer representative
+        self._lags.clear()
+        self._low_since = None
+        self._hold_until = wallclock_time + self.settle_time
+        return new_factor
+
+
+class FederationMonitor(object):
+    """
+    Collects rolling statistics of the applications in a federation from their status messages:
+    scenario and wallclock lag of time status messages, gaps between time status messages
+    (heartbeats), and mode transitions.
+
+    Attributes:
+        window_size (int): number of recent samples per application and statistic
+    """
+
+    def __init__(self, window_size: int = 1000):
+        """
+        Initializes a new federation monitor.
+
+        Args:
+            window_size (int): number of recent samples per application and statistic (default: 1000)
+        """
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._apps = {}
+
+    def _get_app(self, app_name: str) -> dict:
+        if app_name not in self._apps:
+            self._apps[app_name] = {
+                "scenario_lag": deque(maxlen=self.window_size),
+                "wallclock_lag": deque(maxlen=self.window_size),
+                "heartbeat_gap": deque(maxlen=self.window_size),
+                "last_seen": None,
+                "mode": None,
+                "mode_transitions": [],
+            }
+        return self._apps[app_name]
+
+    def record_time_status(
+        self,
+        app_name: str,
+        scenario_lag: timedelta,
+        wallclock_lag: timedelta,
+        wallclock_time: datetime,
+    ) -> None:
+        """
+        Records a time status message of an application.
+
+        Args:
+            app_name (str): application name
+            scenario_lag (:obj:`timedelta`): scenario time of the manager minus the reported scenario time
+            wallclock_lag (:obj:`timedelta`): wallclock time of receipt minus the reported wallclock time
+            wallclock_time (:obj:`datetime`): wallclock time of receipt
+        """
+        with self._lock:
+            app = self._get_app(app_name)
+            app["scenario_lag"].append(scenario_lag / timedelta(seconds=1))
+            app["wallclock_lag"].append(wallclock_lag / timedelta(seconds=1))
+            if app["last_seen"] is not None:
+                app["heartbeat_gap"].append(
+                    (wallclock_time - app["last_seen"]) / timedelta(seconds=1)
+                )
+            app["last_seen"] = wallclock_time
+
+    def record_mode(self, app_name: str, mode: Mode, wallclock_time: datetime) -> None:
+        """
+        Records a mode transition of an application.
+
+        Args:
+            app_name (str): application name
+            mode (:obj:`Mode`): new mode
+            wallclock_time (:obj:`datetime`): wallclock time of receipt
+        """
+        with self._lock:
+            app = self._get_app(app_name)
+            app["mode"] = Mode(mode)
+            app["mode_transitions"].append((Mode(mode), wallclock_time))
+
+    @staticmethod
+    def _summarize(samples) -> Dict[str, float]:
+        histogram = LatencyHistogram()
+        for value in samples:
+            histogram.record(max(0.0, value))
+        return histogram.summary()
+
+    def get_statistics(self, wallclock_time: datetime = None) -> Dict[str, dict]:
+        """
+        Gets the statistics of each application. Lags and heartbeat gaps are summarized by count,
+        mean, min, p50, p95, p99, and max (in seconds, negative lags counted as zero).
+
+        Args:
+            wallclock_time (:obj:`datetime`): current wallclock time to report the time since the
+                last time status message (optional)
+
+        Returns:
+            dict: statistics per application name
+        """
+        with self._lock:
+            statistics = {}
+            for app_name, app in self._apps.items():
+                statistics[app_name] = {
+                    "scenario_lag": self._summarize(app["scenario_lag"]),
+                    "wallclock_lag": self._summarize(app["wallclock_lag"]),
+                    "heartbeat_gap": self._summarize(app["heartbeat_gap"]),
+                    "last_seen": (
+                        app["last_seen"].isoformat() if app["last_seen"] else None
+                    ),
+                    "mode": app["mode"].value if app["mode"] else None,
+                    "mode_transitions": [
+                        {"mode": mode.value, "time": time.isoformat()}
+                        for mode, time in app["mode_transitions"]
+                    ],
+                }
+                if wallclock_time is not None and app["last_seen"] is not None:
+                    statistics[app_name]["since_last_seen"] = (
+                        wallclock_time - app["last_seen"]
+                    ) / timedelta(seconds=1)
+            return statistics
+
+    def get_stragglers(self, count: int = None) -> List[str]:
+        """
+        Gets application names ordered by decreasing 95th percentile scenario lag.
+
+        Args:
+            count (int): maximum number of applications to return (default: None returns all)
+
+        Returns:
+            list(str): application names, slowest first
+        """
+        with self._lock:
+            p95 = {
+                app_name: self._summarize(app["scenario_lag"])["p95"] or 0.0
+                for app_name, app in self._apps.items()
+            }
+        return sorted(p95, key=p95.get, reverse=True)[:count]
+
+
+class FederationSummaryPublisher(WallclockTimeIntervalPublisher):
+    """
+    Publishes federation summary messages with the statistics collected by the manager
+    at a regular wallclock interval.
+
+    Attributes:
+        app (:obj:`Manager`): manager publishing the summary
+        time_status_step (:obj:`timedelta`): wallclock duration between summary messages
+        time_status_init (:obj:`datetime`): wallclock time for first summary message
+    """
+
+    def publish_message(self) -> None:
+        """
+        Publishes a federation summary message.
+        """
+        wallclock_time = self.app.simulator.get_wallclock_time()
+        payload = json.dumps(
+            {
+                "name": self.app.app_name,
+                "properties": {
+                    "time": wallclock_time.isoformat(),
+                    "stragglers": self.app.federation_monitor.get_stragglers(),
+                    "applications": self.app.federation_monitor.get_statistics(
+                        wallclock_time
+                    ),
+                },
+            }
+        )
+        logger.debug("Sending federation summary %s.", payload)
+        self.app.send_message(
+            app_name=self.app.app_name,
+            app_topics="status.federation",
+            payload=payload,
+        )
+
+
+class _ConditionObserver(Observer):
+    """
+    Observer that wakes all threads waiting on a condition variable when a property changes.
+
+    Attributes:
+        condition (:obj:`threading.Condition`): condition variable to notify
+    """
+
+    def __init__(self, condition: threading.Condition):
+        self.condition = condition
+
+    def on_change(
+        self, source: object, property_name: str, old_value: object, new_value: object
+    ) -> None:
+        with self.condition:
+            self.condition.notify_all()
+
+
 class Manager(Application):
     """
     NOS-T Manager Application.
@@ -84,6 +410,23 @@ class Manager(Application):
             app_name, app_description, setup_signal_handlers=setup_signal_handlers
         )
         self.required_apps_status = {}
+        # Signalled on ready status messages and simulator property changes
+        self._state_condition = threading.Condition()
+        self.simulator.add_observer(_ConditionObserver(self._state_condition))
+        # Step acknowledgements of required applications in lockstep execution
+        self._lockstep_barrier = None
+        self._lockstep_deadline = None
+        self.step_timeout = timedelta(seconds=10)
+        self.time_scale_controller = None
+        # Statistics of the applications in the federation
+        self.federation_monitor = FederationMonitor()
+        self._federation_summary_publisher = None
+        self._status_callbacks_registered = False
+        self._exec_thread = None
+        # Batch execution of test plans
+        self._sweep_parameters = None
+        self._run_app_results = {}
+        self.run_results = []
 
         self.sim_start_time = None
         self.sim_stop_time = None
@@ -109,35 +452,36 @@ class Manager(Application):
             auto_delete=True,
         )
 
-    def _sleep_with_heartbeat(self, total_seconds):
+    def _sleep_with_heartbeat(self, total_seconds: float) -> bool:
         """
-        Sleep for a specified number of seconds while allowing connection heartbeats.
-        Works with SelectConnection by using short sleep intervals.
+        Sleeps for a specified number of seconds or until the application is stopped. Connection
+        heartbeats are serviced by the I/O loop thread and are not affected by sleeping.
 
         Args:
             total_seconds (float): Total number of seconds to sleep
+
+        Returns:
+            bool: True, if the application was not stopped while sleeping
         """
         if total_seconds <= 0:
-            return
-
-        # Sleep in smaller chunks to allow heartbeats to pass through
-        check_interval = 30  # Check every 30 seconds at most
-        end_time = time.time() + total_seconds
+            return not self._should_stop.is_set()
+        logger.debug(f"Sleeping for {total_seconds:.2f} seconds")
+        return not self._should_stop.wait(timeout=total_seconds)
 
-        logger.debug(f"Starting heartbeat-safe sleep for {total_seconds:.2f} seconds")
-
-        while time.time() < end_time:
-            # Calculate remaining time
-            remaining = end_time - time.time()
+    def _wait_for(self, predicate, timeout: float = None) -> bool:
+        """
+        Waits until a predicate on the manager or simulator state is true. The predicate is
+        re-evaluated whenever a ready status message is received or a simulator property changes.
 
-            # Sleep for the shorter of check_interval or remaining time
-            sleep_time = min(check_interval, remaining)
+        Args:
+            predicate (Callable): function returning True when the wait is complete
+            timeout (float): maximum number of seconds to wait (default: None waits indefinitely)
 
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                logger.debug(
-                    f"Heartbeat check: {remaining:.2f} seconds remaining in sleep"
-                )
+        Returns:
+            bool: the last value of the predicate
+        """
+        with self._state_condition:
+            return self._state_condition.wait_for(predicate, timeout)
 
     def _get_parameters_from_config(self):
         """
@@ -207,6 +551,107 @@ class Manager(Application):
         logger.debug("Running test plan in background thread.")
         thread.start()
 
+    def execute_test_plans(self, test_plans: List[dict] = None) -> None:
+        """
+        Starts the back-to-back execution of a list of test plans in a background thread.
+        Managed applications remain connected and are re-initialized by the initialize
+        command of each test plan, and their results are collected in `run_results`.
+
+        If a YAML configuration file is used, the test plans are defined by the `sweep`
+        list of the `execution` block, each entry overriding the manager configuration.
+
+        Args:
+            test_plans (list(dict)): keyword arguments of :meth:`execute_test_plan` for each test plan
+                (ignored if a YAML configuration file is used)
+        """
+        thread = threading.Thread(
+            target=self._execute_test_plans_impl, args=(test_plans,), daemon=True
+        )
+        logger.debug("Running test plans in background thread.")
+        thread.start()
+
+    def _execute_test_plans_impl(self, test_plans: List[dict] = None) -> None:
+        """
+        Executes a list of test plans back-to-back, waiting for the manager simulation to terminate
+        and for the result status of all required applications after each test plan.
+
+        Args:
+            test_plans (list(dict)): keyword arguments of :meth:`execute_test_plan` for each test plan
+                (ignored if a YAML configuration file is used)
+        """
+        if self.config.rc.yaml_file:
+            runs = (
+                self.config.rc.simulation_configuration.execution_parameters.sweep
+                or [None]
+            )
+        else:
+            runs = test_plans or [{}]
+
+        # Defer any shut down until all test plans are executed
+        shut_down_observer = self._shut_down_observer
+        if shut_down_observer is not None:
+            self.simulator.remove_observer(shut_down_observer)
+
+        self.run_results = []
+        try:
+            self._execute_runs(runs)
+        finally:
+            self._sweep_parameters = None
+            # Restore the deferred shut down on every exit path
+            if shut_down_observer is not None:
+                self.simulator.add_observer(shut_down_observer)
+
+        if shut_down_observer is not None and not self._should_stop.is_set():
+            self.shut_down()
+
+    def _execute_runs(self, runs: list) -> None:
+        """
+        Executes test plans one after the other and records their results in `run_results`.
+        Returns early if the manager is stopped.
+
+        Args:
+            runs (list): test plans (keyword arguments or sweep entries) to execute
+        """
+        for i, run in enumerate(runs):
+            logger.info(f"Executing test plan {i + 1} of {len(runs)}.")
+            with self._state_condition:
+                self._run_app_results = {}
+            start_time = self.simulator.get_wallclock_time()
+            if self.config.rc.yaml_file:
+                self._sweep_parameters = run
+                self._execute_test_plan_impl()
+            else:
+                self._execute_test_plan_impl(**run)
+            if self._should_stop.is_set():
+                return
+            if self._exec_thread is not None:
+                self._exec_thread.join()
+            if not self._wait_for(
+                lambda: all(app in self._run_app_results for app in self.required_apps),
+                timeout=self.init_retry_delay_s,
+            ):
+                logger.warning(
+                    f"Missing results of test plan {i + 1} from {[app for app in self.required_apps if app not in self._run_app_results]}."
+                )
+            stop_time = self.simulator.get_wallclock_time()
+            with self._state_condition:
+                applications = dict(self._run_app_results)
+            self.run_results.append(
+                {
+                    "run": i + 1,
+                    "parameters": (
+                        run.model_dump(mode="json") if self._sweep_parameters else run
+                    ),
+                    "start_time": start_time.isoformat(),
+                    "stop_time": stop_time.isoformat(),
+                    "duration": (stop_time - start_time) / timedelta(seconds=1),
+                    "applications": applications,
+                }
+            )
+            logger.info(
+                f"Completed test plan {i + 1} of {len(runs)} in {stop_time - start_time}."
+            )
+
     def _execute_test_plan_impl(
         self,
         sim_start_time: datetime = None,
@@ -221,6 +666,12 @@ class Manager(Application):
         required_apps: List[str] = [],
         init_retry_delay_s: int = 5,
         init_max_retry: int = 5,
+        lockstep: bool = False,
+        adaptive_time_scale: AdaptiveTimeScaleConfig = None,
+        federation_summary_step: timedelta = None,
+        fast_forward_time: datetime = None,
+        fast_forward_lead: timedelta = timedelta(seconds=5),
+        step_timeout: timedelta = timedelta(seconds=10),
     ) -> None:
         """
         A comprehensive command to start a test run execution.
@@ -241,12 +692,24 @@ class Manager(Application):
             required_apps (list(str)): list of application names required to continue with the execution
             init_retry_delay_s (float): number of seconds to wait between initialization commands while waiting for required applications
             init_max_retry (int): number of initialization commands while waiting for required applications before continuing to execution
+            lockstep (bool): True, if scenario time advances as soon as all required applications acknowledge each time step
+                instead of following the wallclock time scale factor (default: False)
+            adaptive_time_scale (:obj:`AdaptiveTimeScaleConfig`): adaptive time scale control based on application
+                time status lag, replacing time_scale_updates (default: None)
+            federation_summary_step (:obj:`timedelta`): wallclock duration between federation summary messages
+                (default: None does not publish federation summaries)
+            fast_forward_time (:obj:`datetime`): scenario time up to which execution is fast-forwarded without
+                wallclock pacing, ignored in lockstep execution (default: None)
+            fast_forward_lead (:obj:`timedelta`): wallclock duration after the start time allotted to
+                fast-forwarding, after which paced execution resumes (default: 5 seconds)
+            step_timeout (:obj:`timedelta`): wallclock duration to wait for step acknowledgements in lockstep
+                execution before re-publishing the step command (default: 10 seconds)
         """
         if self.config.rc.yaml_file:
             logger.info(
                 f"Collecting execution parameters from YAML configuration file: {self.config.rc.yaml_file}"
             )
-            parameters = getattr(
+            parameters = self._sweep_parameters or getattr(
                 self.config.rc.simulation_configuration.execution_parameters,
                 self.app_name,
                 None,
@@ -265,6 +728,12 @@ class Manager(Application):
             ]
             self.init_retry_delay_s = parameters.init_retry_delay_s
             self.init_max_retry = parameters.init_max_retry
+            self.lockstep = parameters.lockstep
+            adaptive_time_scale = parameters.adaptive_time_scale
+            federation_summary_step = parameters.federation_summary_step
+            fast_forward_time = parameters.fast_forward_time
+            fast_forward_lead = parameters.fast_forward_lead
+            self.step_timeout = parameters.step_timeout
         else:
             logger.info(
                 f"Collecting execution parameters from user input or default values."
@@ -281,6 +750,8 @@ class Manager(Application):
             self.required_apps = required_apps
             self.init_retry_delay_s = init_retry_delay_s
             self.init_max_retry = init_max_retry
+            self.lockstep = lockstep
+            self.step_timeout = step_timeout
 
         # Convert TimeScaleUpdateSchema objects to TimeScaleUpdate objects
         converted_updates = []
@@ -293,26 +764,35 @@ class Manager(Application):
             )
         self.time_scale_updates = converted_updates
 
+        # Set up adaptive time scale control
+        self.time_scale_controller = None
+        if adaptive_time_scale is not None and not self.lockstep:
+            self.time_scale_controller = TimeScaleController.from_config(
+                adaptive_time_scale
+            )
+            if self.time_scale_updates:
+                logger.warning(
+                    "Ignoring time scale updates with adaptive time scale control."
+                )
+                self.time_scale_updates = []
+
         # Set up tracking of required applications
-        self.required_apps_status = dict(
-            zip(self.required_apps, [False] * len(self.required_apps))
-        )
-        self.add_message_callback("*", "status.ready", self.on_app_ready_status)
-        self.add_message_callback("*", "status.time", self.on_app_time_status)
+        with self._state_condition:
+            self.required_apps_status = dict(
+                zip(self.required_apps, [False] * len(self.required_apps))
+            )
+        self._add_status_callbacks()
 
         self._create_time_status_publisher(self.time_status_step, self.time_status_init)
+        self._create_federation_summary_publisher(federation_summary_step)
 
         # Initialize with retry logic
         for i in range(self.init_max_retry):
             self.init(self.sim_start_time, self.sim_stop_time, self.required_apps)
-            next_try = self.simulator.get_wallclock_time() + timedelta(
-                seconds=self.init_retry_delay_s
+            self._wait_for(
+                lambda: all(self.required_apps_status.values()),
+                timeout=self.init_retry_delay_s,
             )
-            while (
-                not all([self.required_apps_status[app] for app in self.required_apps])
-                and self.simulator.get_wallclock_time() < next_try
-            ):
-                time.sleep(0.001)
 
         # Configure start time if not provided
         if self.start_time is None:
@@ -328,8 +808,16 @@ class Manager(Application):
             / timedelta(seconds=1),
         )
 
-        # Use our heartbeat-safe sleep
-        self._sleep_with_heartbeat(sleep_seconds)
+        if not self._sleep_with_heartbeat(sleep_seconds):
+            return
+
+        # Ensure status subscriptions (including step status) are in place before starting
+        if not self.wait_for_topology(timeout=self.init_retry_delay_s):
+            logger.warning("Timed out waiting for status subscriptions to be applied.")
+
+        # Issue the fast-forward command ahead of the start command
+        if fast_forward_time is not None and not self.lockstep:
+            self.fast_forward(fast_forward_time, self.start_time + fast_forward_lead)
 
         # Issue the start command
         self.start(
@@ -340,11 +828,42 @@ class Manager(Application):
             self.time_scale_factor,
             self.time_status_step,
             self.time_status_init,
+            self.lockstep,
         )
 
+        if self.lockstep and self.time_scale_updates:
+            logger.warning("Ignoring time scale updates in lockstep execution.")
+            self.time_scale_updates = []
+
         # Wait for simulation to start executing
-        while self.simulator.get_mode() != Mode.EXECUTING:
-            time.sleep(0.001)
+        if not self._wait_for(
+            lambda: self.simulator.get_mode()
+            in (Mode.EXECUTING, Mode.TERMINATING, Mode.TERMINATED),
+            timeout=max(
+                0,
+                (self.start_time - self.simulator.get_wallclock_time())
+                / timedelta(seconds=1),
+            )
+            + self.init_retry_delay_s,
+        ):
+            logger.warning("Timed out waiting for the simulation to start executing.")
+
+        # Wait for paced execution to resume after fast-forwarding
+        if not self._wait_for(
+            lambda: not self.simulator.is_fast_forwarding()
+            or self.simulator.get_mode() != Mode.EXECUTING,
+            timeout=max(
+                0,
+                (
+                    self.start_time
+                    + fast_forward_lead
+                    - self.simulator.get_wallclock_time()
+                )
+                / timedelta(seconds=1),
+            )
+            + self.init_retry_delay_s,
+        ):
+            logger.warning("Timed out waiting for the simulation to fast-forward.")
 
         # Process time scale updates
         for update in self.time_scale_updates:
@@ -361,15 +880,39 @@ class Manager(Application):
                 / timedelta(seconds=1),
             )
 
-            # Use our heartbeat-safe sleep
-            self._sleep_with_heartbeat(sleep_seconds)
+            if not self._sleep_with_heartbeat(sleep_seconds):
+                return
 
             # Issue the update command
             self.update(update.time_scale_factor, update.sim_update_time)
 
-            # Wait until update takes effect
-            while self.simulator.get_time_scale_factor() != update.time_scale_factor:
-                time.sleep(0.001)
+            # Wait until update takes effect (at the end of the current time step)
+            if not self._wait_for(
+                lambda: self.simulator.get_time_scale_factor()
+                == update.time_scale_factor
+                or self.simulator.get_mode() != Mode.EXECUTING,
+                timeout=(
+                    self.command_lead
+                    + self.simulator.get_time_step()
+                    / self.simulator.get_time_scale_factor()
+                )
+                / timedelta(seconds=1)
+                + self.init_retry_delay_s,
+            ):
+                logger.warning(
+                    f"Timed out waiting for time scale factor {update.time_scale_factor} to take effect."
+                )
+
+        if self.lockstep:
+            # Scenario time advances with step acknowledgements instead of the wallclock
+            while not self._wait_for(
+                lambda: self.simulator.get_mode() != Mode.EXECUTING, timeout=1
+            ):
+                if self._should_stop.is_set():
+                    return
+            # Stop any application that has not terminated at the scenario stop time
+            self.stop(self.sim_stop_time)
+            return
 
         end_time = self.simulator.get_wallclock_time_at_simulation_time(
             self.simulator.get_end_time()
@@ -382,12 +925,24 @@ class Manager(Application):
             / timedelta(seconds=1),
         )
 
-        # Use our heartbeat-safe sleep
-        self._sleep_with_heartbeat(sleep_seconds)
+        if not self._sleep_with_heartbeat(sleep_seconds):
+            return
 
         # Issue the stop command
         self.stop(self.sim_stop_time)
 
+    def _add_status_callbacks(self) -> None:
+        """
+        Subscribes to the status messages of all applications, once.
+        """
+        if not self._status_callbacks_registered:
+            self.add_message_callback("*", "status.ready", self.on_app_ready_status)
+            self.add_message_callback("*", "status.time", self.on_app_time_status)
+            self.add_message_callback("*", "status.mode", self.on_app_mode_status)
+            self.add_message_callback("*", "status.result", self.on_app_result_status)
+            self.add_message_callback("*", "status.step", self.on_app_step_status)
+            self._status_callbacks_registered = True
+
     def on_app_ready_status(self, ch, method, properties, body) -> None:
         """
         Callback to handle a message containing an application ready status.
@@ -407,9 +962,10 @@ class Manager(Application):
                 # validate if message is a valid JSON
                 try:
                     # update the ready status based on the payload value
-                    self.required_apps_status[topic_parts[1]] = (
-                        ReadyStatus.model_validate_json(message).properties.ready
-                    )
+                    ready = ReadyStatus.model_validate_json(message).properties.ready
+                    with self._state_condition:
+                        self.required_apps_status[topic_parts[1]] = ready
+                        self._state_condition.notify_all()
                 except json.JSONDecodeError:
                     logger.error(f"Invalid JSON format: {message}")
         except ValidationError as e:
@@ -441,9 +997,17 @@ class Manager(Application):
                 wallclock_delta = self.simulator.get_wallclock_time() - props.time
                 scenario_delta = self.simulator.get_time() - props.sim_time
                 if len(topic_parts) > 1:
-                    logger.info(
+                    logger.debug(
                         f"Application {topic_parts[1]} latency: {scenario_delta} (scenario), {wallclock_delta} (wallclock)"
                     )
+                    self.federation_monitor.record_time_status(
+                        topic_parts[1],
+                        scenario_delta,
+                        wallclock_delta,
+                        self.simulator.get_wallclock_time(),
+                    )
+                    if self.time_scale_controller is not None:
+                        self._adapt_time_scale(topic_parts[1], props)
             except json.JSONDecodeError:
                 logger.error(f"Invalid JSON format: {message}")
         except ValidationError as e:
@@ -454,6 +1018,137 @@ class Manager(Application):
             )
             print(traceback.format_exc())
 
+    def on_app_mode_status(self, ch, method, properties, body) -> None:
+        """
+        Callback to handle a message containing an application mode status.
+
+        Args:
+            ch (:obj:`pika.channel.Channel`): The channel object used to communicate with the RabbitMQ server.
+            method (:obj:`pika.spec.Basic.Deliver`): Delivery-related information such as delivery tag, exchange, and routing key.
+            properties (:obj:`pika.BasicProperties`): Message properties including content type, headers, and more.
+            body (bytes): The actual message body sent, containing the message payload.
+        """
+        try:
+            # split the message topic into components (prefix/app_name/...)
+            topic_parts = method.routing_key.split(".")
+            message = body.decode("utf-8")
+            if len(topic_parts) > 1:
+                self.federation_monitor.record_mode(
+                    topic_parts[1],
+                    ModeStatus.model_validate_json(message).properties.mode,
+                    self.simulator.get_wallclock_time(),
+                )
+        except ValidationError as e:
+            logger.error(f"Validation error: {e}")
+        except Exception as e:
+            logger.error(
+                f"Exception (topic: {method.routing_key}, payload: {message}): {e}"
+            )
+            print(traceback.format_exc())
+
+    def on_app_result_status(self, ch, method, properties, body) -> None:
+        """
+        Callback to handle a message containing the results of an application after a completed execution.
+
+        Args:
+            ch (:obj:`pika.channel.Channel`): The channel object used to communicate with the RabbitMQ server.
+            method (:obj:`pika.spec.Basic.Deliver`): Delivery-related information such as delivery tag, exchange, and routing key.
+            properties (:obj:`pika.BasicProperties`): Message properties including content type, headers, and more.
+            body (bytes): The actual message body sent, containing the message payload.
+        """
+        try:
+            # split the message topic into components (prefix/app_name/...)
+            topic_parts = method.routing_key.split(".")
+            message = body.decode("utf-8")
+            if len(topic_parts) > 1:
+                props = ResultStatus.model_validate_json(message).properties
+                if props.fast_forward_overrun:
+                    logger.warning(
+                        f"Application {topic_parts[1]} overran the fast-forward resume time by {props.fast_forward_overrun}."
+                    )
+                with self._state_condition:
+                    self._run_app_results[topic_parts[1]] = props.model_dump(
+                        mode="json", by_alias=True
+                    )
+                    self._state_condition.notify_all()
+        except ValidationError as e:
+            logger.error(f"Validation error: {e}")
+        except Exception as e:
+            logger.error(
+                f"Exception (topic: {method.routing_key}, payload: {message}): {e}"
+            )
+            print(traceback.format_exc())
+
+    def get_federation_statistics(self) -> dict:
+        """
+        Gets the statistics of the applications in the federation collected from their status messages.
+
+        Returns:
+            dict: statistics per application name and application names ordered by decreasing
+                95th percentile scenario lag (stragglers)
+        """
+        return {
+            "applications": self.federation_monitor.get_statistics(
+                self.simulator.get_wallclock_time()
+            ),
+            "stragglers": self.federation_monitor.get_stragglers(),
+        }
+
+    def _create_federation_summary_publisher(
+        self, federation_summary_step: timedelta
+    ) -> None:
+        """
+        Creates a new federation summary publisher to publish the federation statistics periodically.
+
+        Args:
+            federation_summary_step (:obj:`timedelta`): wallclock duration between federation summary messages
+        """
+        if self._federation_summary_publisher is not None:
+            self.simulator.remove_observer(self._federation_summary_publisher)
+            self._federation_summary_publisher = None
+        if federation_summary_step is not None:
+            self._federation_summary_publisher = FederationSummaryPublisher(
+                self, federation_summary_step
+            )
+            self.simulator.add_observer(self._federation_summary_publisher)
+
+    def _adapt_time_scale(self, app_name: str, props) -> None:
+        """
+        Records the lag of an application behind the wallclock schedule and issues an update
+        command if the time scale controller proposes a new time scale factor.
+
+        Args:
+            app_name (str): application name
+            props (:obj:`TimeStatusProperties`): time status properties of the application
+        """
+        if (
+            self.simulator.get_mode() != Mode.EXECUTING
+            or self.simulator.get_step_barrier() is not None
+            or self.simulator.is_fast_forwarding()
+            or props.sim_time < self.simulator.get_simulation_epoch()
+        ):
+            # the schedule is only defined from the latest time scale change
+            return
+        self.time_scale_controller.record_lag(
+            app_name,
+            props.time
+            - self.simulator.get_wallclock_time_at_simulation_time(props.sim_time),
+        )
+        lags = self.time_scale_controller.get_lags()
+        time_scale_factor = self.time_scale_controller.evaluate(
+            self.simulator.get_time_scale_factor(), self.simulator.get_wallclock_time()
+        )
+        if time_scale_factor is not None:
+            logger.info(
+                f"Adapting time scale factor to {time_scale_factor} (max lag: {max(lags.values())})."
+            )
+            # take effect after the command lead and at least one time step
+            sim_update_time = self.simulator.get_time() + max(
+                self.command_lead * self.simulator.get_time_scale_factor(),
+                self.simulator.get_time_step(),
+            )
+            self.update(time_scale_factor, sim_update_time)
+
     def init(
         self,
         sim_start_time: datetime,
@@ -478,13 +1173,12 @@ class Manager(Application):
                 }
             }
         )
-        logger.info(
-            f"Sending initialize command {command.model_dump_json(by_alias=True)}."
-        )
+        payload = command.model_dump_json(by_alias=True)
+        logger.info("Sending initialize command %s.", payload)
         self.send_message(
             app_name=self.app_name,
             app_topics="init",
-            payload=command.model_dump_json(by_alias=True),
+            payload=payload,
         )
         # logger.info(f"Declared Queues: {self.declared_queues}")
         # logger.info(f"Declared Exchanges: {self.declared_exchanges}")
@@ -498,6 +1192,8 @@ class Manager(Application):
         time_scale_factor: float = 1.0,
         time_status_step: timedelta = None,
         time_status_init: datetime = None,
+        lockstep: bool = False,
+        step_timeout: timedelta = None,
     ) -> None:
         """
 
@@ -512,6 +1208,10 @@ class Manager(Application):
             time_scale_factor (float): Scenario seconds per wallclock second (default: 1.0)
             time_status_step (:obj:`timedelta`): Scenario duration between time status messages
             time_status_init (:obj:`datetime`): Scenario time of first time status message
+            lockstep (bool): True, if scenario time advances as soon as all required applications acknowledge
+                each time step instead of following the wallclock time scale factor (default: False)
+            step_timeout (:obj:`timedelta`): wallclock duration to wait for step acknowledgements in lockstep
+                execution before re-publishing the step command (default: None keeps the current value)
         """
         if start_time is None:
             start_time = self.simulator.get_wallclock_time()
@@ -525,14 +1225,26 @@ class Manager(Application):
                     "simStartTime": sim_start_time,
                     "simStopTime": sim_stop_time,
                     "timeScalingFactor": time_scale_factor,
+                    "lockstep": lockstep,
                 }
             }
         )
-        logger.info(f"Sending start command {command.model_dump_json(by_alias=True)}.")
+        # Gate the manager time steps on step acknowledgements, if requested
+        if lockstep:
+            self._add_status_callbacks()
+            if step_timeout is not None:
+                self.step_timeout = step_timeout
+            self._lockstep_barrier = LockstepBarrier(list(self.required_apps_status))
+            self._lockstep_deadline = None
+            self.simulator.set_step_barrier(self._lockstep_step)
+        else:
+            self.simulator.set_step_barrier(None)
+        payload = command.model_dump_json(by_alias=True)
+        logger.info("Sending start command %s.", payload)
         self.send_message(
             app_name=self.app_name,
             app_topics="start",
-            payload=command.model_dump_json(by_alias=True),
+            payload=payload,
         )
         exec_thread = threading.Thread(
             target=self.simulator.execute,
@@ -545,6 +1257,39 @@ class Manager(Application):
             },
         )
         exec_thread.start()
+        self._exec_thread = exec_thread
+
+    def fast_forward(
+        self, sim_fast_forward_time: datetime, resume_time: datetime = None
+    ) -> None:
+        """
+        Command to fast-forward a test run execution by publishing a fast-forward command, which
+        lets applications execute time steps without wallclock pacing up to the designated
+        scenario time, and resume paced execution at the designated wallclock time.
+
+        Args:
+            sim_fast_forward_time (:obj:`datetime`): scenario time up to which to fast-forward
+            resume_time (:obj:`datetime`): wallclock time at which paced execution resumes
+                (default: None resumes as soon as the fast-forward time is reached)
+        """
+        # publish a fast-forward command message
+        command = FastForwardCommand.model_validate(
+            {
+                "taskingParameters": {
+                    "simFastForwardTime": sim_fast_forward_time,
+                    "resumeTime": resume_time,
+                }
+            }
+        )
+        payload = command.model_dump_json(by_alias=True)
+        logger.info("Sending fast-forward command %s.", payload)
+        self.send_message(
+            app_name=self.app_name,
+            app_topics="fast_forward",
+            payload=payload,
+        )
+        # fast-forward the execution
+        self.simulator.set_fast_forward(sim_fast_forward_time, resume_time)
 
     def stop(self, sim_stop_time: datetime) -> None:
         """
@@ -557,11 +1302,12 @@ class Manager(Application):
         command = StopCommand.model_validate(
             {"taskingParameters": {"simStopTime": sim_stop_time}}
         )
-        logger.info(f"Sending stop command {command.model_dump_json(by_alias=True)}.")
+        payload = command.model_dump_json(by_alias=True)
+        logger.info("Sending stop command %s.", payload)
         self.send_message(
             app_name=self.app_name,
             app_topics="stop",
-            payload=command.model_dump_json(by_alias=True),
+            payload=payload,
         )
 
         # Update the execution end time if simulator is in EXECUTING mode
@@ -575,6 +1321,105 @@ class Manager(Application):
                 "Skipping setting simulator end time as simulator is not in EXECUTING mode"
             )
 
+    def step(self, sim_time: datetime) -> None:
+        """
+        Command to advance a lockstep execution by publishing a step command, which allows
+        applications to advance up to the designated scenario time.
+
+        Args:
+            sim_time (:obj:`datetime`): scenario time to which applications may advance
+        """
+        command = StepCommand.model_validate(
+            {"taskingParameters": {"simTime": sim_time}}
+        )
+        payload = command.model_dump_json(by_alias=True)
+        logger.debug("Sending step command %s.", payload)
+        self.send_message(
+            app_name=self.app_name,
+            app_topics="step",
+            payload=payload,
+        )
+
+    def _lockstep_step(self, next_time: datetime) -> bool:
+        """
+        Step barrier for lockstep execution. Waits for all required applications to acknowledge
+        the current scenario time and then publishes a step command to the next scenario time.
+        If acknowledgements are missing after the step timeout, re-publishes the step command to
+        the current scenario time, which applications acknowledge again.
+
+        Args:
+            next_time (:obj:`datetime`): next scenario time
+
+        Returns:
+            bool: True, if the manager may advance to the next scenario time
+        """
+        sim_time = self.simulator.get_time()
+        if self._lockstep_deadline is None:
+            self._lockstep_deadline = (
+                self.simulator.get_wallclock_time() + self.step_timeout
+            )
+        if not self._lockstep_barrier.wait(sim_time, timeout=1):
+            lagging = self._lockstep_barrier.get_lagging(sim_time)
+            if self.simulator.get_wallclock_time() >= self._lockstep_deadline:
+                logger.warning(
+                    f"Timed out waiting for step status from {lagging} at {sim_time}, re-publishing step command."
+                )
+                self.step(sim_time)
+                self._lockstep_deadline = None
+            else:
+                logger.debug(f"Waiting for step status from {lagging}.")
+            return False
+        self._lockstep_deadline = None
+        self.step(next_time)
+        return True
+
+    def on_app_step_status(self, ch, method, properties, body) -> None:
+        """
+        Callback to handle a message containing an application step status in a lockstep execution.
+
+        Args:
+            ch (:obj:`pika.channel.Channel`): The channel object used to communicate with the RabbitMQ server.
+            method (:obj:`pika.spec.Basic.Deliver`): Delivery-related information such as delivery tag, exchange, and routing key.
+            properties (:obj:`pika.BasicProperties`): Message properties including content type, headers, and more.
+            body (bytes): The actual message body sent, containing the message payload.
+        """
+        try:
+            # split the message topic into components (prefix/app_name/...)
+            topic_parts = method.routing_key.split(".")
+            message = body.decode("utf-8")
+            if len(topic_parts) > 1 and self._lockstep_barrier is not None:
+                self._lockstep_barrier.update(
+                    topic_parts[1],
+                    StepStatus.model_validate_json(message).properties.sim_time,
+                )
+        except ValidationError as e:
+            logger.error(f"Validation error: {e}")
+        except Exception as e:
+            logger.error(
+                f"Exception (topic: {method.routing_key}, payload: {message}): {e}"
+            )
+            print(traceback.format_exc())
+
+    def checkpoint(self, path: str) -> None:
+        """
+        Command to checkpoint a test run execution by publishing a checkpoint command, which
+        requests applications to save a checkpoint at their next time step boundary.
+
+        Args:
+            path (str): path of the checkpoint file, in which {app_name} is replaced by the
+                name of each application
+        """
+        command = CheckpointCommand.model_validate(
+            {"taskingParameters": {"path": path}}
+        )
+        payload = command.model_dump_json(by_alias=True)
+        logger.info("Sending checkpoint command %s.", payload)
+        self.send_message(
+            app_name=self.app_name,
+            app_topics="checkpoint",
+            payload=payload,
+        )
+
     def update(self, time_scale_factor: float, sim_update_time: datetime) -> None:
         """
         Command to update the time scaling factor for a test run execution by updating the execution time scale factor,
@@ -593,11 +1438,12 @@ class Manager(Application):
                 }
             }
         )
-        logger.info(f"Sending update command {command.model_dump_json(by_alias=True)}.")
+        payload = command.model_dump_json(by_alias=True)
+        logger.info("Sending update command %s.", payload)
         self.send_message(
             app_name=self.app_name,
             app_topics="update",
-            payload=command.model_dump_json(by_alias=True),
+            payload=payload,
         )
         # update the execution time scale factor
         self.simulator.set_time_scale_factor(time_scale_factor, sim_update_time)
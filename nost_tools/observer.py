@@ -2,14 +2,28 @@
 Provides base classes that implement the observer pattern to loosely couple an observable and observer.
 """
 
+import logging
+import os
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
 from typing import TYPE_CHECKING, List, Optional, Union
 
 if TYPE_CHECKING:
+    import numpy
+    import pandas
+    import pyarrow
+
     from nost_tools.simulator import Mode, Simulator
 
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
 
 class Observer(ABC):
     """
@@ -78,6 +92,455 @@ class RecordingObserver(Observer):
             self.changes.append(change)
 
 
+class ColumnarRecordingObserver(Observer):
+    """
+    Observer that records changes in preallocated, growable NumPy columns of the property
+    id (index in `property_names`), old value, new value, and (optionally) wallclock time
+    of each change. References to the source are not kept.
+
+    Integer, float, and datetime values are stored in numeric columns (datetimes as
+    microseconds since the epoch); a value column falls back to Python objects if it records
+    values of any other or of mixed types. Columns double in size when full, up to
+    `max_size` rows. Once full, the oldest changes are overwritten (ring buffer) or, if a
+    spill directory is set, the recorded changes are written to a file in that directory
+    and the columns are reused.
+
+    Attributes:
+        property_filters (list(str)): names of the recorded properties, or None for all
+        timestamped (bool): True, if the changes are timestamped
+        max_size (int): maximum number of changes kept in memory, or None for no limit
+        spill_dir (str): directory to which full columns are written, or None
+        property_names (list(str)): names of the recorded properties, indexed by property id
+        dropped (int): number of changes overwritten in the ring buffer
+        spill_files (list(str)): paths of the files of spilled changes
+    """
+
+    #: Names of the recorded columns
+    COLUMNS = ("property_id", "old_value", "new_value", "time")
+
+    def __init__(
+        self,
+        property_filters: Optional[Union[str, List[str]]] = None,
+        timestamped: bool = False,
+        initial_size: int = 1024,
+        max_size: int = None,
+        spill_dir: str = None,
+    ):
+        """
+        Initializes a new columnar recording observer.
+
+        Args:
+            property_filters (Optional[Union[str,List[str]]]): optional list of property names to record
+            timestamped (bool): True, if the changes shall be timestamped
+            initial_size (int): initial number of rows of the columns (default: 1024)
+            max_size (int): maximum number of changes kept in memory (default: None, for no limit)
+            spill_dir (str): directory to which changes are written when `max_size` is
+                reached (default: None, to overwrite the oldest changes)
+        """
+        import numpy as np
+
+        if isinstance(property_filters, str):
+            self.property_filters = [property_filters]
+        else:
+            self.property_filters = property_filters
+        if spill_dir is not None and max_size is None:
+            raise ValueError("Spilling changes to disk requires a maximum size.")
+        self.timestamped = timestamped
+        self.max_size = max_size
+        self.spill_dir = spill_dir
+        self.property_names = []
+        self.dropped = 0
+        self.spill_files = []
+        self._property_ids = {}
+        self._capacity = max(1, min(initial_size, max_size or initial_size))
+        self._head = 0
+        self._size = 0
+        self._kinds = {"old_value": None, "new_value": None}
+        self._columns = {
+            "property_id": np.zeros(self._capacity, dtype=np.int32),
+            "old_value": None,
+            "new_value": None,
+            "time": np.zeros(self._capacity if timestamped else 0, dtype=np.int64),
+        }
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        """
+        Gets the number of changes kept in memory.
+        """
+        return self._size
+
+    @staticmethod
+    def _get_kind(value: object) -> str:
+        """
+        Gets the kind of column storing a value.
+        """
+        if isinstance(value, datetime):
+            return "datetime" if value.tzinfo is None else "datetime_utc"
+        if isinstance(value, int) and not isinstance(value, bool):
+            return "int" if -(2**63) <= value < 2**63 else "object"
+        if isinstance(value, float):
+            return "float"
+        return "object"
+
+    @staticmethod
+    def _encode(kind: str, value: object) -> object:
+        """
+        Encodes a value for a column of a kind.
+        """
+        if kind == "datetime_utc":
+            return (value - _EPOCH) // _MICROSECOND
+        if kind == "datetime":
+            return (value - _EPOCH.replace(tzinfo=None)) // _MICROSECOND
+        return value
+
+    @staticmethod
+    def _decode(kind: str, column: "numpy.ndarray") -> list:
+        """
+        Decodes the values of a column of a kind to Python objects.
+        """
+        if kind == "datetime_utc":
+            return [_EPOCH + int(value) * _MICROSECOND for value in column]
+        if kind == "datetime":
+            return [
+                _EPOCH.replace(tzinfo=None) + int(value) * _MICROSECOND
+                for value in column
+            ]
+        return column.tolist()
+
+    def _store(self, column: str, index: int, value: object) -> None:
+        """
+        Stores a value in a value column, allocating the column or converting it to
+        objects as needed.
+        """
+        import numpy as np
+
+        kind = self._get_kind(value)
+        if self._kinds[column] is None:
+            self._kinds[column] = kind
+            self._columns[column] = np.zeros(
+                self._capacity,
+                dtype={"float": np.float64, "object": object}.get(kind, np.int64),
+            )
+        elif self._kinds[column] not in ("object", kind):
+            values = np.empty(self._capacity, dtype=object)
+            values[:] = self._decode(self._kinds[column], self._columns[column])
+            self._kinds[column] = "object"
+            self._columns[column] = values
+        self._columns[column][index] = self._encode(self._kinds[column], value)
+
+    def _get_ordered(self, column: str) -> "numpy.ndarray":
+        """
+        Gets the recorded rows of a column, from oldest to newest.
+        """
+        import numpy as np
+
+        values = self._columns[column]
+        if values is None or len(values) == 0:
+            return values
+        if self._head + self._size <= self._capacity:
+            return values[self._head : self._head + self._size]
+        return np.concatenate(
+            (values[self._head :], values[: (self._head + self._size) % self._capacity])
+        )
+
+    def _grow(self) -> None:
+        """
+        Doubles the capacity of the columns, up to the maximum size.
+        """
+        import numpy as np
+
+        capacity = self._capacity * 2
+        if self.max_size is not None:
+            capacity = min(capacity, self.max_size)
+        for column, values in self._columns.items():
+            if values is not None and len(values):
+                grown = np.zeros(capacity, dtype=values.dtype)
+                grown[: self._size] = self._get_ordered(column)
+                self._columns[column] = grown
+        self._capacity = capacity
+        self._head = 0
+
+    def _spill(self) -> None:
+        """
+        Writes the recorded changes to a file in the spill directory and clears the columns.
+        """
+        import numpy as np
+
+        path = os.path.join(self.spill_dir, f"changes_{len(self.spill_files):06d}.npz")
+        np.savez(
+            path,
+            kinds=np.array(
+                [self._kinds["old_value"], self._kinds["new_value"]], dtype=object
+            ),
+            **{
+                column: self._get_ordered(column)
+                for column in self.COLUMNS
+                if self._columns[column] is not None
+            },
+        )
+        self.spill_files.append(path)
+        self._head = 0
+        self._size = 0
+
+    def on_change(
+        self, source: object, property_name: str, old_value: object, new_value: object
+    ) -> None:
+        """Callback notifying of a change.
+
+        Args:
+            source (object): object that triggered a property change
+            property_name (str): name of the changed property
+            old_value (object): old value of the named property
+            new_value (object): new value of the named property
+        """
+        if (
+            self.property_filters is not None
+            and property_name not in self.property_filters
+        ):
+            return
+        if self._size == self._capacity:
+            if self.max_size is None or self._capacity < self.max_size:
+                self._grow()
+            elif self.spill_dir is not None:
+                self._spill()
+            else:
+                self._head = (self._head + 1) % self._capacity
+                self._size -= 1
+                self.dropped += 1
+        index = (self._head + self._size) % self._capacity
+        if property_name not in self._property_ids:
+            self._property_ids[property_name] = len(self.property_names)
+            self.property_names.append(property_name)
+        self._columns["property_id"][index] = self._property_ids[property_name]
+        self._store("old_value", index, old_value)
+        self._store("new_value", index, new_value)
+        if self.timestamped:
+            self._columns["time"][index] = time.time_ns() // 1000
+        self._size += 1
+
+    def _get_frame(self, columns: dict, kinds: list) -> "pandas.DataFrame":
+        """
+        Converts the recorded columns of a chunk to a data frame.
+        """
+        import pandas as pd
+
+        data = {
+            "property_name": pd.Categorical.from_codes(
+                columns["property_id"], categories=self.property_names
+            )
+        }
+        for column, kind in zip(("old_value", "new_value"), kinds):
+            values = columns.get(column)
+            if values is None or kind == "object":
+                data[column] = values if values is not None else []
+            elif kind.startswith("datetime"):
+                data[column] = pd.to_datetime(
+                    values, unit="us", utc=kind == "datetime_utc"
+                )
+            else:
+                data[column] = values
+        if self.timestamped:
+            data["time"] = pd.to_datetime(columns["time"], unit="us", utc=True)
+        return pd.DataFrame(data)
+
+    def to_dataframe(self, include_spilled: bool = True) -> "pandas.DataFrame":
+        """
+        Exports the recorded changes, from oldest to newest, to a data frame with columns
+        `property_name` (categorical), `old_value`, `new_value`, and (if timestamped) `time`.
+
+        Args:
+            include_spilled (bool): True, if changes spilled to disk shall be included (default: True)
+
+        Returns:
+            :obj:`pandas.DataFrame`: recorded changes
+        """
+        import numpy as np
+        import pandas as pd
+
+        frames = []
+        if include_spilled:
+            for path in self.spill_files:
+                with np.load(path, allow_pickle=True) as chunk:
+                    frames.append(
+                        self._get_frame(
+                            {column: chunk[column] for column in chunk.files},
+                            chunk["kinds"].tolist(),
+                        )
+                    )
+        frames.append(
+            self._get_frame(
+                {column: self._get_ordered(column) for column in self.COLUMNS},
+                [self._kinds["old_value"], self._kinds["new_value"]],
+            )
+        )
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def to_arrow(self, include_spilled: bool = True) -> "pyarrow.Table":
+        """
+        Exports the recorded changes to an Arrow table (see :obj:`to_dataframe`). Requires
+        the `pyarrow` package, and that object values are convertible to Arrow types.
+
+        Args:
+            include_spilled (bool): True, if changes spilled to disk shall be included (default: True)
+
+        Returns:
+            :obj:`pyarrow.Table`: recorded changes
+        """
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(
+            self.to_dataframe(include_spilled), preserve_index=False
+        )
+
+
+class AsyncObserver(Observer):
+    """
+    Observer that forwards changes to another observer on a worker thread, so slow
+    observers (e.g., publishers propagating and sending states) do not delay the
+    observable that notifies them.
+
+    Changes are queued per observer and forwarded in order. Consecutive changes of the same
+    source and coalesced property that are still queued are merged into one change with the
+    old value of the first and the new value of the last, so a slow observer receives the
+    latest `time` rather than every intermediate time step.
+
+    The wrapped observer runs concurrently with the simulator thread, so it should only use
+    the changed values it receives (or state it copies in a synchronous observer) rather than
+    reading entities that are updated by `tick` and `tock`.
+
+    Attributes:
+        observer (:obj:`Observer`): observer notified on the worker thread
+        coalesce_properties (list(str)): names of the properties whose changes are coalesced
+        max_queue_size (int): maximum number of queued changes, or None for no limit
+        metrics (dict): number of queued, coalesced, and forwarded changes, and the maximum
+            number of queued changes
+    """
+
+    def __init__(
+        self,
+        observer: Observer,
+        coalesce_properties: Optional[Union[str, List[str]]] = "time",
+        max_queue_size: int = None,
+    ):
+        """
+        Initializes a new asynchronous observer and starts its worker thread.
+
+        Args:
+            observer (:obj:`Observer`): observer notified on the worker thread
+            coalesce_properties (Optional[Union[str,List[str]]]): names of the properties whose
+                queued changes are coalesced (default: "time")
+            max_queue_size (int): maximum number of queued changes; notifying observables
+                block while the queue is full (default: None, for no limit)
+        """
+        if isinstance(coalesce_properties, str):
+            coalesce_properties = [coalesce_properties]
+        self.observer = observer
+        self.coalesce_properties = list(coalesce_properties or [])
+        self.max_queue_size = max_queue_size
+        self.metrics = {"queued": 0, "coalesced": 0, "forwarded": 0, "max_queued": 0}
+        self._queue = deque()
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"AsyncObserver-{type(observer).__name__}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def on_change(
+        self, source: object, property_name: str, old_value: object, new_value: object
+    ) -> None:
+        """Callback notifying of a change, which is queued for the observer.
+
+        Args:
+            source (object): object that triggered a property change
+            property_name (str): name of the changed property
+            old_value (object): old value of the named property
+            new_value (object): new value of the named property
+        """
+        with self._condition:
+            if self._closed:
+                return
+            if (
+                self._queue
+                and property_name in self.coalesce_properties
+                and self._queue[-1][0] is source
+                and self._queue[-1][1] == property_name
+            ):
+                self._queue[-1][3] = new_value
+                self.metrics["coalesced"] += 1
+                return
+            while (
+                self.max_queue_size is not None
+                and len(self._queue) >= self.max_queue_size
+                and threading.current_thread() is not self._thread
+            ):
+                self._condition.wait()
+            self._queue.append([source, property_name, old_value, new_value])
+            self.metrics["queued"] += 1
+            self.metrics["max_queued"] = max(
+                self.metrics["max_queued"], len(self._queue)
+            )
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        """
+        Forwards queued changes to the observer.
+        """
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                change = self._queue.popleft()
+                self._busy = True
+                self._condition.notify_all()
+            try:
+                self.observer.on_change(*change)
+            except Exception as e:
+                logger.error(f"Error in asynchronous observer {self.observer}: {e}")
+            with self._condition:
+                self._busy = False
+                self.metrics["forwarded"] += 1
+                self._condition.notify_all()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Waits until all queued changes are forwarded to the observer.
+
+        Args:
+            timeout (float): maximum time, in seconds, to wait (default: None, for no limit)
+
+        Returns:
+            bool: True, if all queued changes were forwarded
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._queue and not self._busy, timeout
+            )
+
+    def close(self, timeout: float = None) -> bool:
+        """
+        Stops accepting changes, forwards the queued changes, and stops the worker thread.
+
+        Args:
+            timeout (float): maximum time, in seconds, to wait (default: None, for no limit)
+
+        Returns:
+            bool: True, if all queued changes were forwarded
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
 class Observable(object):
     """
     Base class that can register (add/remove) and notify observers of property changes.
@@ -204,13 +667,23 @@ class PropertyChangeCallback(Observer):
 class ScenarioTimeIntervalCallback(Observer):
     """
     Triggers a provided callback at a fixed interval in scenario time.
+
+    If a scenario time change passes several intervals, the missed policy designates
+    whether to call the callback once per interval ("burst"), once with the latest interval
+    time ("coalesce"), or once with the list of interval times ("batch").
     """
 
     def __init__(
-        self, callback: Callable[[object, datetime], None], time_inteval: timedelta
+        self,
+        callback: Callable[[object, datetime], None],
+        time_inteval: timedelta,
+        missed_policy: str = "burst",
     ):
+        if missed_policy not in ("burst", "coalesce", "batch"):
+            raise ValueError(f"Invalid missed interval policy: {missed_policy}")
         self.callback = callback
         self.time_interval = time_inteval
+        self.missed_policy = missed_policy
         self._next_time = None
 
     def on_change(
@@ -219,9 +692,25 @@ class ScenarioTimeIntervalCallback(Observer):
         if property_name == source.PROPERTY_TIME:
             if self._next_time is None:
                 self._next_time = old_value + self.time_interval
-            while self._next_time <= new_value:
-                self.callback(source, self._next_time)
-                self._next_time = self._next_time + self.time_interval
+            if self.missed_policy == "burst":
+                while self._next_time <= new_value:
+                    self.callback(source, self._next_time)
+                    self._next_time = self._next_time + self.time_interval
+            elif self._next_time <= new_value:
+                count = 1 + (new_value - self._next_time) // self.time_interval
+                if self.missed_policy == "coalesce":
+                    self.callback(
+                        source, self._next_time + (count - 1) * self.time_interval
+                    )
+                else:
+                    self.callback(
+                        source,
+                        [
+                            self._next_time + i * self.time_interval
+                            for i in range(count)
+                        ],
+                    )
+                self._next_time = self._next_time + count * self.time_interval
 
 
 class WallclockTimeIntervalCallback(Observer):
@@ -2,9 +2,14 @@
 Provides utility classes to help applications bind behavior to temporal events.
 """
 
+import heapq
+import itertools
+import logging
+import threading
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, List
 
 from .observer import Observer
 from .simulator import Mode, Simulator
@@ -12,6 +17,104 @@ from .simulator import Mode, Simulator
 if TYPE_CHECKING:
     from .application import Application
 
+logger = logging.getLogger(__name__)
+
+
+class WallclockScheduler(object):
+    """
+    Runs callbacks at wallclock deadlines from a single background thread shared by
+    any number of publishers. Pending callbacks are kept in a heap ordered by deadline,
+    so the thread only wakes up for the earliest deadline.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        """
+        Initializes a new wallclock scheduler. The scheduler thread is started when the
+        first callback is scheduled.
+        """
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    @classmethod
+    def get_default(cls) -> "WallclockScheduler":
+        """
+        Gets the scheduler shared by all publishers that do not designate a scheduler.
+
+        Returns:
+            :obj:`WallclockScheduler`: default scheduler
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> list:
+        """
+        Schedules a callback to run once after a delay.
+
+        Args:
+            delay (float): delay, in seconds (callbacks with non-positive delays run immediately)
+            callback (Callable): function to call from the scheduler thread
+
+        Returns:
+            list: handle to cancel the callback
+        """
+        handle = [time.monotonic() + max(0.0, delay), next(self._sequence), callback]
+        with self._condition:
+            heapq.heappush(self._queue, handle)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="WallclockScheduler", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return handle
+
+    def cancel(self, handle: list) -> None:
+        """
+        Cancels a scheduled callback, if it has not run yet.
+
+        Args:
+            handle (list): handle returned when the callback was scheduled
+        """
+        with self._condition:
+            handle[2] = None
+
+    def __len__(self) -> int:
+        """
+        Gets the number of pending callbacks.
+        """
+        with self._condition:
+            return sum(1 for handle in self._queue if handle[2] is not None)
+
+    def _run(self) -> None:
+        """
+        Runs callbacks as their deadlines pass.
+        """
+        while True:
+            with self._condition:
+                while True:
+                    while self._queue and self._queue[0][2] is None:
+                        heapq.heappop(self._queue)
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+                    delay = self._queue[0][0] - time.monotonic()
+                    if delay <= 0:
+                        handle = heapq.heappop(self._queue)
+                        callback, handle[2] = handle[2], None
+                        break
+                    self._condition.wait(delay)
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in scheduled callback {callback}: {e}")
+
 
 class ScenarioTimeIntervalPublisher(Observer, ABC):
     """
@@ -20,10 +123,18 @@ class ScenarioTimeIntervalPublisher(Observer, ABC):
     Provides the simulation with time status messages, also refered to as 'heartbeat messages',
     or 'simulation time statuses'.
 
+    If a scenario time change passes several intervals (e.g., if the time status step is
+    smaller than the time step), the missed policy designates whether to publish once per
+    interval ("burst"), once for all intervals ("coalesce"), or once with the list of
+    interval times (`publish_messages`, "batch"). While the simulator is fast-forwarding,
+    no messages are published; intervals passed during fast-forward are coalesced into one
+    message when paced execution resumes.
+
     Attributes:
         app (:obj:`Application`): application to publish messages
         time_status_step (:obj:`timedelta`): scenario duration between time status messages
         time_status_init (:obj:`datetime`): scenario time for first time status message
+        missed_policy (str): "burst", "coalesce", or "batch" handling of passed intervals
     """
 
     def __init__(
@@ -31,6 +142,7 @@ class ScenarioTimeIntervalPublisher(Observer, ABC):
         app: "Application",
         time_status_step: timedelta = None,
         time_status_init: datetime = None,
+        missed_policy: str = "burst",
     ):
         """
         Initializes a new scenario time interval publisher.
@@ -39,11 +151,18 @@ class ScenarioTimeIntervalPublisher(Observer, ABC):
             app (:obj:`Application`): application to publish messages
             time_status_step (:obj:`timedelta`): scenario duration between time status messages
             time_status_init (:obj:`datetime`): scenario time for first time status message
+            missed_policy (str): handling of intervals passed by one scenario time change:
+                "burst" (publish once per interval), "coalesce" (publish once), or "batch"
+                (call `publish_messages` once with the interval times) (default: "burst")
         """
+        if missed_policy not in ("burst", "coalesce", "batch"):
+            raise ValueError(f"Invalid missed interval policy: {missed_policy}")
         self.app = app
         self.time_status_step = time_status_step
         self.time_status_init = time_status_init
+        self.missed_policy = missed_policy
         self._next_time_status = None
+        self._fast_forward = False
         # TODO: consider adding the `publish_message` callable as an argument rather than abstract method
 
     @abstractmethod
@@ -53,6 +172,16 @@ class ScenarioTimeIntervalPublisher(Observer, ABC):
         """
         pass
 
+    def publish_messages(self, times: List[datetime]) -> None:
+        """
+        Publishes messages for intervals passed by one scenario time change, if the missed
+        policy is "batch". By default, publishes one message; override to publish all times.
+
+        Args:
+            times (list(:obj:`datetime`)): scenario times of the passed intervals
+        """
+        self.publish_message()
+
     def on_change(
         self, source: object, property_name: str, old_value: object, new_value: object
     ) -> None:
@@ -67,26 +196,67 @@ class ScenarioTimeIntervalPublisher(Observer, ABC):
         """
         if property_name == Simulator.PROPERTY_MODE and new_value == Mode.INITIALIZED:
             if self.time_status_init is None:
-                self._next_time_status = self.app.simulator.get_init_time()
+                # the current time is the initial time, or the time restored from a checkpoint
+                self._next_time_status = self.app.simulator.get_time()
             else:
                 self._next_time_status = self.time_status_init
-        elif property_name == Simulator.PROPERTY_TIME:
-            while self._next_time_status <= new_value:
-                self.publish_message()
-                if self.time_status_step is None:
-                    self._next_time_status += self.app.simulator.get_time_step()
+        elif property_name == Simulator.PROPERTY_FAST_FORWARD:
+            self._fast_forward = new_value is not None
+            if not self._fast_forward and self._next_time_status is not None:
+                time_status_step = self._get_time_status_step()
+                time = self.app.simulator.get_time()
+                if self._next_time_status <= time:
+                    self.publish_message()
+                    self._next_time_status += (
+                        1 + (time - self._next_time_status) // time_status_step
+                    ) * time_status_step
+        elif property_name == Simulator.PROPERTY_TIME and not self._fast_forward:
+            if self.missed_policy == "burst":
+                while self._next_time_status <= new_value:
+                    self.publish_message()
+                    self._next_time_status += self._get_time_status_step()
+            elif self._next_time_status <= new_value:
+                time_status_step = self._get_time_status_step()
+                count = 1 + (new_value - self._next_time_status) // time_status_step
+                if self.missed_policy == "coalesce":
+                    self.publish_message()
                 else:
-                    self._next_time_status += self.time_status_step
+                    self.publish_messages(
+                        [
+                            self._next_time_status + i * time_status_step
+                            for i in range(count)
+                        ]
+                    )
+                self._next_time_status += count * time_status_step
+
+    def _get_time_status_step(self) -> timedelta:
+        """
+        Gets the scenario duration between messages.
+
+        Returns:
+            :obj:`timedelta`: time status step, or the time step of the simulator
+        """
+        if self.time_status_step is None:
+            return self.app.simulator.get_time_step()
+        return self.time_status_step
 
 
 class WallclockTimeIntervalPublisher(Observer, ABC):
     """
     Publishes messages at a regular interval (wallclock time).
 
+    By default, messages are published when the scenario time changes, so the interval is
+    quantized to simulator time steps. In timer mode, messages are published at their
+    wallclock deadlines by a :obj:`WallclockScheduler` while the simulator is executing,
+    independent of time steps, with a policy for deadlines missed while a publish ran late.
+
     Attributes:
         app (:obj:`Application`): application to publish messages
         time_status_step (:obj:`timedelta`): wallclock duration between time status messages
         time_status_init (:obj:`datetime`): wallclock time for first time status message
+        timer (bool): True, if messages are published by a wallclock timer
+        missed_policy (str): "burst", "coalesce", or "skip" handling of missed timer deadlines
+        missed (int): number of timer deadlines not published due to the missed policy
     """
 
     def __init__(
@@ -94,6 +264,9 @@ class WallclockTimeIntervalPublisher(Observer, ABC):
         app: "Application",
         time_status_step: timedelta = None,
         time_status_init: datetime = None,
+        timer: bool = False,
+        missed_policy: str = "burst",
+        scheduler: WallclockScheduler = None,
     ):
         """
         Initializes a new wallclock time interval publisher.
@@ -102,11 +275,27 @@ class WallclockTimeIntervalPublisher(Observer, ABC):
             app (:obj:`Application`): application to publish messages
             time_status_step (:obj:`timedelta`): wallclock duration between time status messages
             time_status_init (:obj:`datetime`): wallclock time for first time status message
+            timer (bool): True, if messages shall be published by a wallclock timer while
+                the simulator is executing, rather than when the scenario time changes
+                (default: False)
+            missed_policy (str): handling of timer deadlines that passed before the timer
+                fired: "burst" (publish once per deadline), "coalesce" (publish once for all),
+                or "skip" (publish only if no deadline was missed) (default: "burst")
+            scheduler (:obj:`WallclockScheduler`): scheduler running the timer
+                (default: None, for the shared default scheduler)
         """
+        if missed_policy not in ("burst", "coalesce", "skip"):
+            raise ValueError(f"Invalid missed deadline policy: {missed_policy}")
         self.app = app
         self.time_status_step = time_status_step
         self.time_status_init = time_status_init
+        self.timer = timer
+        self.missed_policy = missed_policy
+        self.scheduler = scheduler
+        self.missed = 0
         self._next_time_status = None
+        self._timer_handle = None
+        self._timer_lock = threading.Lock()
 
     @abstractmethod
     def publish_message(self) -> None:
@@ -130,12 +319,79 @@ class WallclockTimeIntervalPublisher(Observer, ABC):
                 self._next_time_status = self.app.simulator.get_wallclock_time()
             else:
                 self._next_time_status = self.time_status_init
+        elif self.timer:
+            if property_name == Simulator.PROPERTY_MODE:
+                if new_value == Mode.EXECUTING:
+                    self._start_timer()
+                elif new_value in (Mode.TERMINATED, Mode.UNDEFINED):
+                    self._stop_timer()
         elif property_name == Simulator.PROPERTY_TIME:
             while self._next_time_status <= self.app.simulator.get_wallclock_time():
                 self.publish_message()
-                if self.time_status_step is None:
-                    self._next_time_status += (
-                        self.app.simulator.get_wallclock_time_step()
-                    )
-                else:
-                    self._next_time_status += self.time_status_step
+                self._next_time_status += self._get_time_status_step()
+
+    def _get_time_status_step(self) -> timedelta:
+        """
+        Gets the wallclock duration between messages.
+
+        Returns:
+            :obj:`timedelta`: time status step, or the wallclock time step of the simulator
+        """
+        if self.time_status_step is None:
+            return self.app.simulator.get_wallclock_time_step()
+        return self.time_status_step
+
+    def _start_timer(self) -> None:
+        """
+        Starts publishing messages at wallclock deadlines.
+        """
+        with self._timer_lock:
+            if self._timer_handle is None:
+                if self.scheduler is None:
+                    self.scheduler = WallclockScheduler.get_default()
+                self._schedule_timer()
+
+    def _stop_timer(self) -> None:
+        """
+        Stops publishing messages at wallclock deadlines.
+        """
+        with self._timer_lock:
+            if self._timer_handle is not None:
+                self.scheduler.cancel(self._timer_handle)
+                self._timer_handle = None
+
+    def _schedule_timer(self) -> None:
+        """
+        Schedules the timer for the next deadline (requires the timer lock).
+        """
+        delay = self._next_time_status - self.app.simulator.get_wallclock_time()
+        self._timer_handle = self.scheduler.schedule(
+            delay.total_seconds(), self._on_timer
+        )
+
+    def _on_timer(self) -> None:
+        """
+        Publishes messages for the passed deadlines according to the missed deadline
+        policy and schedules the next deadline.
+        """
+        with self._timer_lock:
+            if self._timer_handle is None:
+                return
+            time_status_step = self._get_time_status_step()
+            wallclock_time = self.app.simulator.get_wallclock_time()
+            due = 0
+            if self._next_time_status <= wallclock_time:
+                due = 1 + (wallclock_time - self._next_time_status) // time_status_step
+            if self.missed_policy == "burst":
+                published = due
+            elif self.missed_policy == "coalesce":
+                published = min(due, 1)
+            else:
+                published = 1 if due == 1 else 0
+            self.missed += due - published
+            self._next_time_status += due * time_status_step
+        for _ in range(published):
+            self.publish_message()
+        with self._timer_lock:
+            if self._timer_handle is not None:
+                self._schedule_timer()
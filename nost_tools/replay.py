@@ -0,0 +1,304 @@
+"""
+Provides a broker-free replay of messages recorded by the logger application.
+"""
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Iterator, List
+
+import pika
+
+from .log_store import (
+    _NO_TIME,
+    LogRecord,
+    LogStoreReader,
+    _from_us,
+    _get_scenario_us,
+    _to_us,
+)
+
+if TYPE_CHECKING:
+    from .application import Application
+
+logger = logging.getLogger(__name__)
+
+
+def _matches_topic_pattern(words: List[str], pattern: List[str]) -> bool:
+    """
+    Checks if the words of a routing key match the words of a pattern with * (exactly one
+    word) and # (zero or more words) wildcards.
+
+    Args:
+        words (list(str)): words of the routing key
+        pattern (list(str)): words of the pattern
+
+    Returns:
+        bool: True, if the routing key matches the pattern
+    """
+    if not pattern:
+        return not words
+    if pattern[0] == "#":
+        return any(
+            _matches_topic_pattern(words[i:], pattern[1:])
+            for i in range(len(words) + 1)
+        )
+    return (
+        bool(words)
+        and pattern[0] in ("*", words[0])
+        and _matches_topic_pattern(words[1:], pattern[1:])
+    )
+
+
+class LogReplayer(object):
+    """
+    Replays messages recorded by the logger application, in their original order, without
+    requiring the recording applications (or, for in-process delivery, a broker).
+
+    Messages are read from any log format written by :obj:`LoggerApplication`: a CSV log
+    file (`.log`), a columnar log file (`.parquet` or `.arrows`), or a segmented log store
+    directory. Messages are paced by their recorded wallclock receipt times divided by the
+    speed factor, or replayed as fast as possible if the speed is None. Replay can be limited
+    to routing key patterns (with * and # wildcards) and seek to a range of scenario times,
+    where the scenario time of a message is the `properties.simTime` of the latest status
+    message recorded before it.
+
+    Attributes:
+        name (str): path of the log file or log store directory
+        speed (float): replay speed factor relative to the recorded pace, or None for as
+            fast as possible
+        topics (list(str)): routing key patterns to replay, or None for all messages
+        start (:obj:`datetime`): earliest scenario time to replay, inclusive, or None
+        end (:obj:`datetime`): latest scenario time to replay, exclusive, or None
+        metrics (dict): number of replayed messages and maximum lag (s) behind the pace
+    """
+
+    def __init__(
+        self,
+        name: str,
+        speed: float = 1.0,
+        topics: List[str] = None,
+        start: datetime = None,
+        end: datetime = None,
+    ):
+        """
+        Initializes a new log replayer.
+
+        Args:
+            name (str): path of the log file or log store directory
+            speed (float): replay speed factor relative to the recorded pace, or None for
+                as fast as possible (default: 1.0)
+            topics (list(str)): routing key patterns to replay, with * and # wildcards
+                (default: None, for all messages)
+            start (:obj:`datetime`): earliest scenario time to replay, inclusive
+                (default: None, for no limit)
+            end (:obj:`datetime`): latest scenario time to replay, exclusive
+                (default: None, for no limit)
+        """
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Invalid replay speed: {speed}")
+        self.name = name
+        self.speed = speed
+        self.topics = None if topics is None else list(topics)
+        self.start = start
+        self.end = end
+        self.metrics = {"replayed": 0, "max_lag": 0.0}
+        self._patterns = (
+            None if topics is None else [topic.split(".") for topic in topics]
+        )
+        self._topic_matches = {}
+        self._stop = threading.Event()
+
+    def _matches_topic(self, routing_key: str) -> bool:
+        """
+        Checks if a routing key matches the replayed topics.
+        """
+        if self._patterns is None:
+            return True
+        if routing_key not in self._topic_matches:
+            words = routing_key.split(".")
+            self._topic_matches[routing_key] = any(
+                _matches_topic_pattern(words, pattern) for pattern in self._patterns
+            )
+        return self._topic_matches[routing_key]
+
+    def _matches_time(self, scenario_time: datetime) -> bool:
+        """
+        Checks if a scenario time is within the replayed range.
+        """
+        if self.start is None and self.end is None:
+            return True
+        if scenario_time is None:
+            return False
+        return (self.start is None or scenario_time >= self.start) and (
+            self.end is None or scenario_time < self.end
+        )
+
+    def _read_csv(self) -> Iterator[LogRecord]:
+        """
+        Reads the messages of a CSV log file.
+        """
+        scenario_us = _NO_TIME
+        with open(self.name, "r", newline="") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if not line or line == "Timestamp,Topic,Payload":
+                    continue
+                timestamp, topic, payload = line.split(",", 2)
+                body = payload.encode("utf-8")
+                scenario_us = _get_scenario_us(body, scenario_us)
+                yield LogRecord(
+                    _from_us(_to_us(datetime.fromisoformat(timestamp))),
+                    _from_us(scenario_us),
+                    topic,
+                    body,
+                )
+
+    def _read_columnar(self) -> Iterator[LogRecord]:
+        """
+        Reads the messages of a columnar log file, one record batch at a time.
+        """
+        import pyarrow as pa
+
+        scenario_us = _NO_TIME
+        columns = ["timestamp", "topic", "payload"]
+        with pa.OSFile(self.name, "rb") as f:
+            if self.name.endswith(".parquet"):
+                import pyarrow.parquet as pq
+
+                batches = pq.ParquetFile(f).iter_batches(columns=columns)
+            else:
+                batches = pa.ipc.open_stream(f)
+            for batch in batches:
+                for timestamp, topic, payload in zip(
+                    *(batch.column(column).to_pylist() for column in columns)
+                ):
+                    body = payload.encode("utf-8")
+                    scenario_us = _get_scenario_us(body, scenario_us)
+                    yield LogRecord(timestamp, _from_us(scenario_us), topic, body)
+
+    def records(self) -> Iterator[LogRecord]:
+        """
+        Reads the messages to replay, in their recorded order.
+
+        Returns:
+            Iterator(:obj:`LogRecord`): messages matching the replayed topics and scenario times
+        """
+        if os.path.isdir(self.name):
+            reader = LogStoreReader(self.name)
+            topics = None
+            if self._patterns is not None:
+                topics = [
+                    topic for topic in reader.get_topics() if self._matches_topic(topic)
+                ]
+            # the segment indexes select matching topics and scenario times
+            yield from reader.query(
+                self.start,
+                self.end,
+                topics,
+                scenario=True,
+            )
+            return
+        if self.name.endswith((".parquet", ".arrows")):
+            records = self._read_columnar()
+        else:
+            records = self._read_csv()
+        for record in records:
+            if self._matches_topic(record.topic) and self._matches_time(
+                record.scenario_time
+            ):
+                yield record
+
+    def replay(self, publish: Callable[[str, bytes], None]) -> int:
+        """
+        Replays messages to a publishing function, pacing them by their recorded
+        wallclock times and the speed factor. Blocks until all messages are replayed
+        or the replay is stopped.
+
+        Args:
+            publish (Callable): function called with the routing key and body of each message
+
+        Returns:
+            int: number of replayed messages
+        """
+        self._stop.clear()
+        count = 0
+        first = None
+        started = time.monotonic()
+        for record in self.records():
+            if self._stop.is_set():
+                break
+            if self.speed is not None:
+                if first is None:
+                    first = record.wallclock_time
+                due = (record.wallclock_time - first).total_seconds() / self.speed
+                delay = due - (time.monotonic() - started)
+                if delay > 0 and self._stop.wait(delay):
+                    break
+                self.metrics["max_lag"] = max(self.metrics["max_lag"], -delay)
+            publish(record.topic, record.payload)
+            count += 1
+            self.metrics["replayed"] += 1
+        logger.info(f"Replayed {count} messages from {self.name}.")
+        return count
+
+    def stop(self) -> None:
+        """
+        Stops a running replay.
+        """
+        self._stop.set()
+
+    @staticmethod
+    def _get_routing_key(app: "Application", routing_key: str) -> str:
+        """
+        Replaces the prefix of a recorded routing key with the prefix of an application.
+        """
+        return f"{app.prefix}.{routing_key.split('.', 1)[-1]}"
+
+    def replay_to_broker(self, app: "Application") -> int:
+        """
+        Replays messages by publishing them to the broker with a started application,
+        under the application's prefix (exchange). Messages are published from the I/O
+        thread of the application.
+
+        Args:
+            app (:obj:`Application`): started application used to publish messages
+
+        Returns:
+            int: number of replayed messages
+        """
+
+        def publish(routing_key, body):
+            app.connection.add_callback_threadsafe(
+                lambda: app._publish(self._get_routing_key(app, routing_key), body)
+            )
+
+        return self.replay(publish)
+
+    def replay_to_application(self, app: "Application") -> int:
+        """
+        Replays messages in process, without a broker, by calling the message callbacks
+        the application registered for their routing keys (under the application's prefix).
+
+        Args:
+            app (:obj:`Application`): application receiving the messages
+
+        Returns:
+            int: number of replayed messages
+        """
+
+        def publish(routing_key, body):
+            routing_key = self._get_routing_key(app, routing_key)
+            method = pika.spec.Basic.Deliver(
+                delivery_tag=0, exchange=app.prefix, routing_key=routing_key
+            )
+            properties = pika.BasicProperties()
+            for callback in app._get_matching_callbacks(routing_key):
+                try:
+                    callback(None, method, properties, body)
+                except Exception as e:
+                    logger.error(f"Error processing replayed message: {e}")
+
+        return self.replay(publish)
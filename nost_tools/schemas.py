@@ -3,9 +3,10 @@ Provides object models for common data structures.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
+from pydantic_core import to_json
 
 from .simulator import Mode
 
@@ -64,6 +65,10 @@ class StartTaskingParameters(BaseModel):
         description="Scenario seconds per wallclock second.",
         alias="timeScalingFactor",
     )
+    lockstep: bool = Field(
+        False,
+        description="True, if scenario time advances in lockstep with step commands instead of wallclock pacing.",
+    )
 
 
 class StartCommand(BaseModel):
@@ -132,6 +137,82 @@ class UpdateCommand(BaseModel):
     )
 
 
+class StepTaskingParameters(BaseModel):
+    """
+    Tasking parameters to advance a lockstep execution.
+    """
+
+    sim_time: datetime = Field(
+        ...,
+        description="Scenario time to which applications may advance.",
+        alias="simTime",
+    )
+
+
+class StepCommand(BaseModel):
+    """
+    Command message to advance a lockstep execution.
+    """
+
+    tasking_parameters: StepTaskingParameters = Field(
+        ...,
+        description="Tasking parameters for the step command.",
+        alias="taskingParameters",
+    )
+
+
+class CheckpointTaskingParameters(BaseModel):
+    """
+    Tasking parameters to checkpoint an execution.
+    """
+
+    path: str = Field(
+        ...,
+        description="Path of the checkpoint file, in which {app_name} is replaced by the application name.",
+    )
+
+
+class CheckpointCommand(BaseModel):
+    """
+    Command message to checkpoint an execution.
+    """
+
+    tasking_parameters: CheckpointTaskingParameters = Field(
+        ...,
+        description="Tasking parameters for the checkpoint command.",
+        alias="taskingParameters",
+    )
+
+
+class FastForwardTaskingParameters(BaseModel):
+    """
+    Tasking parameters to fast-forward an execution.
+    """
+
+    sim_fast_forward_time: Optional[datetime] = Field(
+        None,
+        description="Scenario time up to which to execute without wallclock pacing (None to stop fast-forwarding).",
+        alias="simFastForwardTime",
+    )
+    resume_time: Optional[datetime] = Field(
+        None,
+        description="Wallclock time at which paced execution resumes (None to resume when the fast-forward time is reached).",
+        alias="resumeTime",
+    )
+
+
+class FastForwardCommand(BaseModel):
+    """
+    Command message to fast-forward an execution.
+    """
+
+    tasking_parameters: FastForwardTaskingParameters = Field(
+        ...,
+        description="Tasking parameters for the fast-forward command.",
+        alias="taskingParameters",
+    )
+
+
 class TimeStatusProperties(BaseModel):
     """
     Properties to report time status.
@@ -207,6 +288,165 @@ class ReadyStatus(BaseModel):
     )
 
 
+class StepStatusProperties(BaseModel):
+    """
+    Properties to report step status.
+    """
+
+    sim_time: datetime = Field(
+        ..., description="Scenario time of the completed time step.", alias="simTime"
+    )
+
+
+class StepStatus(BaseModel):
+    """
+    Message to acknowledge a completed time step in a lockstep execution.
+    """
+
+    name: str = Field(
+        ..., description="Name of the application providing a step status."
+    )
+    description: Optional[str] = Field(
+        None, description="Description of the application providing a step status."
+    )
+    properties: StepStatusProperties = Field(
+        ..., description="Properties for the step status."
+    )
+
+
+class ResultStatusProperties(BaseModel):
+    """
+    Properties to report the results of a completed execution.
+    """
+
+    start_time: datetime = Field(
+        ..., description="Wallclock time at which execution started.", alias="startTime"
+    )
+    stop_time: datetime = Field(
+        ..., description="Wallclock time at which execution stopped.", alias="stopTime"
+    )
+    sim_start_time: datetime = Field(
+        ...,
+        description="Scenario time at which execution started.",
+        alias="simStartTime",
+    )
+    sim_stop_time: datetime = Field(
+        ...,
+        description="Scenario time at which execution stopped.",
+        alias="simStopTime",
+    )
+    results: Dict[str, Any] = Field(
+        {}, description="Application-specific results of the execution."
+    )
+    fast_forward_overrun: Optional[timedelta] = Field(
+        None,
+        description="Wallclock duration by which fast-forwarding overran the resume time.",
+        alias="fastForwardOverrun",
+    )
+
+
+class ResultStatus(BaseModel):
+    """
+    Message to report the results of a completed execution.
+    """
+
+    name: str = Field(
+        ..., description="Name of the application providing a result status."
+    )
+    description: Optional[str] = Field(
+        None, description="Description of the application providing a result status."
+    )
+    properties: ResultStatusProperties = Field(
+        ..., description="Properties for the result status."
+    )
+
+
+def _status_dict(name: str, description: Optional[str], properties: dict) -> dict:
+    """
+    Builds the serializable content of a status message.
+    """
+    if description is None:
+        return {"name": name, "properties": properties}
+    return {"name": name, "description": description, "properties": properties}
+
+
+def encode_time_status(
+    name: str, description: Optional[str], sim_time: datetime, time: datetime
+) -> str:
+    """
+    Encodes a time status message using the pydantic-core serializer without model
+    validation. Equivalent to `TimeStatus(...).model_dump_json(by_alias=True, exclude_none=True)`.
+
+    Args:
+        name (str): name of the application providing a time status
+        description (str): description of the application (optional)
+        sim_time (:obj:`datetime`): current scenario time
+        time (:obj:`datetime`): current wallclock time
+
+    Returns:
+        str: JSON-encoded time status message
+    """
+    return to_json(
+        _status_dict(name, description, {"simTime": sim_time, "time": time})
+    ).decode("utf-8")
+
+
+def encode_mode_status(name: str, description: Optional[str], mode: Mode) -> str:
+    """
+    Encodes a mode status message using the pydantic-core serializer without model
+    validation. Equivalent to `ModeStatus(...).model_dump_json(by_alias=True, exclude_none=True)`.
+
+    Args:
+        name (str): name of the application providing a mode status
+        description (str): description of the application (optional)
+        mode (:obj:`Mode`): current execution mode
+
+    Returns:
+        str: JSON-encoded mode status message
+    """
+    return to_json(_status_dict(name, description, {"mode": Mode(mode).value})).decode(
+        "utf-8"
+    )
+
+
+def encode_ready_status(
+    name: str, description: Optional[str], ready: bool = True
+) -> str:
+    """
+    Encodes a ready status message using the pydantic-core serializer without model
+    validation. Equivalent to `ReadyStatus(...).model_dump_json(by_alias=True, exclude_none=True)`.
+
+    Args:
+        name (str): name of the application providing a ready status
+        description (str): description of the application (optional)
+        ready (bool): True, if this application is ready (default: True)
+
+    Returns:
+        str: JSON-encoded ready status message
+    """
+    return to_json(_status_dict(name, description, {"ready": ready})).decode("utf-8")
+
+
+def encode_step_status(
+    name: str, description: Optional[str], sim_time: datetime
+) -> str:
+    """
+    Encodes a step status message using the pydantic-core serializer without model
+    validation. Equivalent to `StepStatus(...).model_dump_json(by_alias=True, exclude_none=True)`.
+
+    Args:
+        name (str): name of the application providing a step status
+        description (str): description of the application (optional)
+        sim_time (:obj:`datetime`): scenario time of the completed time step
+
+    Returns:
+        str: JSON-encoded step status message
+    """
+    return to_json(_status_dict(name, description, {"simTime": sim_time})).decode(
+        "utf-8"
+    )
+
+
 class InfoConfig(BaseModel):
     title: Optional[str] = Field(None, description="Title of the simulation.")
     version: Optional[str] = Field(None, description="Version of the simulation.")
@@ -221,7 +461,24 @@ class RabbitMQConfig(BaseModel):
     )
     tls: bool = Field(False, description="RabbitMQ TLS/SSL.")
     reconnect_delay: int = Field(10, description="Reconnection delay, in seconds.")
-    queue_max_size: int = Field(5000, description="Maximum size of the RabbitMQ queue.")
+    queue_max_size: int = Field(
+        5000,
+        description="Maximum number of outbound messages buffered while the connection is down or blocked.",
+    )
+    outbound_buffer_policy: Literal[
+        "drop_newest", "drop_oldest", "drop_priority", "block"
+    ] = Field(
+        "drop_newest",
+        description="Policy when the outbound buffer is full: drop the new message, drop the oldest message, drop the lowest-priority message, or block the caller.",
+    )
+    outbound_buffer_timeout: float = Field(
+        10,
+        description="Maximum time to block the caller when the outbound buffer is full, in seconds.",
+    )
+    topic_priorities: Dict[str, int] = Field(
+        None,
+        description="Priorities of application topics (higher is kept longer) for the drop_priority policy.",
+    )
     # BasicProperties
     content_type: str = Field(
         None,
@@ -253,6 +510,19 @@ class RabbitMQConfig(BaseModel):
     user_id: str = Field(None, description="RabbitMQ user ID for authentication.")
     app_id: str = Field(None, description="RabbitMQ application ID for tracking.")
     cluster_id: str = Field(None, description="RabbitMQ cluster ID for tracking.")
+    message_envelope: bool = Field(
+        False,
+        description="Add publisher ID, sequence number, and publish time headers to published messages.",
+    )
+    topology_channels: int = Field(
+        4,
+        ge=1,
+        description="Maximum number of channels used to declare or delete queues and bindings in parallel.",
+    )
+    persist_topology: bool = Field(
+        False,
+        description="Keep queues and bindings in place at shut down and skip their redeclaration on the next start up.",
+    )
     # ConnectionParameters
     host: str = Field("localhost", description="RabbitMQ host.")
     port: int = Field(5672, description="RabbitMQ port.")
@@ -337,6 +607,50 @@ class TimeScaleUpdateSchema(BaseModel):
     )
 
 
+class AdaptiveTimeScaleConfig(BaseModel):
+    """
+    Configuration for adaptive time scale control based on application lag.
+    """
+
+    min_time_scale_factor: float = Field(
+        1.0, gt=0, description="Minimum time scale factor."
+    )
+    max_time_scale_factor: float = Field(
+        10.0, gt=0, description="Maximum time scale factor."
+    )
+    lag_high: timedelta = Field(
+        timedelta(seconds=1),
+        description="Wallclock lag behind schedule above which the time scale factor is decreased.",
+    )
+    lag_low: timedelta = Field(
+        timedelta(milliseconds=100),
+        description="Wallclock lag behind schedule below which the time scale factor may be increased.",
+    )
+    decrease_factor: float = Field(
+        0.5,
+        gt=0,
+        lt=1,
+        description="Multiplier applied to decrease the time scale factor.",
+    )
+    increase_factor: float = Field(
+        1.25, gt=1, description="Multiplier applied to increase the time scale factor."
+    )
+    settle_time: timedelta = Field(
+        timedelta(seconds=10),
+        description="Minimum wallclock duration after an update, and with all lags below lag_low, before increasing the time scale factor.",
+    )
+
+    @model_validator(mode="after")
+    def validate_bounds(self):
+        if self.min_time_scale_factor > self.max_time_scale_factor:
+            raise ValueError(
+                "min_time_scale_factor must not exceed max_time_scale_factor."
+            )
+        if self.lag_low >= self.lag_high:
+            raise ValueError("lag_low must be less than lag_high.")
+        return self
+
+
 class LoggingConfig(BaseModel):
     """
     Configuration for logging.
@@ -379,6 +693,14 @@ class ManagerConfig(LoggingConfig):
     time_scale_updates: List[TimeScaleUpdateSchema] = Field(
         default_factory=list, description="List of time scale updates."
     )
+    adaptive_time_scale: Optional[AdaptiveTimeScaleConfig] = Field(
+        None,
+        description="Adaptive time scale control based on application time status lag (replaces time_scale_updates).",
+    )
+    federation_summary_step: Optional[timedelta] = Field(
+        None,
+        description="Wallclock duration between federation summary messages (status.federation) published by the manager.",
+    )
     time_status_step: Optional[timedelta] = Field(None, description="Time status step.")
     time_status_init: Optional[datetime] = Field(None, description="Time status init.")
     command_lead: timedelta = Field(
@@ -389,6 +711,22 @@ class ManagerConfig(LoggingConfig):
     )
     init_retry_delay_s: int = Field(5, description="Initial retry delay in seconds.")
     init_max_retry: int = Field(5, description="Initial maximum retry attempts.")
+    lockstep: bool = Field(
+        False,
+        description="If True, scenario time advances as soon as all required applications acknowledge each time step instead of following the wallclock time scale factor.",
+    )
+    step_timeout: timedelta = Field(
+        timedelta(seconds=10),
+        description="Wallclock duration to wait for step acknowledgements in lockstep execution before re-publishing the step command.",
+    )
+    fast_forward_time: Optional[datetime] = Field(
+        None,
+        description="Scenario time up to which execution is fast-forwarded without wallclock pacing (ignored in lockstep execution).",
+    )
+    fast_forward_lead: timedelta = Field(
+        timedelta(seconds=5),
+        description="Wallclock duration after the start time allotted to fast-forwarding, after which paced execution resumes.",
+    )
     set_offset: bool = Field(True, description="Set offset.")
     shut_down_when_terminated: bool = Field(
         False, description="Shut down when terminated."
@@ -445,6 +783,14 @@ class ManagedApplicationConfig(LoggingConfig):
         False, description="Shut down when terminated."
     )
     manager_app_name: str = Field("manager", description="Manager application name.")
+    inbox: bool = Field(
+        False,
+        description="If True, message callbacks are deferred to the simulator thread and delivered between time steps.",
+    )
+    inbox_order_field: Optional[str] = Field(
+        None,
+        description="Dot-separated path of a scenario timestamp field in the message payload used to order deferred messages.",
+    )
     is_scenario_time_step: bool = Field(
         True,
         description="If True, time_step is in scenario time and won't be scaled. If False, time_step is in wallclock time and will be scaled by the time scale factor.",
@@ -503,6 +849,73 @@ class LoggerApplicationConfig(BaseModel):
     manager_app_name: Optional[str] = Field(
         "manager", description="Manager application name."
     )
+    write_queue_size: int = Field(
+        10000,
+        ge=1,
+        description="Maximum number of received messages waiting to be written to the log file.",
+    )
+    overflow_policy: Literal["block", "drop"] = Field(
+        "block",
+        description="Policy when the write queue is full: block the consumer (up to one second before dropping), or drop the message.",
+    )
+    flush_size: int = Field(
+        65536,
+        ge=1,
+        description="Amount of buffered data, in characters, after which the log file is flushed.",
+    )
+    flush_interval: float = Field(
+        1.0,
+        gt=0,
+        description="Maximum time, in seconds, that written data stays buffered before the log file is flushed.",
+    )
+    fsync_policy: Literal["never", "flush", "interval", "close"] = Field(
+        "close",
+        description="When flushed data is synchronized to disk: never, on every flush, at most every fsync_interval seconds, or when the log file is closed.",
+    )
+    fsync_interval: float = Field(
+        10.0,
+        gt=0,
+        description="Interval, in seconds, between disk synchronizations with the interval fsync policy.",
+    )
+    log_format: Literal["csv", "parquet", "arrow", "segmented"] = Field(
+        "csv",
+        description="Log file format: CSV text, Parquet, Arrow IPC stream, or a directory of time-indexed segments. Columnar formats require pyarrow.",
+    )
+    row_group_size: int = Field(
+        10000,
+        ge=1,
+        description="Maximum number of messages per row group of a columnar log file.",
+    )
+    row_group_interval: float = Field(
+        60.0,
+        gt=0,
+        description="Time, in seconds, after which received messages are written as a row group of a columnar log file.",
+    )
+    flatten_status_fields: bool = Field(
+        False,
+        description="Flatten the name, scenario time, wallclock time, and mode of status messages into typed columns of a columnar log file.",
+    )
+    flatten_fields: Optional[
+        Dict[str, Literal["string", "int", "float", "bool", "timestamp"]]
+    ] = Field(
+        None,
+        description="Types of payload fields flattened into columns of a columnar log file, keyed by dotted field path.",
+    )
+    segment_size: int = Field(
+        64 * 1024 * 1024,
+        ge=1,
+        description="Size, in bytes, after which a segment of a segmented log is rolled.",
+    )
+    segment_interval: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Time, in seconds, after which a segment of a segmented log is rolled.",
+    )
+    index_interval: int = Field(
+        1000,
+        ge=1,
+        description="Number of messages per block of the sparse time index of a segmented log.",
+    )
 
 
 class ApplicationConfig(BaseModel):
@@ -540,6 +953,22 @@ class ExecConfig(BaseModel):
     application: Optional[ApplicationConfig] = Field(
         None, description="Application configuration."
     )
+    sweep: List[ManagerConfig] = Field(
+        default_factory=list,
+        description="Test plans executed back-to-back by the manager. Each entry overrides fields of the manager configuration.",
+    )
+
+    @model_validator(mode="before")
+    def merge_sweep(cls, values):
+        if isinstance(values, dict) and values.get("sweep"):
+            manager = values.get("manager") or {}
+            if isinstance(manager, dict):
+                values = dict(values)
+                values["sweep"] = [
+                    {**manager, **run} if isinstance(run, dict) else run
+                    for run in values["sweep"]
+                ]
+        return values
 
 
 class Config(BaseModel):
@@ -548,6 +977,23 @@ class Config(BaseModel):
     execution: ExecConfig = Field(..., description="Applications configuration.")
 
 
+class RateLimitConfig(BaseModel):
+    """
+    Token bucket rate limit for messages published to a channel.
+    """
+
+    rate: float = Field(
+        ..., gt=0, description="Sustained message rate, in messages per second."
+    )
+    burst: int = Field(
+        1, ge=1, description="Maximum number of messages published in a burst."
+    )
+    policy: Literal["drop", "coalesce"] = Field(
+        "drop",
+        description="Policy for messages exceeding the rate limit: drop the message, or coalesce to the latest message and publish it when allowed.",
+    )
+
+
 class ExchangeConfig(BaseModel):
     name: str
     type: str = "topic"
@@ -583,6 +1029,10 @@ class SimulationConfig(BaseModel):
     predefined_exchanges_queues: bool = Field(
         False, description="Predefined exchanges and queues."
     )
+    rate_limits: Dict[str, RateLimitConfig] = Field(
+        default_factory=dict,
+        description="Publish rate limits, keyed by application name and topic (<app>.<topic>).",
+    )
 
 
 class RuntimeConfig(BaseModel):
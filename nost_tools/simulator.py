@@ -3,10 +3,11 @@ Provides classes to execute a simulation.
 """
 
 import logging
+import os
 import time
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import List, Type
+from typing import Callable, List, Optional, Type
 
 from .entity import Entity
 from .observer import Observable
@@ -46,10 +47,12 @@ class Simulator(Observable):
      * `mode`: current execution mode
      * `duration`: scenario execution duration
      * `time_step`: scenario time step duration
+     * `fast_forward`: scenario time up to which execution is fast-forwarded (None when paced)
     """
 
     PROPERTY_MODE = "mode"
     PROPERTY_TIME = "time"
+    PROPERTY_FAST_FORWARD = "fast_forward"
 
     def __init__(self, wallclock_offset: timedelta = timedelta()):
         """
@@ -81,6 +84,19 @@ class Simulator(Observable):
         self._time_scale_change_time = None
         # relationship between the wallclock time and simulation time
         self._time_scale_factor = self._next_time_scale_factor = 1
+        # function gating each time step in lockstep execution (replaces wallclock pacing)
+        self._step_barrier = None
+        # path of a checkpoint requested for the next time step boundary
+        self._checkpoint_request = None
+        # directory and scenario interval of periodic checkpoints; next checkpoint time
+        self._checkpoint_dir = self._checkpoint_interval = None
+        self._next_checkpoint_time = None
+        # scenario time up to which time steps are not paced by the wallclock
+        self._fast_forward_time = None
+        # wallclock time at which paced execution resumes after fast-forwarding
+        self._fast_forward_epoch = None
+        # wallclock duration by which fast-forwarding overran the resume time
+        self._fast_forward_overrun = None
 
     def add_entity(self, entity: Entity) -> None:
         """
@@ -229,6 +245,8 @@ class Simulator(Observable):
             f"Executing simulator for {duration} ({time_step} steps), starting at {self._wallclock_epoch}."
         )
         self._wait_for_wallclock_epoch()
+        if self._checkpoint_interval is not None:
+            self._next_checkpoint_time = self._time + self._checkpoint_interval
         self._set_mode(Mode.EXECUTING)
 
         logger.info("Starting main simulation loop.")
@@ -292,16 +310,35 @@ class Simulator(Observable):
                 self._time = self._next_time
                 logger.debug(f"Updated time {self._time}.")
                 self.notify_observers(self.PROPERTY_TIME, prev_time, self._time)
+            # resume paced execution after fast-forwarding, if needed
+            if (
+                self._fast_forward_time is not None
+                and self._time >= self._fast_forward_time
+            ):
+                self._resume_from_fast_forward()
+            self._save_pending_checkpoints()
             logger.debug(f"Simulation advanced to time {self.get_time()}.")
 
         logger.info("Simulation complete; terminating.")
+        if self._fast_forward_time is not None:
+            self.set_fast_forward(None)
         self._set_mode(Mode.TERMINATING)
         self._set_mode(Mode.TERMINATED)
 
     def _wait_for_tock(self) -> None:
         """
-        Waits until the wallclock time matches the next time step interval.
+        Waits until the wallclock time matches the next time step interval or, if a step barrier
+        is set, until the step barrier allows advancing to the next time. Does not wait while
+        fast-forwarding.
         """
+        if self._step_barrier is not None:
+            while self._mode == Mode.EXECUTING and not self._step_barrier(
+                self._next_time
+            ):
+                pass
+            return
+        if self._fast_forward_time is not None and self._time < self._fast_forward_time:
+            return
         while (
             self._mode == Mode.EXECUTING
             and self.get_wallclock_time_at_simulation_time(self._next_time)
@@ -475,6 +512,106 @@ class Simulator(Observable):
         else:
             self._time_scale_change_time = simulation_epoch
 
+    def get_step_barrier(self) -> Optional[Callable[[datetime], bool]]:
+        """
+        Gets the step barrier used for lockstep execution.
+
+        Returns:
+            Callable: current step barrier, or None if execution is paced by the wallclock
+        """
+        return self._step_barrier
+
+    def set_step_barrier(self, step_barrier: Callable[[datetime], bool] = None) -> None:
+        """
+        Sets a step barrier to advance in lockstep instead of pacing time steps by the wallclock.
+        The step barrier is called with the next scenario time before each tock and shall return
+        True once the simulator may advance, or False after a bounded wait to be called again.
+
+        Args:
+            step_barrier (Callable): function gating each time step, or None to restore wallclock pacing
+        """
+        self._step_barrier = step_barrier
+
+    def is_fast_forwarding(self) -> bool:
+        """
+        Checks if the execution is fast-forwarded, i.e., time steps are not paced by the wallclock.
+
+        Returns:
+            bool: True, if a fast-forward time is set
+        """
+        return self._fast_forward_time is not None
+
+    def get_fast_forward_time(self) -> Optional[datetime]:
+        """
+        Gets the scenario time up to which the execution is fast-forwarded.
+
+        Returns:
+            :obj:`datetime`: fast-forward time, or None if the execution is paced by the wallclock
+        """
+        return self._fast_forward_time
+
+    def get_fast_forward_overrun(self) -> Optional[timedelta]:
+        """
+        Gets the wallclock duration by which the latest fast-forward overran its resume time.
+        An overrun execution runs without pacing until it catches up with the resume schedule.
+
+        Returns:
+            :obj:`timedelta`: overrun (zero if resumed on time), or None if no fast-forward
+                with a resume time has completed
+        """
+        return self._fast_forward_overrun
+
+    def set_fast_forward(
+        self, fast_forward_time: datetime = None, wallclock_epoch: datetime = None
+    ) -> None:
+        """
+        Sets a scenario time up to which time steps are executed as fast as possible instead of
+        being paced by the wallclock, e.g., to skip an uninteresting scenario prefix. Once the
+        scenario time reaches the fast-forward time, paced execution resumes with a new wallclock
+        epoch. Requires that the simulator is not in TERMINATING mode.
+
+        Args:
+            fast_forward_time (:obj:`datetime`): scenario time up to which to fast-forward,
+                or None to stop fast-forwarding (default: None)
+            wallclock_epoch (:obj:`datetime`): wallclock time at which paced execution resumes,
+                None uses the wallclock time when the fast-forward time is reached (default: None)
+        """
+        if self._mode == Mode.TERMINATING:
+            raise RuntimeError("Cannot set fast-forward: simulator is terminating.")
+        prev_fast_forward_time = self._fast_forward_time
+        self._fast_forward_epoch = wallclock_epoch
+        self._fast_forward_time = fast_forward_time
+        if fast_forward_time is not None:
+            self._fast_forward_overrun = None
+            logger.info(
+                f"Fast-forwarding to time {fast_forward_time} (resuming at wallclock time {wallclock_epoch})."
+            )
+        self.notify_observers(
+            self.PROPERTY_FAST_FORWARD, prev_fast_forward_time, fast_forward_time
+        )
+
+    def _resume_from_fast_forward(self) -> None:
+        """
+        Resumes paced execution from the current scenario time at the designated wallclock epoch.
+        """
+        self._simulation_epoch = self._time
+        wallclock_time = self.get_wallclock_time()
+        if self._fast_forward_epoch is None:
+            self._wallclock_epoch = wallclock_time
+        else:
+            self._wallclock_epoch = self._fast_forward_epoch
+            self._fast_forward_overrun = max(
+                timedelta(), wallclock_time - self._fast_forward_epoch
+            )
+            if self._fast_forward_overrun > timedelta():
+                logger.warning(
+                    f"Fast-forward to time {self._time} overran the resume time {self._fast_forward_epoch} by {self._fast_forward_overrun}; catching up without pacing."
+                )
+        logger.info(
+            f"Fast-forwarded to time {self._time}; resuming at wallclock time {self._wallclock_epoch}."
+        )
+        self.set_fast_forward(None)
+
     def set_end_time(self, end_time: datetime) -> None:
         """
         Sets the scenario end time. Requires that the simulator is in EXECUTING mode.
@@ -508,6 +645,15 @@ class Simulator(Observable):
             raise RuntimeError("Can only change scenario time step while executing.")
         self._next_time_step = time_step
 
+    def get_wallclock_offset(self) -> timedelta:
+        """
+        Gets the wallclock offset (difference between system clock and trusted wallclock source).
+
+        Returns:
+            :obj:`timedelta`: current wallclock offset
+        """
+        return self._wallclock_offset
+
     def set_wallclock_offset(self, wallclock_offset: timedelta) -> None:
         """
         Set the wallclock offset (difference between system clock and trusted wallclock source).
@@ -520,6 +666,169 @@ class Simulator(Observable):
             raise RuntimeError("Cannot set wallclock offset: simulator is terminating")
         self._wallclock_offset = wallclock_offset
 
+    def get_checkpoint_state(self) -> dict:
+        """
+        Gets the state of the simulator and its entities (see :obj:`Entity.get_state`).
+
+        Returns:
+            dict: checkpoint state
+        """
+        return {
+            "version": 1,
+            "init_time": self._init_time,
+            "time": self._time,
+            "duration": self._duration,
+            "time_step": self._time_step,
+            "time_scale_factor": self._time_scale_factor,
+            "wallclock_time": self.get_wallclock_time(),
+            "entities": [
+                {
+                    "type": f"{type(entity).__module__}.{type(entity).__qualname__}",
+                    "name": entity.name,
+                    "state": entity.get_state(),
+                }
+                for entity in self._entities
+            ],
+        }
+
+    def checkpoint(self, path: str) -> None:
+        """
+        Saves a checkpoint of the simulator and its entities to file. While executing,
+        the state is only consistent at time step boundaries, so this method must be called
+        by the executing thread (e.g., by an observer of the `time` property); otherwise,
+        use :obj:`request_checkpoint`.
+
+        Args:
+            path (str): path of the checkpoint file
+        """
+        from .checkpoint import save_checkpoint
+
+        save_checkpoint(path, self.get_checkpoint_state())
+        logger.info(f"Saved checkpoint at time {self._time} to {path}.")
+
+    def request_checkpoint(self, path: str) -> None:
+        """
+        Requests a checkpoint to be saved at the next time step boundary, or immediately
+        if the simulator is not executing.
+
+        Args:
+            path (str): path of the checkpoint file
+        """
+        if self._mode == Mode.EXECUTING:
+            self._checkpoint_request = path
+        else:
+            self.checkpoint(path)
+
+    def set_checkpoint_interval(
+        self, checkpoint_interval: timedelta = None, checkpoint_dir: str = "."
+    ) -> None:
+        """
+        Sets an interval of scenario time at which checkpoints are saved during execution,
+        named by their scenario time (e.g., `checkpoint_2020-01-01T08-00-00+00-00.ckpt`).
+
+        Args:
+            checkpoint_interval (:obj:`timedelta`): scenario duration between checkpoints
+                (default: None, for no periodic checkpoints)
+            checkpoint_dir (str): directory of the checkpoint files (default: ".")
+        """
+        self._checkpoint_interval = checkpoint_interval
+        self._checkpoint_dir = checkpoint_dir
+        self._next_checkpoint_time = (
+            None
+            if checkpoint_interval is None or self._mode != Mode.EXECUTING
+            else self._time + checkpoint_interval
+        )
+
+    def _save_pending_checkpoints(self) -> None:
+        """
+        Saves requested and periodic checkpoints at a time step boundary. Checkpoint
+        failures are logged and do not interrupt the execution.
+        """
+        paths = []
+        if self._checkpoint_request is not None:
+            paths.append(self._checkpoint_request)
+            self._checkpoint_request = None
+        if (
+            self._next_checkpoint_time is not None
+            and self._time >= self._next_checkpoint_time
+        ):
+            paths.append(
+                os.path.join(
+                    self._checkpoint_dir,
+                    f"checkpoint_{self._time.isoformat().replace(':', '-')}.ckpt",
+                )
+            )
+            while self._next_checkpoint_time <= self._time:
+                self._next_checkpoint_time += self._checkpoint_interval
+        for path in paths:
+            try:
+                self.checkpoint(path)
+            except Exception as e:
+                logger.error(f"Could not save checkpoint to {path}: {e}")
+
+    def restore(
+        self,
+        path: str,
+        wallclock_epoch: datetime = None,
+        time_scale_factor: float = None,
+    ) -> datetime:
+        """
+        Restores the simulator and its entities from a checkpoint, ready to resume the
+        execution at the saved scenario time. Requires that the simulator is in UNDEFINED,
+        INITIALIZED, or TERMINATED mode, and has entities of the same names and types as
+        when the checkpoint was saved.
+
+        Transitions to the INITIALIZING mode, restores the state of all entities, sets the
+        wallclock epoch (wallclock time corresponding with the saved scenario time), and
+        finally transitions to the INITIALIZED mode. A subsequent call to :obj:`execute`
+        with the original initial time and duration resumes the execution.
+
+        Args:
+            path (str): path of the checkpoint file
+            wallclock_epoch (:obj:`datetime`): wallclock time corresponding to the
+                saved scenario time, None uses the current wallclock time (default: None)
+            time_scale_factor (float): number of scenario seconds per wallclock second,
+                None uses the saved time scale factor (default: None)
+
+        Returns:
+            :obj:`datetime`: restored scenario time
+        """
+        from .checkpoint import load_checkpoint
+
+        if self._mode == Mode.INITIALIZING:
+            raise RuntimeError("Cannot restore: simulator is initializing.")
+        elif self._mode == Mode.EXECUTING:
+            raise RuntimeError("Cannot restore: simulator is executing.")
+        elif self._mode == Mode.TERMINATING:
+            raise RuntimeError("Cannot restore: simulator is terminating.")
+        state = load_checkpoint(path)
+        saved = [(entity["type"], entity["name"]) for entity in state["entities"]]
+        current = [
+            (f"{type(entity).__module__}.{type(entity).__qualname__}", entity.name)
+            for entity in self._entities
+        ]
+        if saved != current:
+            raise ValueError(
+                f"Cannot restore: checkpoint entities {saved} do not match {current}."
+            )
+        self._set_mode(Mode.INITIALIZING)
+        logger.info(f"Restoring simulator to time {state['time']} from {path}.")
+        for entity, entity_state in zip(self._entities, state["entities"]):
+            entity.set_state(entity_state["state"])
+        self._init_time = state["init_time"]
+        self._time = self._next_time = self._simulation_epoch = state["time"]
+        self._duration = self._next_duration = state["duration"]
+        self._time_step = self._next_time_step = state["time_step"]
+        if wallclock_epoch is None:
+            self._wallclock_epoch = self.get_wallclock_time()
+        else:
+            self._wallclock_epoch = wallclock_epoch
+        if time_scale_factor is None:
+            time_scale_factor = state["time_scale_factor"]
+        self._time_scale_factor = self._next_time_scale_factor = time_scale_factor
+        self._set_mode(Mode.INITIALIZED)
+        return self._time
+
     def terminate(self) -> None:
         """
         Terminates the scenario execution. Requires that the simulator is in EXECUTING mode.
@@ -0,0 +1,161 @@
+import threading
+import unittest
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from nost_tools.application import Application
+
+
+class TestApplicationStartUp(unittest.TestCase):
+    def setUp(self):
+        self.app = Application("test", setup_signal_handlers=False)
+        self.app.config = SimpleNamespace(
+            rc=SimpleNamespace(
+                wallclock_offset_properties=SimpleNamespace(ntp_host="localhost")
+            )
+        )
+
+    def test_startup_phase_timing(self):
+        self.assertEqual(self.app._run_startup_phase("phase", lambda x: x + 1, 1), 2)
+        self.assertIn("phase", self.app.get_startup_timings())
+        with self.assertRaises(ValueError):
+            self.app._run_startup_phase("failed", self._raise)
+        self.assertIn("failed", self.app.get_startup_timings())
+
+    def _raise(self):
+        raise ValueError()
+
+    def test_initial_wallclock_offset(self):
+        with mock.patch("ntplib.NTPClient") as client:
+            client.return_value.request.return_value = SimpleNamespace(offset=1.5)
+            self.app._update_initial_wallclock_offset()
+        self.assertEqual(self.app.simulator._wallclock_offset, timedelta(seconds=1.5))
+        self.assertIn("wallclock_offset", self.app.get_startup_timings())
+
+    def test_initial_wallclock_offset_failure(self):
+        with mock.patch("ntplib.NTPClient") as client:
+            client.return_value.request.side_effect = OSError("timeout")
+            with self.assertLogs("nost_tools.application", level="WARNING"):
+                self.app._update_initial_wallclock_offset()
+        self.assertEqual(self.app.simulator._wallclock_offset, timedelta(0))
+
+
+class TestApplicationTopology(unittest.TestCase):
+    def setUp(self):
+        self.app = Application("test", setup_signal_handlers=False)
+        self.app.prefix = "prefix"
+        self.app.connection = mock.MagicMock()
+        self.app.connection.ioloop.add_callback_threadsafe.side_effect = (
+            lambda callback: callback()
+        )
+        self.app.channel = mock.MagicMock(is_open=True, is_closed=False)
+        for method in ("queue_declare", "queue_bind", "queue_delete"):
+            getattr(self.app.channel, method).side_effect = (
+                lambda callback=None, **kwargs: callback(None)
+            )
+
+    def test_consume_after_declaration(self):
+        self.app.add_message_callback("app", "topic", lambda *args: None)
+        self.assertTrue(self.app.wait_for_topology(timeout=0))
+        self.app.channel.queue_declare.assert_called_once()
+        self.app.channel.queue_bind.assert_called_once_with(
+            queue="prefix.app.topic.test",
+            exchange="prefix",
+            routing_key="prefix.app.topic",
+            callback=mock.ANY,
+        )
+        self.app.channel.basic_consume.assert_called_once_with(
+            queue="prefix.app.topic.test",
+            on_message_callback=self.app._handle_message,
+            auto_ack=False,
+        )
+
+    def test_declarations_are_not_repeated(self):
+        self.app.add_message_callback("app", "topic", lambda *args: None)
+        self.app._callbacks_per_topic = {}
+        self.app.add_message_callback("app", "topic", lambda *args: None)
+        self.app.channel.queue_declare.assert_called_once()
+        self.app.channel.basic_consume.assert_called_once()
+
+    def test_delete_queues(self):
+        self.app.add_message_callback("app", "topic", lambda *args: None)
+        self.app.add_message_callback("app", "other", lambda *args: None)
+        completion_event = threading.Event()
+        self.app._delete_queues_with_callback(completion_event)
+        self.assertTrue(completion_event.is_set())
+        self.assertEqual(self.app.channel.queue_delete.call_count, 2)
+        self.assertEqual(self.app.declared_queues, set())
+
+
+class TestMessageSettlement(unittest.TestCase):
+    def setUp(self):
+        self.app = Application("test", setup_signal_handlers=False)
+        self.app.connection = mock.MagicMock()
+        self.app.channel = mock.MagicMock()
+        self.method = SimpleNamespace(routing_key="prefix.app.topic", delivery_tag=7)
+        self.properties = SimpleNamespace(headers=None)
+
+    def test_settle_on_io_loop(self):
+        self.app.settle_message(self.method, self.properties, True)
+        self.app.channel.basic_ack.assert_not_called()
+        callback = self.app.connection.ioloop.add_callback_threadsafe.call_args[0][0]
+        callback()
+        self.app.channel.basic_ack.assert_called_once_with(7, False)
+
+    def test_reject_on_failure(self):
+        self.app.connection = None
+        self.app.settle_message(self.method, self.properties, False)
+        self.app.channel.basic_reject.assert_called_once_with(
+            delivery_tag=7, requeue=True
+        )
+        self.app.channel.basic_ack.assert_not_called()
+
+
+class TestApplicationShutDown(unittest.TestCase):
+    def setUp(self):
+        self.app = Application("test", setup_signal_handlers=False)
+        self.closed = []
+
+    def test_resources_closed_in_reverse_order(self):
+        self.app.register_resource("pool", lambda: self.closed.append("pool"))
+        resource = mock.MagicMock(spec=["close"])
+        self.app.register_resource(resource, name="cache")
+        self.app.register_resource("file", lambda: self.closed.append("file"))
+        with mock.patch("nost_tools.application.os._exit") as exit:
+            self.app.shut_down()
+        exit.assert_called_once_with(0)
+        self.assertEqual(self.closed, ["file", "pool"])
+        resource.close.assert_called_once()
+        self.assertIn("resources", self.app.get_shutdown_timings())
+        self.assertIn("total", self.app.get_shutdown_timings())
+
+    def test_close_errors_do_not_stop_shutdown(self):
+        self.app.register_resource("pool", lambda: self.closed.append("pool"))
+        self.app.register_resource("broken", mock.MagicMock(side_effect=OSError()))
+        with mock.patch("nost_tools.application.os._exit"):
+            with self.assertLogs("nost_tools.application", level="WARNING"):
+                self.app.shut_down()
+        self.assertEqual(self.closed, ["pool"])
+
+    def test_unregister_resource(self):
+        resource = mock.MagicMock(spec=["shutdown"])
+        self.app.register_resource(resource)
+        self.app.unregister_resource(resource)
+        with mock.patch("nost_tools.application.os._exit"):
+            self.app.shut_down()
+        resource.shutdown.assert_not_called()
+        with self.assertRaises(ValueError):
+            self.app.register_resource(object())
+
+    def test_resources_skipped_after_deadline(self):
+        self.app.register_resource("pool", lambda: self.closed.append("pool"))
+        self.app._shutdown_deadline = 0
+        with self.assertLogs("nost_tools.application", level="WARNING"):
+            self.app._cleanup_resources()
+        self.assertEqual(self.closed, [])
+        self.assertEqual(self.app._get_shutdown_timeout(10), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,395 @@
+import json
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from nost_tools.application_utils import (
+    LatencyHistogram,
+    LockstepBarrier,
+    MessageInbox,
+    MessageTracker,
+    OutboundBuffer,
+    RateLimit,
+    TopologyPlanner,
+)
+from nost_tools.simulator import Mode, Simulator
+
+
+class NullApplication(object):
+    def __init__(self):
+        self.simulator = Simulator()
+        self.settled = []
+
+    def settle_message(self, method, properties, success):
+        self.settled.append((method.delivery_tag, success))
+
+
+class TestMessageInbox(unittest.TestCase):
+    def setUp(self):
+        self.app = NullApplication()
+        self.received = []
+
+    def callback(self, ch, method, properties, body):
+        self.received.append(json.loads(body)["id"])
+
+    def failing_callback(self, ch, method, properties, body):
+        raise ValueError("callback failed")
+
+    def put(self, inbox, message_id, sim_time=None, callback=None):
+        payload = {"id": message_id}
+        if sim_time is not None:
+            payload["properties"] = {"simTime": sim_time.isoformat()}
+        inbox.put(
+            [callback or self.callback],
+            None,
+            SimpleNamespace(routing_key="test.app.topic", delivery_tag=message_id),
+            None,
+            json.dumps(payload).encode("utf-8"),
+        )
+
+    def test_inbox_delivers_immediately_when_not_executing(self):
+        inbox = MessageInbox(self.app)
+        self.put(inbox, 1)
+        self.assertEqual(self.received, [1])
+        self.assertEqual(len(inbox), 0)
+
+    def test_inbox_defers_while_executing(self):
+        inbox = MessageInbox(self.app)
+        self.app.simulator.add_observer(inbox)
+        self.app.simulator._mode = Mode.EXECUTING
+        self.put(inbox, 1)
+        self.put(inbox, 2)
+        self.assertEqual(self.received, [])
+        self.assertEqual(len(inbox), 2)
+        init_time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.app.simulator.notify_observers(
+            Simulator.PROPERTY_TIME, init_time, init_time + timedelta(seconds=1)
+        )
+        self.assertEqual(self.received, [1, 2])
+        self.assertEqual(len(inbox), 0)
+
+    def test_inbox_orders_by_field(self):
+        inbox = MessageInbox(self.app, "properties.simTime")
+        self.app.simulator._mode = Mode.EXECUTING
+        init_time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.put(inbox, 1, init_time + timedelta(seconds=2))
+        self.put(inbox, 2, init_time + timedelta(seconds=1))
+        self.put(inbox, 3)
+        self.assertEqual(inbox.drain(), 3)
+        self.assertEqual(self.received, [3, 2, 1])
+
+    def test_inbox_settles_after_delivery(self):
+        inbox = MessageInbox(self.app)
+        self.app.simulator._mode = Mode.EXECUTING
+        self.put(inbox, 1)
+        self.put(inbox, 2, callback=self.failing_callback)
+        self.assertEqual(self.app.settled, [])
+        inbox.drain()
+        self.assertEqual(self.app.settled, [(1, True), (2, False)])
+
+
+class TestMessageTracker(unittest.TestCase):
+    def test_tracker_detects_duplicates(self):
+        tracker = MessageTracker(window_size=4)
+        self.assertFalse(tracker.is_duplicate("pub", "key", 1))
+        tracker.record("pub", "key", 1, 0, 0)
+        self.assertTrue(tracker.is_duplicate("pub", "key", 1))
+        self.assertFalse(tracker.is_duplicate("pub", "key", 2))
+        self.assertFalse(tracker.is_duplicate("pub", "other", 1))
+        tracker.record("pub", "key", 10, 0, 0)
+        # outside of the window
+        self.assertTrue(tracker.is_duplicate("pub", "key", 5))
+        self.assertEqual(tracker.get_statistics()["pub"]["duplicates"], 2)
+
+    def test_tracker_counts_gaps_and_reordering(self):
+        tracker = MessageTracker()
+        for sequence in (1, 2, 5, 4):
+            tracker.record("pub", "key", sequence, 0, 0)
+        stats = tracker.get_statistics()["pub"]
+        self.assertEqual(stats["received"], 4)
+        self.assertEqual(stats["gaps"], 1)
+        self.assertEqual(stats["reordered"], 1)
+
+    def test_tracker_late_arrival_before_first(self):
+        tracker = MessageTracker()
+        # subscribed mid-stream: an earlier message arrives after the first one seen
+        for sequence in (5, 6, 4):
+            tracker.record("pub", "key", sequence, 0, 0)
+        stats = tracker.get_statistics()["pub"]
+        self.assertEqual(stats["gaps"], 0)
+        self.assertEqual(stats["reordered"], 1)
+
+    def test_tracker_records_latency(self):
+        tracker = MessageTracker()
+        tracker.record("pub", "key", 1, 1_000_000_000, 1_003_000_000)
+        latency = tracker.get_statistics()["pub"]["latency"]
+        self.assertEqual(latency["count"], 1)
+        self.assertAlmostEqual(latency["max"], 0.003)
+
+    def test_read_envelope(self):
+        self.assertIsNone(MessageTracker.read_envelope(None))
+        self.assertEqual(
+            MessageTracker.read_envelope(
+                {
+                    MessageTracker.HEADER_PUBLISHER_ID: b"pub",
+                    MessageTracker.HEADER_SEQUENCE: 3,
+                    MessageTracker.HEADER_PUBLISHED_NS: 5,
+                }
+            ),
+            ("pub", 3, 5),
+        )
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_histogram_quantiles(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.quantile(0.5))
+        for _ in range(99):
+            histogram.record(0.0015)
+        histogram.record(0.3)
+        self.assertEqual(histogram.quantile(0.5), 0.002)
+        self.assertEqual(histogram.quantile(0.99), 0.002)
+        self.assertEqual(histogram.quantile(1.0), 0.3)
+        self.assertEqual(histogram.summary()["count"], 100)
+
+
+class TestOutboundBuffer(unittest.TestCase):
+    def test_buffer_drop_newest(self):
+        buffer = OutboundBuffer(max_size=2)
+        self.assertTrue(buffer.put(1))
+        self.assertTrue(buffer.put(2))
+        self.assertFalse(buffer.put(3))
+        self.assertEqual(buffer.pop_all(), [1, 2])
+        self.assertEqual(buffer.metrics["dropped"], 1)
+
+    def test_buffer_drop_oldest(self):
+        buffer = OutboundBuffer(max_size=2, policy="drop_oldest")
+        for item in (1, 2, 3):
+            self.assertTrue(buffer.put(item))
+        self.assertEqual(buffer.pop_all(), [2, 3])
+
+    def test_buffer_drop_priority(self):
+        buffer = OutboundBuffer(max_size=2, policy="drop_priority")
+        buffer.put("time", priority=0)
+        buffer.put("mode", priority=10)
+        self.assertTrue(buffer.put("ready", priority=10))
+        self.assertFalse(buffer.put("time", priority=0))
+        self.assertEqual(buffer.pop_all(), ["mode", "ready"])
+
+    def test_buffer_block(self):
+        buffer = OutboundBuffer(max_size=1, policy="block", timeout=0.01)
+        buffer.put(1)
+        self.assertFalse(buffer.put(2))
+        self.assertEqual(buffer.metrics["timeouts"], 1)
+        self.assertFalse(buffer.put(2, block=False))
+        timer = threading.Timer(0.05, buffer.pop_all)
+        timer.start()
+        buffer.timeout = 5
+        self.assertTrue(buffer.put(3))
+        timer.join()
+        self.assertEqual(buffer.pop_all(), [3])
+
+    def test_buffer_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            OutboundBuffer(policy="unknown")
+
+
+class TestRateLimit(unittest.TestCase):
+    def test_rate_limit_drop(self):
+        limit = RateLimit(rate=1, burst=2)
+        self.assertTrue(limit.submit("1"))
+        self.assertTrue(limit.submit("2"))
+        self.assertFalse(limit.submit("3"))
+        self.assertEqual(limit.metrics, {"sent": 2, "dropped": 1, "coalesced": 0})
+
+    def test_rate_limit_coalesce(self):
+        sent = []
+        flushed = threading.Event()
+
+        def send(payload):
+            sent.append(payload)
+            flushed.set()
+
+        limit = RateLimit(rate=20, burst=1, policy="coalesce", send=send)
+        self.assertTrue(limit.submit("1"))
+        self.assertFalse(limit.submit("2"))
+        self.assertFalse(limit.submit("3"))
+        self.assertTrue(flushed.wait(timeout=1))
+        self.assertEqual(sent, ["3"])
+        self.assertEqual(limit.metrics, {"sent": 2, "dropped": 0, "coalesced": 1})
+
+    def test_rate_limit_cancel(self):
+        limit = RateLimit(rate=0.1, policy="coalesce", send=lambda payload: None)
+        limit.submit("1")
+        limit.submit("2")
+        limit.cancel()
+        self.assertEqual(limit.metrics["dropped"], 1)
+
+
+class TestLockstepBarrier(unittest.TestCase):
+    def setUp(self):
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def test_barrier_waits_for_all_participants(self):
+        barrier = LockstepBarrier(["app1", "app2"])
+        self.assertFalse(barrier.wait(self.t0, timeout=0))
+        barrier.update("app1", self.t0)
+        self.assertEqual(barrier.get_lagging(self.t0), ["app2"])
+        barrier.update("app2", self.t0 + timedelta(seconds=1))
+        self.assertTrue(barrier.wait(self.t0, timeout=0))
+        self.assertFalse(barrier.wait(self.t0 + timedelta(seconds=1), timeout=0))
+
+    def test_barrier_ignores_unknown_and_stale_times(self):
+        barrier = LockstepBarrier(["app1"])
+        barrier.update("app2", self.t0)
+        barrier.update("app1", self.t0 + timedelta(seconds=2))
+        barrier.update("app1", self.t0 + timedelta(seconds=1))
+        self.assertTrue(barrier.wait(self.t0 + timedelta(seconds=2), timeout=0))
+
+    def test_barrier_wakes_waiter(self):
+        barrier = LockstepBarrier(["app1"])
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(barrier.wait(self.t0, timeout=5))
+        )
+        thread.start()
+        barrier.update("app1", self.t0)
+        thread.join(timeout=1)
+        self.assertEqual(result, [True])
+
+
+class RecordingChannel(object):
+    """Channel stub that records operations and defers their completion."""
+
+    def __init__(self):
+        self.operations = []
+        self.callbacks = []
+
+    def _record(self, name, callback, **kwargs):
+        self.operations.append((name, kwargs))
+        self.callbacks.append(callback)
+
+    def exchange_declare(self, callback=None, **kwargs):
+        self._record("exchange_declare", callback, **kwargs)
+
+    def queue_declare(self, callback=None, **kwargs):
+        self._record("queue_declare", callback, **kwargs)
+
+    def queue_bind(self, callback=None, **kwargs):
+        self._record("queue_bind", callback, **kwargs)
+
+    def queue_delete(self, callback=None, **kwargs):
+        self._record("queue_delete", callback, **kwargs)
+
+    def complete(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback(None)
+
+
+class TestTopologyPlanner(unittest.TestCase):
+    def setUp(self):
+        self.planner = TopologyPlanner()
+        for i in range(4):
+            self.planner.add_queue(f"prefix.app.topic{i}.app")
+            self.planner.add_binding(
+                f"prefix.app.topic{i}.app", "prefix", f"prefix.app.topic{i}"
+            )
+        self.failed = None
+
+    def _on_complete(self, failed):
+        self.failed = failed
+
+    def test_declare_in_stages_over_channels(self):
+        channels = [RecordingChannel(), RecordingChannel()]
+        self.assertEqual(self.planner.declare(channels, self._on_complete), 8)
+        # queues are declared in parallel over both channels before any binding
+        for channel in channels:
+            self.assertEqual(
+                [op for op, _ in channel.operations], ["queue_declare"] * 2
+            )
+        channels[0].complete()
+        self.assertEqual(len(channels[0].operations), 2)
+        channels[1].complete()
+        for channel in channels:
+            self.assertEqual(channel.operations[-1][0], "queue_bind")
+            channel.complete()
+        self.assertEqual(self.failed, [])
+        self.assertTrue(self.planner.is_applied("prefix.app.topic0.app"))
+        self.assertEqual(self.planner.count_pending(), 0)
+        self.assertFalse(self.planner.is_busy())
+
+    def test_applied_declarations_are_skipped(self):
+        self.planner.mark_applied(
+            [("queue", "prefix.app.topic0.app")]
+            + [("binding", "prefix.app.topic0.app", "prefix", "prefix.app.topic0")]
+        )
+        self.assertEqual(self.planner.count_pending(), 6)
+        self.planner.reset()
+        self.assertEqual(self.planner.count_pending(), 8)
+
+    def test_channel_closed_fails_outstanding_operations(self):
+        channels = [RecordingChannel(), RecordingChannel()]
+        self.planner.declare(channels, self._on_complete)
+        self.planner.on_channel_closed(channels[1])
+        channels[0].complete()
+        # remaining stages only use the open channel and skip bindings of failed queues
+        self.assertEqual(len(channels[0].operations), 4)
+        self.assertEqual(len(channels[1].operations), 2)
+        channels[0].complete()
+        self.assertEqual(len(self.failed), 4)
+        self.assertFalse(self.planner.is_applied("prefix.app.topic1.app"))
+        self.assertTrue(self.planner.is_applied("prefix.app.topic0.app"))
+
+    def test_delete_queues(self):
+        channel = RecordingChannel()
+        self.planner.declare([channel], self._on_complete)
+        channel.complete()
+        channel.complete()
+        self.planner.delete_queues([channel], self._on_complete)
+        self.assertEqual(
+            [op for op, _ in channel.operations[-4:]], ["queue_delete"] * 4
+        )
+        channel.complete()
+        self.assertEqual(self.failed, [])
+        self.assertEqual(self.planner.get_applied(), [])
+
+    def test_add_channel_configs(self):
+        planner = TopologyPlanner()
+        planner.add_channel_configs(
+            [
+                {
+                    "app": "app",
+                    "address": "prefix.app.topic",
+                    "exchange": "prefix",
+                    "durable": True,
+                    "auto_delete": False,
+                },
+                {
+                    "app": "app",
+                    "address": "prefix.app.unbound",
+                    "exchange": "default_exchange",
+                    "durable": True,
+                    "auto_delete": False,
+                },
+                {
+                    "app": "other",
+                    "address": "prefix.other.topic",
+                    "exchange": "prefix",
+                    "durable": True,
+                    "auto_delete": False,
+                },
+            ],
+            {
+                "prefix": {
+                    "name": "prefix",
+                    "type": "topic",
+                    "durable": True,
+                    "auto_delete": False,
+                }
+            },
+            "app",
+        )
+        self.assertEqual(planner.get_queues(), ["prefix.app.topic"])
+        self.assertEqual(planner.count_pending(), 3)
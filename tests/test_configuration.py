@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from nost_tools import configuration
+from nost_tools.configuration import ConnectionConfig
+
+FIRESAT_YAML = os.path.join(
+    os.path.dirname(__file__), "..", "examples", "firesat", "firesat.yaml"
+)
+SOS_YAML = os.path.join(
+    os.path.dirname(__file__), "..", "examples", "snow_observing_systems", "sos.yaml"
+)
+
+
+class TestConnectionConfigCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.yaml_file = os.path.join(self.temp_dir, "config.yaml")
+        shutil.copy(FIRESAT_YAML, self.yaml_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _load(self, use_config_cache=True, **kwargs):
+        return ConnectionConfig(
+            username="user",
+            password="password",
+            yaml_file=self.yaml_file,
+            app_name="fire",
+            use_config_cache=use_config_cache,
+            config_cache_dir=self.cache_dir,
+            **kwargs,
+        )
+
+    def test_cache_hit(self):
+        config = self._load()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        cached = self._load()
+        self.assertEqual(cached.yaml_config, config.yaml_config)
+        self.assertEqual(cached.channel_configs, config.channel_configs)
+        self.assertEqual(cached.unique_exchanges, config.unique_exchanges)
+        self.assertEqual(cached.app_specific, config.app_specific)
+        self.assertEqual(cached.rc.credentials.username, "user")
+
+    def test_cache_invalidated_on_change(self):
+        self._load()
+        with open(self.yaml_file, "a", encoding="utf-8") as f:
+            f.write("\n# modified\n")
+        self._load()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_cache_excludes_credentials(self):
+        self._load()
+        (entry,) = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, entry), "rb") as f:
+            self.assertNotIn(b"password", f.read())
+
+    def test_corrupt_cache_entry_ignored(self):
+        config = self._load()
+        (entry,) = os.listdir(self.cache_dir)
+        with open(os.path.join(self.cache_dir, entry), "wb") as f:
+            f.write(b"corrupt")
+        self.assertEqual(self._load().yaml_config, config.yaml_config)
+
+    def test_cache_disabled(self):
+        self._load(use_config_cache=False)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_cache_disabled_by_default(self):
+        ConnectionConfig(
+            username="user",
+            password="password",
+            yaml_file=self.yaml_file,
+            config_cache_dir=self.cache_dir,
+        )
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_cache_invalidated_on_schema_change(self):
+        self._load()
+        with mock.patch.object(
+            configuration, "_get_schema_fingerprint", return_value="changed"
+        ):
+            self._load()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_cache_pruned(self):
+        with mock.patch.object(configuration, "_CONFIG_CACHE_MAX_ENTRIES", 2):
+            for i in range(4):
+                with open(self.yaml_file, "a", encoding="utf-8") as f:
+                    f.write(f"\n# modified {i}\n")
+                self._load()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    @unittest.skipUnless(hasattr(os, "getuid"), "requires POSIX ownership")
+    def test_shared_cache_dir_ignored(self):
+        self._load()
+        os.chmod(self.cache_dir, 0o777)
+        with mock.patch.object(configuration.pickle, "load") as load:
+            self._load()
+        load.assert_not_called()
+
+
+class TestRateLimits(unittest.TestCase):
+    def test_rate_limit_keyed_by_address(self):
+        with open(SOS_YAML, "r", encoding="utf-8") as f:
+            channels = yaml.safe_load(f)["channels"]
+        # the component key (satellite) differs from the publishing application (constellation)
+        channels["satellite"]["location"]["rate_limit"] = {"rate": 2.0}
+        channels["satellite"]["unaddressed"] = {"rate_limit": {"rate": 1.0}}
+        config = ConnectionConfig(username="user", password="password")
+        config.yaml_config = config.yaml_config.model_copy(
+            update={"channels": channels}
+        )
+        with self.assertLogs("nost_tools.configuration", "WARNING") as logs:
+            config.get_rate_limits()
+        self.assertEqual(list(config.rate_limits), ["constellation.location"])
+        self.assertEqual(config.rate_limits["constellation.location"].rate, 2.0)
+        self.assertTrue(any("satellite.unaddressed" in line for line in logs.output))
@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+import unittest
+
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import nost_tools
+from nost_tools import Entity, Mode, Simulator
+elapsed = time.perf_counter() - start
+heavy = ["keycloak", "ntplib", "pika", "pydantic", "urllib3", "yaml"]
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+class TestImport(unittest.TestCase):
+    def test_simulation_import_is_lightweight(self):
+        # best of several runs in fresh interpreters to limit timing noise
+        results = [
+            json.loads(
+                subprocess.run(
+                    [sys.executable, "-c", IMPORT_SCRIPT],
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+            )
+            for _ in range(3)
+        ]
+        self.assertEqual(results[0]["loaded"], [])
+        self.assertLess(min(result["elapsed"] for result in results), 0.1)
+
+    def test_lazy_attributes(self):
+        import nost_tools
+
+        self.assertIs(
+            nost_tools.Manager, __import__("nost_tools.manager").manager.Manager
+        )
+        self.assertIn("ManagedApplication", dir(nost_tools))
+        with self.assertRaises(AttributeError):
+            nost_tools.DoesNotExist
+
+
+if __name__ == "__main__":
+    unittest.main()
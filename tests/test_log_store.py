@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from nost_tools.log_store import LogStoreReader, SegmentedLogSink
+
+
+class TestLogStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "store")
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.sim_t0 = datetime(2020, 1, 1, 8, tzinfo=timezone.utc)
+        # one time status per minute of scenario time, each followed by an event
+        self.records = []
+        for i in range(100):
+            self.records.append(
+                (
+                    self.t0 + timedelta(seconds=2 * i),
+                    "prefix.manager.status.time",
+                    json.dumps(
+                        {
+                            "properties": {
+                                "simTime": (
+                                    self.sim_t0 + timedelta(minutes=i)
+                                ).isoformat()
+                            }
+                        }
+                    ).encode("utf-8"),
+                )
+            )
+            self.records.append(
+                (
+                    self.t0 + timedelta(seconds=2 * i + 1),
+                    f"prefix.app.event{i % 3}",
+                    f'{{"i": {i}}}'.encode("utf-8"),
+                )
+            )
+        sink = SegmentedLogSink(self.path, segment_size=2000, index_interval=8)
+        sink.write(self.records[:50])
+        sink.write(self.records[50:])
+        sink.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_segments_and_counts(self):
+        self.assertGreater(len(os.listdir(self.path)), 2)
+        reader = LogStoreReader(self.path)
+        self.assertEqual(reader.count(), 200)
+        self.assertEqual(
+            reader.get_topics(),
+            [
+                "prefix.app.event0",
+                "prefix.app.event1",
+                "prefix.app.event2",
+                "prefix.manager.status.time",
+            ],
+        )
+        self.assertEqual(
+            reader.get_time_range(), (self.t0, self.t0 + timedelta(seconds=199))
+        )
+        records = list(reader.query())
+        self.assertEqual(len(records), 200)
+        self.assertEqual(records[1].payload, b'{"i": 0}')
+        self.assertEqual(records[1].scenario_time, self.sim_t0)
+
+    def test_wallclock_range(self):
+        reader = LogStoreReader(self.path)
+        records = list(
+            reader.query(
+                self.t0 + timedelta(seconds=10), self.t0 + timedelta(seconds=20)
+            )
+        )
+        self.assertEqual(
+            [r.wallclock_time for r in records],
+            [self.t0 + timedelta(seconds=10 + i) for i in range(10)],
+        )
+
+    def test_scenario_range_and_topic(self):
+        reader = LogStoreReader(self.path)
+        records = list(
+            reader.query(
+                self.sim_t0 + timedelta(minutes=30),
+                self.sim_t0 + timedelta(minutes=40),
+                topics=["prefix.app.event0"],
+                scenario=True,
+            )
+        )
+        self.assertEqual(
+            [json.loads(r.payload)["i"] for r in records], [30, 33, 36, 39]
+        )
+
+    def test_scenario_range_before_first_status(self):
+        path = os.path.join(self.temp_dir, "early")
+        sink = SegmentedLogSink(path)
+        # the logger starts before the first time status message
+        sink.write([self.records[1], self.records[0]])
+        sink.close()
+        reader = LogStoreReader(path)
+        self.assertEqual(
+            reader.get_time_range(scenario=True), (self.sim_t0, self.sim_t0)
+        )
+        # indexes without a lower scenario bound
+        with open(os.path.join(path, "000000.idx"), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        index["blocks"][0][3] = -(2**63)
+        with open(os.path.join(path, "000000.idx"), "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        reader = LogStoreReader(path)
+        self.assertEqual(reader.get_time_range(scenario=True), (None, self.sim_t0))
+
+    def test_rebuild_missing_index(self):
+        for name in os.listdir(self.path):
+            if name.endswith(".idx"):
+                os.remove(os.path.join(self.path, name))
+        reader = LogStoreReader(self.path)
+        self.assertEqual(reader.count(), 200)
+        self.assertEqual(
+            len(list(reader.query(topics=["prefix.manager.status.time"]))), 100
+        )
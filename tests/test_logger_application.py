@@ -0,0 +1,208 @@
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from nost_tools.application import Application
+from nost_tools.log_store import LogStoreReader
+from nost_tools.logger_application import (
+    ArrowLogSink,
+    BufferedLogWriter,
+    CsvLogSink,
+    LoggerApplication,
+)
+
+
+class BlockingSink(object):
+    def __init__(self):
+        self.records = []
+        self.release = threading.Event()
+        self.closed = False
+
+    def write(self, records):
+        self.release.wait(timeout=5)
+        self.records.extend(records)
+        return len(records)
+
+    def flush(self):
+        pass
+
+    def fsync(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class TestBufferedLogWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "test.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def test_write_and_close(self):
+        writer = BufferedLogWriter(CsvLogSink(self.path))
+        for i in range(100):
+            self.assertTrue(writer.put(("2020-01-01", "prefix.app.topic", b'{"a": 1}')))
+        self.assertTrue(writer.close(timeout=5))
+        lines = self._read().splitlines()
+        self.assertEqual(lines[0], "Timestamp,Topic,Payload")
+        self.assertEqual(lines[1], '2020-01-01,prefix.app.topic,{"a": 1}')
+        self.assertEqual(len(lines), 101)
+        self.assertEqual(writer.metrics["written"], 100)
+        self.assertEqual(writer.metrics["fsyncs"], 1)
+        self.assertFalse(writer.put(("2020-01-01", "prefix.app.topic", "late")))
+
+    def test_flush_interval(self):
+        writer = BufferedLogWriter(
+            CsvLogSink(self.path), flush_interval=0.05, fsync_policy="never"
+        )
+        writer.put(("2020-01-01", "prefix.app.topic", "payload"))
+        deadline = time.monotonic() + 5
+        while "payload" not in self._read() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertIn("payload", self._read())
+        writer.close(timeout=5)
+        self.assertEqual(writer.metrics["fsyncs"], 0)
+
+    def test_drop_when_full(self):
+        sink = BlockingSink()
+        writer = BufferedLogWriter(sink, max_queue_size=2, overflow_policy="drop")
+        results = [writer.put(i) for i in range(10)]
+        self.assertIn(False, results)
+        self.assertGreater(writer.metrics["dropped"], 0)
+        sink.release.set()
+        writer.close(timeout=5)
+        self.assertTrue(sink.closed)
+        self.assertEqual(len(sink.records) + writer.metrics["dropped"], len(results))
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            BufferedLogWriter(BlockingSink(), fsync_policy="always")
+
+
+@unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+class TestArrowLogSink(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.records = [
+            (
+                self.timestamp + timedelta(seconds=i),
+                f"prefix.app{i % 2}.status.time",
+                json.dumps(
+                    {
+                        "name": f"app{i % 2}",
+                        "properties": {
+                            "name": f"app{i % 2}",
+                            "simTime": "2020-01-01T07:20:00+00:00",
+                        },
+                    }
+                ).encode("utf-8"),
+            )
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, **kwargs):
+        path = os.path.join(self.temp_dir, name)
+        sink = ArrowLogSink(path, row_group_size=2, **kwargs)
+        sink.write(self.records)
+        sink.close()
+        return ArrowLogSink.read(path), path
+
+    def test_parquet(self):
+        import pyarrow.parquet as pq
+
+        table, path = self._write(
+            "test.parquet", flatten_fields=ArrowLogSink.STATUS_FIELDS
+        )
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(pq.ParquetFile(path).metadata.num_row_groups, 3)
+        self.assertEqual(table.column("topic")[1].as_py(), "prefix.app1.status.time")
+        self.assertEqual(table.column("timestamp")[0].as_py(), self.timestamp)
+        self.assertEqual(table.column("properties_name")[1].as_py(), "app1")
+        self.assertEqual(
+            table.column("properties_simTime")[0].as_py(),
+            datetime(2020, 1, 1, 7, 20, tzinfo=timezone.utc),
+        )
+        self.assertIsNone(table.column("properties_mode")[0].as_py())
+
+    def test_arrow_stream(self):
+        table, _ = self._write("test.arrows", log_format="arrow")
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(json.loads(table.column("payload")[0].as_py())["name"], "app0")
+
+    def test_invalid_field_type(self):
+        with self.assertRaises(ValueError):
+            ArrowLogSink(
+                os.path.join(self.temp_dir, "test.parquet"),
+                flatten_fields={"properties.name": "list"},
+            )
+
+
+class TestLoggerApplication(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with mock.patch.object(Application, "_setup_signal_handlers"):
+            self.app = LoggerApplication()
+        self.app.log_dir = self.temp_dir
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_log_message(self):
+        self.app._open_log_file()
+        path = self.app.log_file.name
+        self.app.on_log_message(
+            None, SimpleNamespace(routing_key="prefix.app.topic"), None, b"payload"
+        )
+        self.app._close_log_file()
+        self.assertIsNone(self.app.log_file)
+        self.assertEqual(self.app._resources, [])
+        with open(path) as f:
+            self.assertTrue(f.read().endswith(",prefix.app.topic,payload\n"))
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_log_message_parquet(self):
+        self.app.write_options = self.app.write_options.model_copy(
+            update={"log_format": "parquet", "flatten_status_fields": True}
+        )
+        self.app._open_log_file()
+        path = self.app.log_file.name
+        self.assertTrue(path.endswith(".parquet"))
+        self.app.on_log_message(
+            None, SimpleNamespace(routing_key="prefix.app.topic"), None, b"{}"
+        )
+        self.app._close_log_file()
+        table = ArrowLogSink.read(path)
+        self.assertEqual(table.column("topic").to_pylist(), ["prefix.app.topic"])
+        self.assertIn("properties_simTime", table.column_names)
+
+    def test_log_message_segmented(self):
+        self.app.write_options = self.app.write_options.model_copy(
+            update={"log_format": "segmented"}
+        )
+        self.app._open_log_file()
+        path = self.app._log_name
+        self.app.on_log_message(
+            None, SimpleNamespace(routing_key="prefix.app.topic"), None, b"{}"
+        )
+        self.app._close_log_file()
+        records = list(LogStoreReader(path).query(topics=["prefix.app.topic"]))
+        self.assertEqual([record.payload for record in records], [b"{}"])
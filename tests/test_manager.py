@@ -0,0 +1,439 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from nost_tools.managed_application import ManagedApplication
+from nost_tools.manager import FederationMonitor, Manager, TimeScaleController
+from nost_tools.schemas import (
+    AdaptiveTimeScaleConfig,
+    ResultStatus,
+    StepCommand,
+    encode_mode_status,
+    encode_ready_status,
+    encode_step_status,
+    encode_time_status,
+)
+from nost_tools.simulator import Mode
+
+
+class TestManagerWaits(unittest.TestCase):
+    def setUp(self):
+        self.manager = Manager(setup_signal_handlers=False)
+
+    def test_wait_for_ready_status(self):
+        self.manager.required_apps_status = {"app1": False, "app2": False}
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(
+                self.manager._wait_for(
+                    lambda: all(self.manager.required_apps_status.values()),
+                    timeout=5,
+                )
+            )
+        )
+        thread.start()
+        for app in ["app1", "app2"]:
+            self.manager.on_app_ready_status(
+                None,
+                SimpleNamespace(routing_key=f"test.{app}.status.ready"),
+                None,
+                encode_ready_status(app, None).encode("utf-8"),
+            )
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result, [True])
+
+    def test_wait_for_timeout(self):
+        self.manager.required_apps_status = {"app1": False}
+        start = time.monotonic()
+        self.assertFalse(
+            self.manager._wait_for(
+                lambda: all(self.manager.required_apps_status.values()), timeout=0.05
+            )
+        )
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_wait_for_simulator_mode(self):
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(
+                self.manager._wait_for(
+                    lambda: self.manager.simulator.get_mode() == Mode.EXECUTING,
+                    timeout=5,
+                )
+            )
+        )
+        thread.start()
+        self.manager.simulator._set_mode(Mode.EXECUTING)
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(result, [True])
+
+    def test_sleep_interrupted_by_stop(self):
+        self.manager._should_stop.set()
+        self.assertFalse(self.manager._sleep_with_heartbeat(5))
+
+
+class TestTimeScaleController(unittest.TestCase):
+    def setUp(self):
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.controller = TimeScaleController(
+            min_time_scale_factor=1,
+            max_time_scale_factor=16,
+            lag_high=timedelta(seconds=1),
+            lag_low=timedelta(milliseconds=100),
+            decrease_factor=0.5,
+            increase_factor=2,
+            settle_time=timedelta(seconds=10),
+        )
+
+    def test_decrease_on_high_lag(self):
+        self.controller.record_lag("app1", timedelta(seconds=0))
+        self.controller.record_lag("app2", timedelta(seconds=2))
+        self.assertEqual(self.controller.evaluate(8, self.t0), 4)
+        # hold after an update
+        self.controller.record_lag("app2", timedelta(seconds=2))
+        self.assertIsNone(self.controller.evaluate(4, self.t0 + timedelta(seconds=5)))
+        self.assertEqual(
+            self.controller.evaluate(4, self.t0 + timedelta(seconds=10)), 2
+        )
+
+    def test_increase_after_settle_time(self):
+        self.controller.record_lag("app1", timedelta(milliseconds=10))
+        self.assertIsNone(self.controller.evaluate(4, self.t0))
+        self.assertIsNone(self.controller.evaluate(4, self.t0 + timedelta(seconds=5)))
+        self.assertEqual(
+            self.controller.evaluate(4, self.t0 + timedelta(seconds=10)), 8
+        )
+
+    def test_hysteresis_band(self):
+        self.controller.record_lag("app1", timedelta(milliseconds=10))
+        self.assertIsNone(self.controller.evaluate(4, self.t0))
+        # a lag between lag_low and lag_high resets the settle time
+        self.controller.record_lag("app1", timedelta(milliseconds=500))
+        self.assertIsNone(self.controller.evaluate(4, self.t0 + timedelta(seconds=5)))
+        self.controller.record_lag("app1", timedelta(milliseconds=10))
+        self.assertIsNone(self.controller.evaluate(4, self.t0 + timedelta(seconds=10)))
+        self.assertEqual(
+            self.controller.evaluate(4, self.t0 + timedelta(seconds=20)), 8
+        )
+
+    def test_bounds(self):
+        self.controller.record_lag("app1", timedelta(seconds=2))
+        self.assertIsNone(self.controller.evaluate(1, self.t0))
+        self.controller.record_lag("app1", timedelta(milliseconds=500))
+        self.assertEqual(self.controller.evaluate(32, self.t0), 16)
+
+    def test_from_config(self):
+        controller = TimeScaleController.from_config(
+            AdaptiveTimeScaleConfig(max_time_scale_factor=4)
+        )
+        self.assertEqual(controller.max_time_scale_factor, 4)
+        self.assertEqual(controller.lag_high, timedelta(seconds=1))
+        with self.assertRaises(ValueError):
+            AdaptiveTimeScaleConfig(min_time_scale_factor=8, max_time_scale_factor=4)
+
+
+class TestFederationMonitor(unittest.TestCase):
+    def setUp(self):
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def test_statistics(self):
+        monitor = FederationMonitor(window_size=10)
+        for i in range(20):
+            monitor.record_time_status(
+                "app1",
+                timedelta(seconds=1),
+                timedelta(milliseconds=i),
+                self.t0 + timedelta(seconds=i),
+            )
+        monitor.record_mode("app1", Mode.EXECUTING, self.t0)
+        statistics = monitor.get_statistics(self.t0 + timedelta(seconds=21))["app1"]
+        self.assertEqual(statistics["scenario_lag"]["count"], 10)
+        self.assertEqual(statistics["scenario_lag"]["p95"], 1.0)
+        self.assertEqual(statistics["wallclock_lag"]["min"], 0.010)
+        self.assertEqual(statistics["heartbeat_gap"]["max"], 1.0)
+        self.assertEqual(statistics["since_last_seen"], 2.0)
+        self.assertEqual(statistics["mode"], "EXECUTING")
+        self.assertEqual(len(statistics["mode_transitions"]), 1)
+
+    def test_stragglers(self):
+        monitor = FederationMonitor()
+        for app, lag in [("fast", 0.01), ("slow", 5), ("medium", 1)]:
+            monitor.record_time_status(
+                app, timedelta(seconds=lag), timedelta(0), self.t0
+            )
+        self.assertEqual(monitor.get_stragglers(), ["slow", "medium", "fast"])
+        self.assertEqual(monitor.get_stragglers(1), ["slow"])
+
+    def test_manager_callbacks(self):
+        manager = Manager(setup_signal_handlers=False)
+        manager.simulator._time = self.t0
+        manager.on_app_time_status(
+            None,
+            SimpleNamespace(routing_key="test.app1.status.time"),
+            None,
+            encode_time_status(
+                "app1", None, self.t0 - timedelta(seconds=2), self.t0
+            ).encode("utf-8"),
+        )
+        manager.on_app_mode_status(
+            None,
+            SimpleNamespace(routing_key="test.app1.status.mode"),
+            None,
+            encode_mode_status("app1", None, Mode.EXECUTING).encode("utf-8"),
+        )
+        statistics = manager.get_federation_statistics()
+        self.assertEqual(statistics["stragglers"], ["app1"])
+        app = statistics["applications"]["app1"]
+        self.assertEqual(app["scenario_lag"]["max"], 2.0)
+        self.assertEqual(app["mode"], "EXECUTING")
+
+
+class TestBatchExecution(unittest.TestCase):
+    def setUp(self):
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def test_execute_test_plans(self):
+        manager = Manager(setup_signal_handlers=False)
+        manager.config = SimpleNamespace(rc=SimpleNamespace(yaml_file=None))
+        plans = []
+
+        def execute_test_plan(**kwargs):
+            plans.append(kwargs)
+            manager.required_apps = ["app1"]
+            manager.init_retry_delay_s = 1
+            manager._exec_thread = threading.Thread(target=lambda: None)
+            manager._exec_thread.start()
+            result = {
+                "name": "app1",
+                "properties": {
+                    "startTime": self.t0,
+                    "stopTime": self.t0,
+                    "simStartTime": self.t0,
+                    "simStopTime": self.t0,
+                    "results": {"value": len(plans)},
+                },
+            }
+            manager.on_app_result_status(
+                None,
+                SimpleNamespace(routing_key="test.app1.status.result"),
+                None,
+                ResultStatus.model_validate(result)
+                .model_dump_json(by_alias=True)
+                .encode("utf-8"),
+            )
+
+        manager._execute_test_plan_impl = execute_test_plan
+        manager._execute_test_plans_impl(
+            [{"time_scale_factor": 1}, {"time_scale_factor": 2}]
+        )
+        self.assertEqual(plans, [{"time_scale_factor": 1}, {"time_scale_factor": 2}])
+        self.assertEqual(len(manager.run_results), 2)
+        self.assertEqual(
+            manager.run_results[1]["applications"]["app1"]["results"], {"value": 2}
+        )
+        self.assertEqual(manager.run_results[1]["parameters"], {"time_scale_factor": 2})
+
+    def test_execute_test_plans_stopped(self):
+        manager = Manager(setup_signal_handlers=False)
+        manager.config = SimpleNamespace(rc=SimpleNamespace(yaml_file=None))
+        shut_down_observer = mock.Mock()
+        manager._shut_down_observer = shut_down_observer
+        manager.simulator.add_observer(shut_down_observer)
+        plans = []
+
+        def execute_test_plan(**kwargs):
+            plans.append(kwargs)
+            manager._should_stop.set()
+
+        manager._execute_test_plan_impl = execute_test_plan
+        with mock.patch.object(manager, "shut_down") as shut_down:
+            manager._execute_test_plans_impl(
+                [{"time_scale_factor": 1}, {"time_scale_factor": 2}]
+            )
+        self.assertEqual(plans, [{"time_scale_factor": 1}])
+        self.assertIn(shut_down_observer, manager.simulator._observers)
+        shut_down.assert_not_called()
+
+    def test_managed_application_result_status(self):
+        app = ManagedApplication("app1", setup_signal_handlers=False)
+        messages = []
+        app.send_message = lambda app_name, app_topics, payload: messages.append(
+            (app_topics, payload)
+        )
+        app.get_run_results = lambda: {"value": 1}
+        app._execute_simulation(
+            init_time=self.t0,
+            duration=timedelta(seconds=5),
+            time_step=timedelta(seconds=1),
+            time_scale_factor=None,
+        )
+        self.assertEqual(messages[-1][0], "status.result")
+        props = ResultStatus.model_validate_json(messages[-1][1]).properties
+        self.assertEqual(props.sim_stop_time, self.t0 + timedelta(seconds=5))
+        self.assertEqual(props.results, {"value": 1})
+
+
+class TestCheckpointCommand(unittest.TestCase):
+    def test_checkpoint_command(self):
+        manager = Manager(setup_signal_handlers=False)
+        app = ManagedApplication("app1", setup_signal_handlers=False)
+        messages = []
+        manager.send_message = lambda app_name, app_topics, payload: messages.append(
+            (app_topics, payload)
+        )
+        manager.checkpoint("checkpoints/{app_name}.ckpt")
+        self.assertEqual(messages[0][0], "checkpoint")
+        with mock.patch.object(app.simulator, "request_checkpoint") as request:
+            app.on_manager_checkpoint(
+                None,
+                SimpleNamespace(routing_key="test.manager.checkpoint"),
+                None,
+                messages[0][1].encode("utf-8"),
+            )
+        request.assert_called_once_with("checkpoints/app1.ckpt")
+
+
+class TestFastForward(unittest.TestCase):
+    def test_fast_forward_command(self):
+        t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        resume_time = datetime.now(tz=timezone.utc) + timedelta(seconds=5)
+        manager = Manager(setup_signal_handlers=False)
+        app = ManagedApplication("app1", setup_signal_handlers=False)
+        messages = []
+        manager.send_message = lambda app_name, app_topics, payload: messages.append(
+            (app_topics, payload)
+        )
+        manager.fast_forward(t0 + timedelta(hours=1), resume_time)
+        self.assertTrue(manager.simulator.is_fast_forwarding())
+        self.assertEqual(messages[0][0], "fast_forward")
+        app.on_manager_fast_forward(
+            None,
+            SimpleNamespace(routing_key="test.manager.fast_forward"),
+            None,
+            messages[0][1].encode("utf-8"),
+        )
+        self.assertEqual(app.simulator.get_fast_forward_time(), t0 + timedelta(hours=1))
+        self.assertEqual(app.simulator._fast_forward_epoch, resume_time)
+
+    def test_fast_forward_overrun_reported(self):
+        t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        app = ManagedApplication("app1", setup_signal_handlers=False)
+        messages = []
+        app.send_message = lambda app_name, app_topics, payload: messages.append(
+            (app_topics, payload)
+        )
+        app.simulator.set_fast_forward(
+            t0 + timedelta(seconds=5),
+            datetime.now(tz=timezone.utc) - timedelta(seconds=1),
+        )
+        app._execute_simulation(
+            init_time=t0,
+            duration=timedelta(seconds=6),
+            time_step=timedelta(seconds=1),
+            time_scale_factor=1,
+        )
+        manager = Manager(setup_signal_handlers=False)
+        with self.assertLogs("nost_tools.manager", "WARNING"):
+            manager.on_app_result_status(
+                None,
+                SimpleNamespace(routing_key="test.app1.status.result"),
+                None,
+                messages[-1][1].encode("utf-8"),
+            )
+        self.assertIn("fastForwardOverrun", manager._run_app_results["app1"])
+
+
+class TestLockstep(unittest.TestCase):
+    def setUp(self):
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def test_step_timeout_republishes_step(self):
+        manager = Manager(setup_signal_handlers=False)
+        messages = []
+        manager.send_message = lambda app_name, app_topics, payload: messages.append(
+            (app_topics, payload)
+        )
+        manager.add_message_callback = mock.Mock()
+        manager.required_apps_status = {"app1": False}
+        manager.step_timeout = timedelta(seconds=0)
+        with mock.patch.object(manager.simulator, "execute"):
+            manager.start(self.t0, self.t0 + timedelta(seconds=5), lockstep=True)
+        next_time = self.t0 + timedelta(seconds=1)
+        with mock.patch.object(manager.simulator, "get_time", return_value=self.t0):
+            with self.assertLogs("nost_tools.manager", "WARNING"):
+                self.assertFalse(manager._lockstep_step(next_time))
+            self.assertEqual(messages[-1][0], "step")
+            self.assertEqual(
+                StepCommand.model_validate_json(
+                    messages[-1][1]
+                ).tasking_parameters.sim_time,
+                self.t0,
+            )
+            manager.on_app_step_status(
+                None,
+                SimpleNamespace(routing_key="test.app1.status.step"),
+                None,
+                encode_step_status("app1", None, self.t0).encode("utf-8"),
+            )
+            self.assertTrue(manager._lockstep_step(next_time))
+        self.assertEqual(
+            StepCommand.model_validate_json(
+                messages[-1][1]
+            ).tasking_parameters.sim_time,
+            next_time,
+        )
+
+    def test_repeated_step_acknowledged(self):
+        app = ManagedApplication("app1", setup_signal_handlers=False)
+        messages = []
+        app.send_message = lambda app_name, app_topics, payload: messages.append(
+            app_topics
+        )
+        app.manager_app_name = "manager"
+        app._configure_lockstep(True)
+        command = StepCommand.model_validate(
+            {"taskingParameters": {"simTime": self.t0}}
+        )
+        with (
+            mock.patch.object(app.simulator, "get_mode", return_value=Mode.EXECUTING),
+            mock.patch.object(app.simulator, "get_time", return_value=self.t0),
+        ):
+            app.on_manager_step(
+                None,
+                SimpleNamespace(routing_key="test.manager.step"),
+                None,
+                command.model_dump_json(by_alias=True).encode("utf-8"),
+            )
+        self.assertEqual(messages, ["status.step"])
+
+    def test_lockstep_stop_after_termination(self):
+        manager = Manager(setup_signal_handlers=False)
+        manager.config = SimpleNamespace(rc=SimpleNamespace(yaml_file=None))
+        manager.send_message = mock.Mock()
+        manager.add_message_callback = mock.Mock()
+        sim_stop_time = self.t0 + timedelta(seconds=5)
+        with (
+            mock.patch.object(manager, "start") as start,
+            mock.patch.object(manager, "stop") as stop,
+        ):
+            manager._execute_test_plan_impl(
+                self.t0,
+                sim_stop_time,
+                init_retry_delay_s=0,
+                init_max_retry=1,
+                lockstep=True,
+            )
+        manager.add_message_callback.assert_any_call(
+            "*", "status.step", manager.on_app_step_status
+        )
+        start.assert_called_once()
+        stop.assert_called_once_with(sim_stop_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,20 @@
+import importlib.util
+import shutil
+import tempfile
+import threading
 import unittest
+from datetime import datetime, timedelta, timezone
+
+from nost_tools.observer import (
+    AsyncObserver,
+    ColumnarRecordingObserver,
+    Observable,
+    Observer,
+    RecordingObserver,
+    ScenarioTimeIntervalCallback,
+)
+from nost_tools.simulator import Simulator
 
-from nost_tools.observer import Observer, Observable
 
 # set up test observer
 class TestObserver(Observer):
@@ -103,3 +117,170 @@ class TestObserverMethods(unittest.TestCase):
         self.assertIsNone(observer.last_property_name)
         self.assertIsNone(observer.last_old_value)
         self.assertIsNone(observer.last_new_value)
+
+
+class TestColumnarRecordingObserver(unittest.TestCase):
+    def setUp(self):
+        self.observable = Observable()
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def notify_times(self, count):
+        for i in range(count):
+            self.observable.notify_observers(
+                "time",
+                self.t0 + timedelta(minutes=i),
+                self.t0 + timedelta(minutes=i + 1),
+            )
+
+    def test_record_and_grow(self):
+        observer = ColumnarRecordingObserver("time", timestamped=True, initial_size=4)
+        self.observable.add_observer(observer)
+        self.notify_times(10)
+        self.observable.notify_observers("mode", "a", "b")
+        self.assertEqual(len(observer), 10)
+        frame = observer.to_dataframe()
+        self.assertEqual(list(frame["property_name"]), ["time"] * 10)
+        self.assertEqual(
+            frame["new_value"].iloc[-1].to_pydatetime(), self.t0 + timedelta(minutes=10)
+        )
+        self.assertEqual(frame["time"].dt.tz, timezone.utc)
+
+    def test_mixed_values(self):
+        observer = ColumnarRecordingObserver()
+        self.observable.add_observer(observer)
+        self.observable.notify_observers("time", self.t0, self.t0 + timedelta(1))
+        self.observable.notify_observers("mode", "a", "b")
+        self.observable.notify_observers("count", 1, 2)
+        frame = observer.to_dataframe()
+        self.assertEqual(list(frame["property_name"]), ["time", "mode", "count"])
+        self.assertEqual(list(frame["new_value"]), [self.t0 + timedelta(1), "b", 2])
+
+    def test_ring_buffer(self):
+        observer = ColumnarRecordingObserver("time", initial_size=2, max_size=4)
+        self.observable.add_observer(observer)
+        self.notify_times(10)
+        self.assertEqual(len(observer), 4)
+        self.assertEqual(observer.dropped, 6)
+        self.assertEqual(
+            [value.to_pydatetime() for value in observer.to_dataframe()["new_value"]],
+            [self.t0 + timedelta(minutes=i) for i in range(7, 11)],
+        )
+
+    def test_spill(self):
+        spill_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spill_dir)
+        observer = ColumnarRecordingObserver("time", max_size=4, spill_dir=spill_dir)
+        self.observable.add_observer(observer)
+        self.notify_times(10)
+        self.assertEqual(len(observer.spill_files), 2)
+        self.assertEqual(len(observer), 2)
+        frame = observer.to_dataframe()
+        self.assertEqual(len(frame), 10)
+        self.assertEqual(
+            frame["old_value"].iloc[5].to_pydatetime(), self.t0 + timedelta(minutes=5)
+        )
+        self.assertEqual(len(observer.to_dataframe(include_spilled=False)), 2)
+
+    def test_spill_requires_max_size(self):
+        with self.assertRaises(ValueError):
+            ColumnarRecordingObserver(spill_dir="changes")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_to_arrow(self):
+        observer = ColumnarRecordingObserver("time")
+        self.observable.add_observer(observer)
+        self.notify_times(3)
+        table = observer.to_arrow()
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(
+            table.column_names, ["property_name", "old_value", "new_value"]
+        )
+
+
+class BlockingObserver(RecordingObserver):
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def on_change(self, source, property_name, old_value, new_value):
+        self.started.set()
+        self.release.wait(2)
+        super().on_change(source, property_name, old_value, new_value)
+
+
+class TestAsyncObserver(unittest.TestCase):
+    def setUp(self):
+        self.observable = Observable()
+        self.recorder = BlockingObserver()
+        self.observer = AsyncObserver(self.recorder)
+        self.observable.add_observer(self.observer)
+
+    def tearDown(self):
+        self.recorder.release.set()
+        self.observer.close(2)
+
+    def test_forwards_without_blocking(self):
+        self.observable.notify_observers("mode", "a", "b")
+        self.assertEqual(self.recorder.changes, [])
+        self.recorder.release.set()
+        self.assertTrue(self.observer.wait(2))
+        self.assertEqual(self.recorder.changes[0]["source"], self.observable)
+        self.assertEqual(self.recorder.changes[0]["new_value"], "b")
+
+    def test_coalesce_time(self):
+        # the first change is forwarded (and blocks), the others are queued
+        self.observable.notify_observers("time", 0, 1)
+        self.assertTrue(self.recorder.started.wait(2))
+        self.observable.notify_observers("time", 1, 2)
+        self.observable.notify_observers("time", 2, 3)
+        self.observable.notify_observers("mode", "a", "b")
+        self.observable.notify_observers("time", 3, 4)
+        self.observable.notify_observers("time", 4, 5)
+        self.recorder.release.set()
+        self.assertTrue(self.observer.close(2))
+        self.assertEqual(
+            [
+                (change["property_name"], change["old_value"], change["new_value"])
+                for change in self.recorder.changes
+            ],
+            [("time", 0, 1), ("time", 1, 3), ("mode", "a", "b"), ("time", 3, 5)],
+        )
+        self.assertEqual(self.observer.metrics["coalesced"], 2)
+        self.assertEqual(self.observer.metrics["forwarded"], 4)
+
+    def test_closed(self):
+        self.recorder.release.set()
+        self.assertTrue(self.observer.close(2))
+        self.observable.notify_observers("mode", "a", "b")
+        self.assertEqual(self.recorder.changes, [])
+
+
+class TestScenarioTimeIntervalCallback(unittest.TestCase):
+    def setUp(self):
+        self.simulator = Simulator()
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def notify(self, policy):
+        calls = []
+        callback = ScenarioTimeIntervalCallback(
+            lambda source, time: calls.append(time), timedelta(minutes=1), policy
+        )
+        callback.on_change(
+            self.simulator, "time", self.t0, self.t0 + timedelta(minutes=3, seconds=30)
+        )
+        callback.on_change(
+            self.simulator,
+            "time",
+            self.t0 + timedelta(minutes=3, seconds=30),
+            self.t0 + timedelta(minutes=4),
+        )
+        return calls
+
+    def test_missed_policies(self):
+        times = [self.t0 + timedelta(minutes=i) for i in range(1, 5)]
+        self.assertEqual(self.notify("burst"), times)
+        self.assertEqual(self.notify("coalesce"), [times[2], times[3]])
+        self.assertEqual(self.notify("batch"), [times[:3], times[3:]])
+        with self.assertRaises(ValueError):
+            self.notify("skip")
@@ -0,0 +1,170 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from nost_tools.publisher import (
+    ScenarioTimeIntervalPublisher,
+    WallclockScheduler,
+    WallclockTimeIntervalPublisher,
+)
+from nost_tools.simulator import Mode, Simulator
+
+
+class CountingPublisher(WallclockTimeIntervalPublisher):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count = 0
+
+    def publish_message(self):
+        self.count += 1
+
+
+class ScenarioCountingPublisher(ScenarioTimeIntervalPublisher):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count = 0
+        self.batches = []
+
+    def publish_message(self):
+        self.count += 1
+
+    def publish_messages(self, times):
+        self.batches.append(times)
+
+
+class TestScenarioTimeIntervalPublisher(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.MagicMock()
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def notify(self, publisher):
+        publisher.on_change(None, Simulator.PROPERTY_MODE, None, Mode.INITIALIZED)
+        # a time step of 10 minutes passes 10 one-minute intervals (and the initial time)
+        publisher.on_change(
+            None, Simulator.PROPERTY_TIME, self.t0, self.t0 + timedelta(minutes=10)
+        )
+        publisher.on_change(
+            None,
+            Simulator.PROPERTY_TIME,
+            self.t0 + timedelta(minutes=10),
+            self.t0 + timedelta(minutes=10, seconds=30),
+        )
+
+    def test_missed_policies(self):
+        for policy, count in (("burst", 11), ("coalesce", 1)):
+            publisher = ScenarioCountingPublisher(
+                self.app, timedelta(minutes=1), self.t0, missed_policy=policy
+            )
+            self.notify(publisher)
+            self.assertEqual(publisher.count, count)
+            self.assertEqual(
+                publisher._next_time_status, self.t0 + timedelta(minutes=11)
+            )
+
+    def test_batch(self):
+        publisher = ScenarioCountingPublisher(
+            self.app, timedelta(minutes=1), self.t0, missed_policy="batch"
+        )
+        self.notify(publisher)
+        self.assertEqual(
+            publisher.batches, [[self.t0 + timedelta(minutes=i) for i in range(11)]]
+        )
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            ScenarioCountingPublisher(self.app, missed_policy="skip")
+
+    def test_fast_forward(self):
+        publisher = ScenarioCountingPublisher(self.app, timedelta(minutes=1), self.t0)
+        publisher.on_change(None, Simulator.PROPERTY_MODE, None, Mode.INITIALIZED)
+        fast_forward_time = self.t0 + timedelta(minutes=10, seconds=30)
+        publisher.on_change(
+            None, Simulator.PROPERTY_FAST_FORWARD, None, fast_forward_time
+        )
+        for i in range(10):
+            publisher.on_change(
+                None,
+                Simulator.PROPERTY_TIME,
+                self.t0 + timedelta(minutes=i),
+                self.t0 + timedelta(minutes=i + 1),
+            )
+        self.assertEqual(publisher.count, 0)
+        # intervals passed while fast-forwarding are coalesced when resuming
+        self.app.simulator.get_time.return_value = fast_forward_time
+        publisher.on_change(
+            None, Simulator.PROPERTY_FAST_FORWARD, fast_forward_time, None
+        )
+        self.assertEqual(publisher.count, 1)
+        self.assertEqual(publisher._next_time_status, self.t0 + timedelta(minutes=11))
+
+
+class TestWallclockScheduler(unittest.TestCase):
+    def test_schedule_in_order(self):
+        scheduler = WallclockScheduler()
+        calls = []
+        done = threading.Event()
+        scheduler.schedule(0.05, lambda: (calls.append(2), done.set()))
+        scheduler.schedule(0.01, lambda: calls.append(1))
+        cancelled = scheduler.schedule(0.02, lambda: calls.append(3))
+        scheduler.cancel(cancelled)
+        self.assertTrue(done.wait(2))
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(len(scheduler), 0)
+
+
+class TestWallclockTimeIntervalPublisher(unittest.TestCase):
+    def setUp(self):
+        self.app = mock.MagicMock()
+        self.app.simulator = Simulator()
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            CountingPublisher(self.app, missed_policy="drop")
+
+    def test_timer_publishes_without_time_changes(self):
+        publisher = CountingPublisher(
+            self.app,
+            time_status_step=timedelta(milliseconds=20),
+            timer=True,
+            scheduler=WallclockScheduler(),
+        )
+        publisher.on_change(None, Simulator.PROPERTY_MODE, None, Mode.INITIALIZED)
+        publisher.on_change(None, Simulator.PROPERTY_MODE, None, Mode.EXECUTING)
+        # scenario time changes are ignored by the timer
+        publisher.on_change(None, Simulator.PROPERTY_TIME, None, None)
+        time.sleep(0.2)
+        publisher.on_change(None, Simulator.PROPERTY_MODE, None, Mode.TERMINATED)
+        count = publisher.count
+        self.assertGreaterEqual(count, 5)
+        time.sleep(0.05)
+        self.assertEqual(publisher.count, count)
+
+    def test_missed_policies(self):
+        for policy, count, missed in (
+            ("burst", 6, 0),
+            ("coalesce", 1, 5),
+            ("skip", 0, 6),
+        ):
+            publisher = CountingPublisher(
+                self.app,
+                time_status_step=timedelta(seconds=1),
+                time_status_init=datetime.now(tz=timezone.utc) - timedelta(seconds=5.5),
+                timer=True,
+                missed_policy=policy,
+                scheduler=mock.MagicMock(),
+            )
+            publisher.on_change(None, Simulator.PROPERTY_MODE, None, Mode.INITIALIZED)
+            publisher.on_change(None, Simulator.PROPERTY_MODE, None, Mode.EXECUTING)
+            publisher._on_timer()
+            self.assertEqual(publisher.count, count)
+            self.assertEqual(publisher.missed, missed)
+            # the next deadline is in the future
+            delay = publisher.scheduler.schedule.call_args[0][0]
+            self.assertGreater(delay, 0)
+            self.assertLessEqual(delay, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
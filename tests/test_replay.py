@@ -0,0 +1,145 @@
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from nost_tools.application import Application
+from nost_tools.log_store import SegmentedLogSink
+from nost_tools.logger_application import ArrowLogSink, CsvLogSink
+from nost_tools.replay import LogReplayer
+
+
+class TestLogReplayer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.t0 = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.sim_t0 = datetime(2020, 1, 1, 8, tzinfo=timezone.utc)
+        # one time status per minute of scenario time, each followed by an event
+        self.records = []
+        for i in range(20):
+            self.records.append(
+                (
+                    self.t0 + timedelta(milliseconds=10 * i),
+                    "prefix.manager.status.time",
+                    json.dumps(
+                        {
+                            "properties": {
+                                "simTime": (
+                                    self.sim_t0 + timedelta(minutes=i)
+                                ).isoformat()
+                            }
+                        }
+                    ).encode("utf-8"),
+                )
+            )
+            self.records.append(
+                (
+                    self.t0 + timedelta(milliseconds=10 * i + 5),
+                    f"prefix.app.event{i % 2}",
+                    f'{{"i": {i}}}'.encode("utf-8"),
+                )
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, sink):
+        sink.write(self.records)
+        sink.close()
+        return sink.name
+
+    def assert_replays(self, name):
+        published = []
+        replayer = LogReplayer(name, speed=None)
+        self.assertEqual(
+            replayer.replay(lambda *message: published.append(message)), 40
+        )
+        self.assertEqual(published, [(topic, body) for _, topic, body in self.records])
+
+        replayer = LogReplayer(
+            name,
+            speed=None,
+            topics=["*.app.event1"],
+            start=self.sim_t0 + timedelta(minutes=5),
+            end=self.sim_t0 + timedelta(minutes=10),
+        )
+        self.assertEqual(
+            [json.loads(record.payload)["i"] for record in replayer.records()],
+            [5, 7, 9],
+        )
+
+    def test_replay_csv(self):
+        self.assert_replays(
+            self.write(CsvLogSink(os.path.join(self.temp_dir, "a.log")))
+        )
+
+    def test_replay_segmented(self):
+        self.assert_replays(
+            self.write(
+                SegmentedLogSink(
+                    os.path.join(self.temp_dir, "store"),
+                    segment_size=500,
+                    index_interval=4,
+                )
+            )
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_replay_columnar(self):
+        for name in ("a.parquet", "a.arrows"):
+            self.assert_replays(
+                self.write(
+                    ArrowLogSink(
+                        os.path.join(self.temp_dir, name),
+                        log_format="parquet" if name.endswith("parquet") else "arrow",
+                        row_group_size=7,
+                    )
+                )
+            )
+
+    def test_replay_pace(self):
+        name = self.write(CsvLogSink(os.path.join(self.temp_dir, "a.log")))
+        # 195 ms recorded at twice the speed
+        replayer = LogReplayer(name, speed=2.0)
+        start = time.monotonic()
+        replayer.replay(lambda *message: None)
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertEqual(replayer.metrics["replayed"], 40)
+
+    def test_stop(self):
+        name = self.write(CsvLogSink(os.path.join(self.temp_dir, "a.log")))
+        replayer = LogReplayer(name, speed=0.001)
+        published = []
+
+        def publish(*message):
+            published.append(message)
+            replayer.stop()
+
+        self.assertEqual(replayer.replay(publish), 1)
+
+    def test_invalid_speed(self):
+        with self.assertRaises(ValueError):
+            LogReplayer("a.log", speed=0)
+
+    def test_replay_to_application(self):
+        name = self.write(CsvLogSink(os.path.join(self.temp_dir, "a.log")))
+        app = Application("test", setup_signal_handlers=False)
+        app.prefix = "test"
+        received = []
+        app._callbacks_per_topic = {
+            "test.app.#": [
+                lambda ch, method, properties, body: received.append(method.routing_key)
+            ]
+        }
+        LogReplayer(name, speed=None).replay_to_application(app)
+        self.assertEqual(
+            received, [f"test.app.event{i % 2}" for i in range(len(self.records) // 2)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
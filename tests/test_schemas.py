@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from nost_tools.schemas import (
+    ExecConfig,
+    ModeStatus,
+    ReadyStatus,
+    StepStatus,
+    TimeStatus,
+    encode_mode_status,
+    encode_ready_status,
+    encode_step_status,
+    encode_time_status,
+)
+from nost_tools.simulator import Mode
+
+
+class TestStatusEncoders(unittest.TestCase):
+    def test_encode_time_status(self):
+        sim_time = datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        time = datetime(
+            2024, 1, 1, 8, 30, tzinfo=timezone(timedelta(hours=-4, minutes=-30))
+        )
+        for description in [None, "test app"]:
+            expected = TimeStatus.model_validate(
+                {
+                    "name": "test",
+                    "description": description,
+                    "properties": {"simTime": sim_time, "time": time},
+                }
+            ).model_dump_json(by_alias=True, exclude_none=True)
+            self.assertEqual(
+                encode_time_status("test", description, sim_time, time), expected
+            )
+
+    def test_encode_time_status_naive(self):
+        sim_time = datetime(2024, 1, 1, 12, 0, 0)
+        expected = TimeStatus.model_validate(
+            {"name": "test", "properties": {"simTime": sim_time, "time": sim_time}}
+        ).model_dump_json(by_alias=True, exclude_none=True)
+        self.assertEqual(encode_time_status("test", None, sim_time, sim_time), expected)
+
+    def test_encode_mode_status(self):
+        for mode in Mode:
+            expected = ModeStatus.model_validate(
+                {"name": "test", "description": "d", "properties": {"mode": mode}}
+            ).model_dump_json(by_alias=True, exclude_none=True)
+            self.assertEqual(encode_mode_status("test", "d", mode), expected)
+
+    def test_encode_ready_status(self):
+        expected = ReadyStatus.model_validate(
+            {"name": "test", "properties": {"ready": True}}
+        ).model_dump_json(by_alias=True, exclude_none=True)
+        self.assertEqual(encode_ready_status("test", None), expected)
+
+    def test_encode_step_status(self):
+        sim_time = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        expected = StepStatus.model_validate(
+            {"name": "test", "properties": {"simTime": sim_time}}
+        ).model_dump_json(by_alias=True, exclude_none=True)
+        self.assertEqual(encode_step_status("test", None, sim_time), expected)
+
+
+class TestExecConfig(unittest.TestCase):
+    def test_sweep_overrides_manager(self):
+        config = ExecConfig.model_validate(
+            {
+                "manager": {"time_scale_factor": 2, "required_apps": ["app1"]},
+                "sweep": [{"time_scale_factor": 10}, {}],
+            }
+        )
+        self.assertEqual([run.time_scale_factor for run in config.sweep], [10, 2])
+        self.assertEqual(config.sweep[0].required_apps, ["app1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
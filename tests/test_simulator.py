@@ -1,8 +1,13 @@
+import os
+import shutil
+import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
 import threading
 import time
 
+import numpy as np
+
 from nost_tools.observer import RecordingObserver
 from nost_tools.entity import Entity
 from nost_tools.simulator import Mode, Simulator
@@ -11,6 +16,24 @@ from nost_tools.simulator import Mode, Simulator
 class NullEntity(Entity):
     pass
 
+
+class CounterEntity(Entity):
+    def __init__(self, name=None):
+        super().__init__(name)
+        self.counts = np.zeros(1000)
+
+    def tock(self):
+        super().tock()
+        self.counts += 1
+
+    def get_state(self):
+        return {**super().get_state(), "counts": self.counts}
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.counts = state["counts"]
+
+
 class TestSimulatorMethods(unittest.TestCase):
     def test_simulator_add_remove_entity(self):
         simulator = Simulator()
@@ -128,6 +151,83 @@ class TestSimulatorMethods(unittest.TestCase):
         self.assertEqual(recorder.changes[-1]["new_value"], init_time + duration)
         self.assertEqual(entity.get_time(), init_time + duration)
 
+    def test_simulator_execute_step_barrier(self):
+        simulator = Simulator()
+        entity = Entity("test")
+        simulator.add_entity(entity)
+        init_time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        duration = timedelta(seconds=60)
+        time_step = timedelta(seconds=1)
+        steps = []
+
+        def barrier(next_time):
+            # refuse each step once to exercise repeated calls
+            steps.append(next_time)
+            return len(steps) % 2 == 0
+
+        simulator.set_step_barrier(barrier)
+        start = time.time()
+        simulator.execute(init_time, duration, time_step, time_scale_factor=1)
+        self.assertLess(time.time() - start, 5)
+        self.assertEqual(simulator.get_time(), init_time + duration)
+        self.assertEqual(len(steps), 120)
+        self.assertEqual(steps[-1], init_time + duration)
+
+    def test_simulator_execute_fast_forward(self):
+        simulator = Simulator()
+        recorder = RecordingObserver("fast_forward")
+        simulator.add_observer(recorder)
+        init_time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        duration = timedelta(seconds=60)
+        time_step = timedelta(seconds=1)
+        fast_forward_time = init_time + timedelta(seconds=59)
+        resume_time = datetime.now(tz=timezone.utc) + timedelta(milliseconds=200)
+        simulator.set_fast_forward(fast_forward_time, resume_time)
+        self.assertTrue(simulator.is_fast_forwarding())
+        start = time.time()
+        simulator.execute(init_time, duration, time_step, time_scale_factor=1)
+        # 59 steps without pacing, then the last step is paced from the resume time
+        self.assertGreaterEqual(time.time() - start, 1.2)
+        self.assertLess(time.time() - start, 3)
+        self.assertEqual(simulator.get_time(), init_time + duration)
+        self.assertFalse(simulator.is_fast_forwarding())
+        self.assertEqual(simulator.get_simulation_epoch(), fast_forward_time)
+        self.assertEqual(simulator.get_wallclock_epoch(), resume_time)
+        self.assertEqual(simulator.get_fast_forward_overrun(), timedelta())
+        self.assertEqual(
+            [change["new_value"] for change in recorder.changes],
+            [fast_forward_time, None],
+        )
+
+    def test_simulator_execute_fast_forward_overrun(self):
+        simulator = Simulator()
+        init_time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        # the resume time passes before the fast-forward time is reached
+        resume_time = datetime.now(tz=timezone.utc) - timedelta(seconds=1)
+        simulator.set_fast_forward(init_time + timedelta(seconds=5), resume_time)
+        with self.assertLogs("nost_tools.simulator", "WARNING"):
+            simulator.execute(
+                init_time,
+                timedelta(seconds=6),
+                timedelta(seconds=1),
+                time_scale_factor=1,
+            )
+        self.assertGreaterEqual(
+            simulator.get_fast_forward_overrun(), timedelta(seconds=1)
+        )
+
+    def test_simulator_execute_fast_forward_step_barrier(self):
+        simulator = Simulator()
+        init_time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        steps = []
+        simulator.set_step_barrier(lambda next_time: steps.append(next_time) or True)
+        simulator.set_fast_forward(init_time + timedelta(seconds=5))
+        simulator.execute(
+            init_time, timedelta(seconds=10), timedelta(seconds=1), time_scale_factor=1
+        )
+        # the step barrier gates all time steps
+        self.assertEqual(len(steps), 10)
+
     def test_simulator_execute_time_partial_final_time_step(self):
         simulator = Simulator()
         recorder = RecordingObserver("time")
@@ -301,3 +401,73 @@ class TestSimulatorMethods(unittest.TestCase):
             (time_step / new_time_scale_factor).total_seconds(),
             1,
         )
+
+
+class TestSimulatorCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.init_time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.duration = timedelta(seconds=10)
+        self.time_step = timedelta(seconds=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def create_simulator(self):
+        simulator = Simulator()
+        entity = CounterEntity("counter")
+        simulator.add_entity(entity)
+        return simulator, entity
+
+    def test_periodic_checkpoint_and_restore(self):
+        simulator, entity = self.create_simulator()
+        simulator.set_checkpoint_interval(timedelta(seconds=4), self.temp_dir)
+        simulator.execute(
+            self.init_time, self.duration, self.time_step, time_scale_factor=None
+        )
+        self.assertEqual(len(os.listdir(self.temp_dir)), 2)
+        path = os.path.join(self.temp_dir, "checkpoint_2020-01-01T00-00-04+00-00.ckpt")
+
+        # warm start a new simulator from the checkpoint
+        simulator, entity = self.create_simulator()
+        recorder = RecordingObserver("time")
+        simulator.add_observer(recorder)
+        self.assertEqual(simulator.restore(path), self.init_time + timedelta(seconds=4))
+        self.assertEqual(simulator.get_mode(), Mode.INITIALIZED)
+        self.assertEqual(entity.get_time(), self.init_time + timedelta(seconds=4))
+        self.assertTrue(entity.counts.flags.writeable)
+        self.assertEqual(entity.counts[0], 4)
+        simulator.execute(
+            self.init_time, self.duration, self.time_step, time_scale_factor=None
+        )
+        self.assertEqual(len(recorder.changes), 6)
+        self.assertEqual(entity.get_time(), self.init_time + self.duration)
+        self.assertEqual(entity.counts[-1], 10)
+
+    def test_request_checkpoint(self):
+        simulator, entity = self.create_simulator()
+        path = os.path.join(self.temp_dir, "requested.ckpt")
+
+        def on_time(source, property_name, old_value, new_value):
+            if new_value == self.init_time + timedelta(seconds=3):
+                simulator.request_checkpoint(path)
+
+        observer = RecordingObserver("time")
+        observer.on_change = on_time
+        simulator.add_observer(observer)
+        simulator.execute(
+            self.init_time, self.duration, self.time_step, time_scale_factor=None
+        )
+        simulator, entity = self.create_simulator()
+        simulator.restore(path)
+        self.assertEqual(entity.counts[0], 3)
+
+    def test_restore_mismatched_entities(self):
+        simulator, _ = self.create_simulator()
+        simulator.initialize(self.init_time)
+        path = os.path.join(self.temp_dir, "a.ckpt")
+        simulator.request_checkpoint(path)
+        simulator = Simulator()
+        simulator.add_entity(NullEntity("counter"))
+        with self.assertRaises(ValueError):
+            simulator.restore(path)